@@ -32,35 +32,131 @@ MCP 智能数据分析工具
 # =========================================================================================
 ## 导入模块
 import io
+import logging
 import uuid
+import hashlib
 import pandas as pd
 import numpy as np
 import os
 import json
 import pickle
-from typing import Dict, Any, Optional, List
+import functools
+import threading
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Union
 from mcp.server.fastmcp import FastMCP
-from modules.data_layer.field_analyzer import analyze_numeric_fields, analyze_categorical_fields, auto_detect_polarity, apply_polarity_adjustment, generate_polarity_report
-from modules.algorithm_layer.membership_functions import LowerBoundMembershipFunctions
-from modules.algorithm_layer.topsis_comprehensive_evaluation import TOPSISComprehensiveEvaluation
-from modules.algorithm_layer.vikor_comprehensive_evaluation import VIKORComprehensiveEvaluation
-from modules.algorithm_layer.grade_comprehensive_assessment import GradeComprehensiveAssessment
+from modules.data_layer.field_analyzer import analyze_numeric_fields, analyze_categorical_fields, auto_detect_polarity, apply_polarity_adjustment, generate_polarity_report, CATEGORICAL_DTYPES
+from modules.data_layer.file_parser import CSV_PARSE_ENGINE, EXCEL_PARSE_ENGINE
+### 算法层模块在对应工具调用时按需导入，缩短服务冷启动时间
+
+## 启用 Copy-on-Write（pandas 3.0 起默认开启，无需再设置）
+### 缓存中的DataFrame以引用方式共享，下游修改列时才触发复制
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 ## 创建 MCP 服务器
 mcp = FastMCP("SmartDataAnalyzer")
 
+## 日志记录器（stdio传输下stdout为JSON-RPC通道，上传流程日志改走logging）
+logger = logging.getLogger("SmartDataAnalyzer")
+
 ## 定义常量
 ### 数据缓存（内存缓存，Session 级）
 DATA_CACHE: Dict[str, pd.DataFrame] = {}
 
+### 资源URI前缀
+URI_PREFIX = "data://"
+
 ### 持久化存储目录
 PERSISTENT_STORAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "persistent_resources")
 
 ### 资源索引文件路径
 RESOURCE_INDEX_FILE = os.path.join(PERSISTENT_STORAGE_DIR, "resource_index.json")
 
+### 资源索引记录（使用__slots__减少大量中间资源时的内存占用）
+@dataclass(slots=True)
+class ResourceRecord:
+    uri: str
+    type: str = ''
+    type_code: str = ''
+    data_shape: str = ''
+    file_path: str = ''
+    created_time: str = ''
+    parent_hash: str = ''
+    step_name: str = ''
+    rows: int = 0
+    columns: int = 0
+    column_names: tuple = ()
+    parent_resource_id: str = ''
+    resource_type: str = ''
+    description: str = ''
+
 ### 加载资源索引（MVP阶段：不加载磁盘索引文件）
-RESOURCE_INDEX = {}
+RESOURCE_INDEX: Dict[str, ResourceRecord] = {}
+
+### 资源写入锁（可重入）：DATA_CACHE与RESOURCE_INDEX等索引的成对更新在同一临界区内完成，
+### 避免并发调用时读到已写入缓存但尚未登记索引的中间状态
+RESOURCE_WRITE_LOCK = threading.RLock()
+
+### 按资源类型分组的资源ID（resource_type -> 按登记顺序排列的资源ID有序集合），与RESOURCE_INDEX同步维护，
+### 用于O(1)查找某类型的最新资源
+RESOURCE_IDS_BY_TYPE: Dict[str, Dict[str, None]] = {}
+
+### 唯一标识索引（unique_id -> 解析后的资源信息），与DATA_CACHE同步维护，用于依赖链查找
+UNIQUE_ID_INDEX: Dict[str, Dict[str, str]] = {}
+
+### 资源形状描述缓存（uri -> "N 行 × M 列"），与DATA_CACHE同步维护，用于资源列表输出
+RESOURCE_SHAPE_CACHE: Dict[str, str] = {}
+
+### 隶属度计算结果资源URI（data://mc_*且数据为隶属度矩阵格式，按写入顺序排列的有序集合），
+### 写入时即完成格式判断，与DATA_CACHE同步维护
+MEMBERSHIP_URI_PREFIX = f"{URI_PREFIX}mc_"
+MEMBERSHIP_RESOURCE_URIS: Dict[str, None] = {}
+
+### 低基数字符串列转换为category类型的阈值（唯一值数量 / 行数）
+CATEGORY_CARDINALITY_RATIO = 0.5
+
+### 用户确认极性后的隶属度规则描述模板（越大越好 / 越小越好）
+MAX_POLARITY_RULE_TEMPLATE = """## 对于越大越好的字段（{col}）：
+    - a < b < c （如{col}：{a:.2f}→{b:.2f}→{c:.2f}）
+    - 当实际值 ≤ a时：隶属度=0%
+    - 当实际值 ≥ c时：隶属度=100%"""
+MIN_POLARITY_RULE_TEMPLATE = """## 对于越小越好的字段（{col}）：
+    - a > b > c （如{col}：{a:.2f}→{b:.2f}→{c:.2f}）
+    - 当实际值 ≥ a时：隶属度=0%
+    - 当实际值 ≤ c时：隶属度=100%"""
+
+### 数值列识别结果缓存（(列名, dtypes) -> 数值列名列表）
+NUMERIC_COLUMNS_CACHE: Dict[tuple, List[str]] = {}
+NUMERIC_COLUMNS_CACHE_MAX_SIZE = 256
+
+### 分类列识别结果缓存（(列名, dtypes) -> 分类列名列表）
+CATEGORICAL_COLUMNS_CACHE: Dict[tuple, List[str]] = {}
+CATEGORICAL_COLUMNS_CACHE_MAX_SIZE = 256
+
+### 多字段隶属度并行计算阈值（行数×字段数达到该值且有多个CPU核心时按字段并行，NumPy运算期间释放GIL）
+PARALLEL_MEMBERSHIP_MIN_CELLS = 1_000_000
+
+### 隶属度配置模板中各级别参数相对字段最大值的比例（级别1-级别3）
+TEMPLATE_LEVEL_RATIOS = (0.8, 0.5, 0.2)
+
+### 字段分析结果备忘表（uri -> (DataFrame弱引用, (形状, dtypes), 分析结果)），DataFrame对象及其形状、dtypes未变时直接复用，
+### 资源移出缓存时同步删除，按插入顺序淘汰
+ANALYSIS_MEMO: Dict[str, Tuple[weakref.ref, tuple, Dict[str, Any]]] = {}
+ANALYSIS_MEMO_MAX_SIZE = 32
+
+### 规范化特征值矩阵备忘表（uri -> (DataFrame弱引用, 规范化特征值矩阵)），DataFrame对象未变时直接复用，
+### 用于同一隶属度资源被TOPSIS/VIKOR反复评估的场景，按插入顺序淘汰
+NORMALIZED_MATRIX_MEMO: Dict[str, Tuple[weakref.ref, Dict[str, np.ndarray]]] = {}
+NORMALIZED_MATRIX_MEMO_MAX_SIZE = 32
+
+### 缓存查找哨兵（单次dict.get即可区分"未命中"，无需先in判断再取值）
+_MISSING = object()
 
 ### 资源命名规则常量
 RESOURCE_TYPES = {
@@ -72,9 +168,104 @@ RESOURCE_TYPES = {
     "other": "other"             # 其他计算结果
 }
 
+### 类型代码到资源类型的反向映射（用于解析资源ID）
+RESOURCE_TYPES_INV = {code: type_name for type_name, code in RESOURCE_TYPES.items()}
+
 # =========================================================================================
 # 🗄️ 数据存储与缓存管理
 # =========================================================================================
+### 写入内存缓存并同步唯一标识索引
+def _cache_dataframe(uri: str, df: pd.DataFrame) -> None:
+    """
+    将DataFrame写入DATA_CACHE，并同步更新UNIQUE_ID_INDEX、RESOURCE_SHAPE_CACHE和MEMBERSHIP_RESOURCE_URIS
+    
+    Args:
+        uri: 资源URI（data://{resource_id}）
+        df: 要缓存的DataFrame
+    """
+    n_rows, n_cols = df.shape
+    is_membership = uri.startswith(MEMBERSHIP_URI_PREFIX) and _is_membership_matrix(df)
+    resource_info = parse_resource_id(uri.removeprefix(URI_PREFIX))
+    
+    with RESOURCE_WRITE_LOCK:
+        DATA_CACHE[uri] = df
+        RESOURCE_SHAPE_CACHE[uri] = f"{n_rows} 行 × {n_cols} 列"
+        if is_membership:
+            MEMBERSHIP_RESOURCE_URIS[uri] = None
+        else:
+            MEMBERSHIP_RESOURCE_URIS.pop(uri, None)
+        if "unique_id" in resource_info:
+            UNIQUE_ID_INDEX[resource_info["unique_id"]] = resource_info
+
+### 从内存缓存中移除资源并同步唯一标识索引
+def _evict_dataframe(uri: str) -> None:
+    """
+    从DATA_CACHE中移除资源，并同步更新UNIQUE_ID_INDEX、RESOURCE_SHAPE_CACHE、MEMBERSHIP_RESOURCE_URIS和ANALYSIS_MEMO
+    
+    Args:
+        uri: 资源URI（data://{resource_id}）
+    """
+    unique_id = parse_resource_id(uri.removeprefix(URI_PREFIX)).get("unique_id")
+    
+    with RESOURCE_WRITE_LOCK:
+        DATA_CACHE.pop(uri, None)
+        RESOURCE_SHAPE_CACHE.pop(uri, None)
+        MEMBERSHIP_RESOURCE_URIS.pop(uri, None)
+        ANALYSIS_MEMO.pop(uri, None)
+        if unique_id is not None:
+            UNIQUE_ID_INDEX.pop(unique_id, None)
+
+### 查找资源对应的极性调整后资源
+def _find_polarity_adjusted(resource_id: str) -> Optional[str]:
+    """
+    查找原始资源对应的极性调整后资源
+    
+    Args:
+        resource_id: 原始资源ID
+        
+    Returns:
+        极性调整后的资源ID，不存在时返回None
+    """
+    for cached_uri in DATA_CACHE.keys():
+        if cached_uri.startswith(URI_PREFIX) and "polarity_adjusted" in cached_uri:
+            # 检查是否是当前资源的极性调整版本
+            adjusted_parsed = parse_resource_id(cached_uri.removeprefix(URI_PREFIX))
+            if (adjusted_parsed["type"] == "raw_data" and
+                    adjusted_parsed.get("parent_hash") == resource_id):
+                return cached_uri.removeprefix(URI_PREFIX)
+    return None
+
+### 注册资源：写入内存缓存并建立资源索引记录
+def _register_resource(resource_id: str, df: pd.DataFrame, **meta) -> str:
+    """
+    将DataFrame写入内存缓存并在RESOURCE_INDEX中登记资源记录（统一的资源写入入口）
+    
+    Args:
+        resource_id: 资源ID
+        df: 要缓存的DataFrame
+        **meta: 资源记录的其他字段（如type、parent_resource_id、description等）
+        
+    Returns:
+        资源URI
+    """
+    uri = get_resource_uri(resource_id)
+    n_rows, n_cols = df.shape
+    record = ResourceRecord(
+        uri=uri,
+        rows=n_rows,
+        columns=n_cols,
+        column_names=tuple(df.columns),
+        **meta
+    )
+    resource_type = meta.get("resource_type")
+    
+    with RESOURCE_WRITE_LOCK:
+        _cache_dataframe(uri, df)
+        RESOURCE_INDEX[resource_id] = record
+        if resource_type:
+            RESOURCE_IDS_BY_TYPE.setdefault(resource_type, {})[resource_id] = None
+    return uri
+
 ### 从持久化存储加载资源
 def load_resource_from_persistent_storage(resource_id: str) -> pd.DataFrame:
     """
@@ -97,18 +288,18 @@ def load_resource_from_persistent_storage(resource_id: str) -> pd.DataFrame:
         print(f"自动发现隶属度资源: {resource_id}")
     
     # 处理URI格式的资源ID
-    if resource_id and resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     if resource_id not in RESOURCE_INDEX:
         raise ValueError(f"资源不存在于存储: {resource_id}")
     
     # MVP阶段：仅从内存缓存加载
-    uri = RESOURCE_INDEX[resource_id]["uri"]
-    if uri not in DATA_CACHE:
+    uri = RESOURCE_INDEX[resource_id].uri
+    df = DATA_CACHE.get(uri, _MISSING)
+    if df is _MISSING:
         raise ValueError(f"资源不在内存缓存中（MVP阶段不支持磁盘加载）: {resource_id}")
     
-    return DATA_CACHE[uri]
+    return df
 
 ### 列出存储中的所有资源
 @mcp.tool()
@@ -125,25 +316,22 @@ def list_persistent_resources(resource_type: str = None) -> Dict[str, Any]:
     resources_by_type = {}
     
     for resource_id, resource_info in RESOURCE_INDEX.items():
-        res_type = resource_info.get("type", "未知类型")
+        res_type = resource_info.type or "未知类型"
         
         if resource_type and res_type != resource_type:
             continue
-            
-        if res_type not in resources_by_type:
-            resources_by_type[res_type] = []
         
         # 检查资源是否在内存中
-        is_in_memory = resource_info.get("uri", "") in DATA_CACHE
+        is_in_memory = resource_info.uri in DATA_CACHE
         
-        resources_by_type[res_type].append({
+        resources_by_type.setdefault(res_type, []).append({
             "resource_id": resource_id,
-            "uri": resource_info.get("uri", ""),
-            "data_shape": resource_info.get("data_shape", "未知"),
-            "created_time": resource_info.get("created_time", "未知"),
-            "file_path": resource_info.get("file_path", ""),
-            "parent_hash": resource_info.get("parent_hash", ""),
-            "step_name": resource_info.get("step_name", ""),
+            "uri": resource_info.uri,
+            "data_shape": resource_info.data_shape or "未知",
+            "created_time": resource_info.created_time or "未知",
+            "file_path": resource_info.file_path,
+            "parent_hash": resource_info.parent_hash,
+            "step_name": resource_info.step_name,
             "in_memory": is_in_memory,
             "storage_type": "内存缓存" if is_in_memory else "仅索引（MVP阶段不持久化）"
         })
@@ -168,8 +356,7 @@ def delete_persistent_resource(resource_id: str) -> Dict[str, Any]:
         删除操作结果
     """
     # 处理URI格式的资源ID
-    if resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     if resource_id not in RESOURCE_INDEX:
         return {
@@ -179,17 +366,16 @@ def delete_persistent_resource(resource_id: str) -> Dict[str, Any]:
     
     try:
         # MVP阶段：不删除磁盘文件（因为没有持久化）
-        # file_path = RESOURCE_INDEX[resource_id]["file_path"]
+        # file_path = RESOURCE_INDEX[resource_id].file_path
         # if os.path.exists(file_path):
         #     os.remove(file_path)
         
-        # 从内存缓存中删除
-        uri = RESOURCE_INDEX[resource_id]["uri"]
-        if uri in DATA_CACHE:
-            del DATA_CACHE[uri]
-        
-        # 从索引中删除
-        del RESOURCE_INDEX[resource_id]
+        # 从内存缓存及索引中删除
+        with RESOURCE_WRITE_LOCK:
+            record = RESOURCE_INDEX.pop(resource_id)
+            if record.uri in DATA_CACHE:
+                _evict_dataframe(record.uri)
+            RESOURCE_IDS_BY_TYPE.get(record.resource_type, {}).pop(resource_id, None)
         
         # MVP阶段：不保存索引文件到磁盘
         # with open(RESOURCE_INDEX_FILE, 'w', encoding='utf-8') as f:
@@ -220,22 +406,20 @@ def save_resource_to_persistent_storage(resource_id: str, df: pd.DataFrame) -> s
     """
     # MVP阶段：更新内存索引和数据缓存
     parsed_info = parse_resource_id(resource_id)
-    uri = get_resource_uri(resource_id)
-    
-    # 更新资源索引
-    RESOURCE_INDEX[resource_id] = {
-        "uri": uri,
-        "type": parsed_info["type"],
-        "type_code": parsed_info["type_code"],
-        "data_shape": f"{len(df)} 行 × {len(df.columns)} 列",
-        "file_path": f"memory://{resource_id}",  # 虚拟内存路径
-        "created_time": pd.Timestamp.now().isoformat(),
-        "parent_hash": parsed_info.get("parent_hash", ""),
-        "step_name": parsed_info.get("step_name", "")
-    }
     
-    # 保存到内存缓存
-    DATA_CACHE[uri] = df.copy()
+    # 更新资源索引并保存到内存缓存（直接保存引用，调用方传入的均为新建的DataFrame，
+    # 配合Copy-on-Write避免整表复制）
+    _register_resource(
+        resource_id,
+        df,
+        type=parsed_info["type"],
+        type_code=parsed_info["type_code"],
+        data_shape=f"{len(df)} 行 × {len(df.columns)} 列",
+        file_path=f"memory://{resource_id}",  # 虚拟内存路径
+        created_time=datetime.now().isoformat(),
+        parent_hash=parsed_info.get("parent_hash", ""),
+        step_name=parsed_info.get("step_name", "")
+    )
     
     # 不保存索引文件到磁盘（MVP阶段）
     # with open(RESOURCE_INDEX_FILE, 'w', encoding='utf-8') as f:
@@ -260,9 +444,6 @@ def generate_resource_id(resource_type: str, parent_resource_id: str = None, ste
     Returns:
         标准化的资源ID格式：{type}_{uuid}_{parent_hash}_{step}
     """
-    import hashlib
-    import uuid
-    
     # 验证资源类型
     if resource_type not in RESOURCE_TYPES:
         resource_type = "other"
@@ -272,10 +453,10 @@ def generate_resource_id(resource_type: str, parent_resource_id: str = None, ste
     # 生成唯一标识
     unique_id = str(uuid.uuid4())[:8]
     
-    # 计算父资源哈希（用于建立依赖链）
+    # 计算父资源哈希（用于建立依赖链，仅作标识用途，3字节BLAKE2b即6位十六进制）
     parent_hash = ""
     if parent_resource_id:
-        parent_hash = hashlib.md5(parent_resource_id.encode()).hexdigest()[:6]
+        parent_hash = hashlib.blake2b(parent_resource_id.encode(), digest_size=3).hexdigest()
     
     # 步骤名称处理
     step_suffix = ""
@@ -303,7 +484,7 @@ def get_resource_uri(resource_id: str) -> str:
     Returns:
         资源URI格式：data://{resource_id}
     """
-    return f"data://{resource_id}"
+    return f"{URI_PREFIX}{resource_id}"
 
 ### 解析资源ID，提取类型、父资源等信息
 def parse_resource_id(resource_id: str) -> Dict[str, str]:
@@ -314,21 +495,22 @@ def parse_resource_id(resource_id: str) -> Dict[str, str]:
         resource_id: 标准化的资源ID
         
     Returns:
-        解析后的资源信息
+        解析后的资源信息（副本，调用方可自由修改）
     """
+    return dict(_parse_resource_id_cached(resource_id))
+
+@functools.lru_cache(maxsize=4096)
+def _parse_resource_id_cached(resource_id: str) -> Dict[str, str]:
+    """解析资源ID（资源ID不可变，结果按ID缓存）"""
     parts = resource_id.split("_")
     
     if len(parts) < 2:
         return {"type": "unknown", "id": resource_id}
     
     type_code = parts[0]
-    resource_type = "unknown"
     
     # 反向查找类型
-    for type_name, code in RESOURCE_TYPES.items():
-        if code == type_code:
-            resource_type = type_name
-            break
+    resource_type = RESOURCE_TYPES_INV.get(type_code, "unknown")
     
     result = {
         "type": resource_type,
@@ -383,18 +565,10 @@ def get_resource_dependency_chain(resource_id: str) -> Dict[str, Any]:
     }
     """
     # 处理URI格式的资源ID
-    if resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     parsed_info = parse_resource_id(resource_id)
     
-    # 获取所有资源信息
-    all_resources = {}
-    for uri in DATA_CACHE.keys():
-        if uri.startswith("data://"):
-            res_id = uri[7:]  # 移除 "data://" 前缀
-            all_resources[res_id] = parse_resource_id(res_id)
-    
     # 构建依赖链
     dependency_chain = []
     current_resource = parsed_info
@@ -407,17 +581,13 @@ def get_resource_dependency_chain(resource_id: str) -> Dict[str, Any]:
         if not parent_hash:
             break
             
-        # 在所有资源中查找匹配的父资源
-        parent_resource = None
-        for res_id, res_info in all_resources.items():
-            if res_info.get("unique_id") == parent_hash:
-                parent_resource = res_info
-                break
+        # 通过唯一标识索引查找匹配的父资源
+        parent_resource = UNIQUE_ID_INDEX.get(parent_hash)
         
         if not parent_resource:
             break
             
-        current_resource = parent_resource
+        current_resource = dict(parent_resource)
     
     return {
         "resource_id": resource_id,
@@ -430,162 +600,235 @@ def get_resource_dependency_chain(resource_id: str) -> Dict[str, Any]:
 # =========================================================================================
 # 📊 数据上传与解析模块
 # =========================================================================================
-### 上传 CSV 文本数据并缓存为资源，自动触发字段极性智能检测
-@mcp.tool()
-def upload_csv(csv_text: str) -> Dict[str, Any]:
+### 获取数值型字段列表（按列名与dtypes缓存识别结果）
+def _get_numeric_columns(df: pd.DataFrame) -> List[str]:
     """
-    上传 CSV 文本数据并缓存为资源，自动触发字段极性智能检测
+    获取DataFrame中的数值型字段列表
+    
+    识别结果只取决于列名与各列dtype，因此以二者为键缓存，避免重复执行select_dtypes。
     
     Args:
-        csv_text: CSV 格式的文本内容
+        df: 数据DataFrame
         
     Returns:
-        包含原始资源URI和极性检测结果的字典
+        数值型字段名列表（保持原列顺序）
     """
-    try:
-        # 使用 pandas 解析 CSV 文本
-        df = pd.read_csv(io.StringIO(csv_text))
-        
-        # 使用标准化的资源命名规则
-        resource_id = generate_resource_id("raw_data")
-        uri = get_resource_uri(resource_id)
-        
-        # 缓存数据到内存
-        DATA_CACHE[uri] = df
-        
-        # 更新资源索引（修复资源不存在的根本问题）
-        RESOURCE_INDEX[resource_id] = {
-            'uri': uri,
-            'type': 'raw_data',
-            'rows': len(df),
-            'columns': len(df.columns),
-            'column_names': list(df.columns)
-        }
-        
-        # MVP阶段：不保存到持久化存储（已在内存中）
-        # save_resource_to_persistent_storage(resource_id, df)
-        
-        # 记录上传信息
-        print(f"数据上传成功: {uri}")
-        print(f"资源类型: 原始数据 (raw_data)")
-        print(f"数据集信息: {len(df)} 行, {len(df.columns)} 列")
-        print(f"列名: {list(df.columns)}")
-        print(f"✅ 资源已缓存到内存（MVP阶段不持久化到磁盘）")
-        
-        # 自动触发字段极性智能检测
-        print("\n🔍 开始字段极性智能检测...")
-        
-        # 分析数值字段
-        numeric_analysis = analyze_numeric_fields(df)
-        
-        if not numeric_analysis:
-            print("⚠️  未发现数值型字段，跳过极性检测")
-            return {
-                "original_resource_uri": uri,
-                "polarity_detection": {
-                    "status": "skipped",
-                    "message": "未发现数值型字段，无需极性检测"
-                },
-                "adjusted_resource_uri": None,
-                "next_actions": [
-                    "分析这些数据字段的特征（使用analyze_data_fields工具）",
-                    "查看数据内容（使用export_resource_to_csv工具）"
-                ]
-            }
-        
-        # 检测字段极性
-        polarity_results = auto_detect_polarity(df, numeric_analysis)
-        
-        # 生成极性检测报告
-        polarity_report = generate_polarity_report(polarity_results)
-        
-        # 检查是否有无法评估的字段
-        failed_detections = [col for col, result in polarity_results.items() if not result['detection_successful']]
-        
-        if failed_detections:
-            print("❌ 发现无法评估极性的字段")
-            print(polarity_report)
-            
-            # 构建极性配置模板
-            polarity_config = {}
-            for col, result in polarity_results.items():
-                if result['detection_successful']:
-                    polarity_config[col] = result['suggested_polarity']
-            
-            return {
-                "original_resource_uri": uri,
-                "polarity_detection": {
-                    "status": "requires_confirmation",
-                    "message": "发现无法评估极性的字段，需要用户确认极性配置",
-                    "failed_fields": failed_detections,
-                    "detected_polarities": polarity_config,
-                    "report": polarity_report
-                },
-                "adjusted_resource_uri": None,
-                "next_actions": [
-                    "使用apply_polarity_adjustment工具手动确认极性配置",
-                    "修改表头名称，包含明确的极性指示词",
-                    "查看数据内容（使用export_resource_to_csv工具）"
-                ]
-            }
+    key = (tuple(df.columns), tuple(df.dtypes))
+    numeric_columns = NUMERIC_COLUMNS_CACHE.get(key)
+    if numeric_columns is None:
+        numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        if len(NUMERIC_COLUMNS_CACHE) >= NUMERIC_COLUMNS_CACHE_MAX_SIZE:
+            NUMERIC_COLUMNS_CACHE.pop(next(iter(NUMERIC_COLUMNS_CACHE)))
+        NUMERIC_COLUMNS_CACHE[key] = numeric_columns
+    return list(numeric_columns)
+
+### 获取分类型字段列表（按列名与dtypes缓存识别结果）
+def _get_categorical_columns(df: pd.DataFrame) -> List[str]:
+    """
+    获取DataFrame中的分类型字段列表（与analyze_categorical_fields的默认识别规则一致）
+    
+    Args:
+        df: 数据DataFrame
         
-        # 所有字段极性检测成功，自动应用调整
-        print("🔄 应用极性调整策略...")
-        adjusted_df = apply_polarity_adjustment(df, polarity_results)
+    Returns:
+        分类型字段名列表（保持原列顺序）
+    """
+    key = (tuple(df.columns), tuple(df.dtypes))
+    categorical_columns = CATEGORICAL_COLUMNS_CACHE.get(key)
+    if categorical_columns is None:
+        categorical_columns = df.select_dtypes(include=list(CATEGORICAL_DTYPES)).columns.tolist()
+        if len(CATEGORICAL_COLUMNS_CACHE) >= CATEGORICAL_COLUMNS_CACHE_MAX_SIZE:
+            CATEGORICAL_COLUMNS_CACHE.pop(next(iter(CATEGORICAL_COLUMNS_CACHE)))
+        CATEGORICAL_COLUMNS_CACHE[key] = categorical_columns
+    return list(categorical_columns)
+
+### 压缩上传数据的内存占用
+def _optimize_upload_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    将低基数的字符串列转换为category类型，降低内存占用
+    
+    数值列保持原有精度：隶属度计算对精度敏感，窄整数类型在求差值时也存在溢出风险
+    
+    Args:
+        df: 刚解析得到的DataFrame
         
-        # 保存调整后的数据为缓存资源
-        adjusted_resource_id = generate_resource_id("raw_data", resource_id, "polarity_adjusted")
-        adjusted_uri = get_resource_uri(adjusted_resource_id)
+    Returns:
+        转换后的DataFrame
+    """
+    n_rows = len(df)
+    if n_rows == 0:
+        return df
+    
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        if df[col].nunique() / n_rows < CATEGORY_CARDINALITY_RATIO:
+            df[col] = df[col].astype("category")
+    
+    return df
+
+### 上传数据的公共处理流程：缓存原始数据、字段极性检测、极性调整
+def _finalize_upload(df: pd.DataFrame, source_label: str = "", sheet_name: Optional[str] = None,
+                     persist_adjusted: bool = False) -> Dict[str, Any]:
+    """
+    上传数据的公共处理流程（CSV与Excel上传共用）
+    
+    Args:
+        df: 已解析的原始数据
+        source_label: 日志中的数据来源标识（如"Excel "）
+        sheet_name: Excel工作表名称（可选，仅用于日志）
+        persist_adjusted: 是否将极性调整后的数据保存到持久化存储（Excel上传保存，CSV上传仅缓存）
         
-        # 缓存调整后的数据
-        DATA_CACHE[adjusted_uri] = adjusted_df
-        
-        # 更新资源索引（修复极性调整后资源不存在的根本问题）
-        RESOURCE_INDEX[adjusted_resource_id] = {
-            'uri': adjusted_uri,
-            'type': 'polarity_adjusted',
-            'rows': len(adjusted_df),
-            'columns': len(adjusted_df.columns),
-            'column_names': list(adjusted_df.columns),
-            'parent_resource_id': resource_id
+    Returns:
+        包含原始资源URI和极性检测结果的字典
+    """
+    # 使用标准化的资源命名规则
+    resource_id = generate_resource_id("raw_data")
+    
+    # 缓存数据到内存并更新资源索引
+    uri = _register_resource(resource_id, df, type='raw_data')
+    # 复用资源记录中已计算的形状信息，避免重复访问df.columns
+    record = RESOURCE_INDEX[resource_id]
+    
+    # MVP阶段：不保存到持久化存储（已在内存中）
+    # save_resource_to_persistent_storage(resource_id, df)
+    
+    # 记录上传信息
+    logger.info("%s数据上传成功: %s", source_label, uri)
+    logger.info("资源类型: 原始数据 (raw_data)")
+    logger.info("数据集信息: %d 行, %d 列", record.rows, record.columns)
+    logger.info("列名: %s", list(record.column_names))
+    if sheet_name:
+        logger.info("工作表: %s", sheet_name)
+    logger.info("✅ 资源已缓存到内存（MVP阶段不持久化到磁盘）")
+    
+    # 自动触发字段极性智能检测
+    logger.info("🔍 开始字段极性智能检测...")
+    
+    # 分析数值字段（先按dtype筛选，无数值列时直接跳过分析）
+    numeric_columns = _get_numeric_columns(df)
+    numeric_analysis = analyze_numeric_fields(df, numeric_columns) if numeric_columns else {}
+    
+    if not numeric_analysis:
+        logger.info("⚠️  未发现数值型字段，跳过极性检测")
+        return {
+            "original_resource_uri": uri,
+            "polarity_detection": {
+                "status": "skipped",
+                "message": "未发现数值型字段，无需极性检测"
+            },
+            "adjusted_resource_uri": None,
+            "next_actions": [
+                "分析这些数据字段的特征（使用analyze_data_fields工具）",
+                "查看数据内容（使用export_resource_to_csv工具）"
+            ]
         }
+    
+    # 检测字段极性
+    polarity_results = auto_detect_polarity(df, numeric_analysis)
+    
+    # 生成极性检测报告
+    polarity_report = generate_polarity_report(polarity_results)
+    
+    # 检查是否有无法评估的字段
+    failed_detections = [col for col, result in polarity_results.items() if not result['detection_successful']]
+    
+    if failed_detections:
+        logger.info("❌ 发现无法评估极性的字段")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n%s", polarity_report)
         
-        # MVP阶段：不保存到持久化存储（已在内存中）
-        # save_resource_to_persistent_storage(adjusted_resource_id, adjusted_df)
-        
-        print(f"✅ 极性调整后的数据已缓存: {adjusted_uri}")
-        
-        # 输出极性检测报告
-        print("\n" + "="*60)
-        print("📊 字段极性智能检测完成")
-        print("="*60)
-        print(polarity_report)
-        
-        # 输出调整策略信息
-        print("\n🔄 极性调整策略已应用：")
+        # 构建极性配置模板
+        polarity_config = {}
         for col, result in polarity_results.items():
-            if result['suggested_polarity'] == 'max':
-                print(f"   - {col}: 越大越好 → 越小越好（通过取倒数转换）")
-            else:
-                print(f"   - {col}: 越小越好（无需调整）")
-        
-        print(f"\n💾 调整后数据已缓存为: {adjusted_uri}")
+            if result['detection_successful']:
+                polarity_config[col] = result['suggested_polarity']
         
         return {
             "original_resource_uri": uri,
             "polarity_detection": {
-                "status": "success",
-                "message": "字段极性检测完成，极性调整已应用",
-                "report": polarity_report,
-                "polarity_results": polarity_results
+                "status": "requires_confirmation",
+                "message": "发现无法评估极性的字段，需要用户确认极性配置",
+                "failed_fields": failed_detections,
+                "detected_polarities": polarity_config,
+                "report": polarity_report
             },
-            "adjusted_resource_uri": adjusted_uri,
+            "adjusted_resource_uri": None,
             "next_actions": [
-                "分析这些数据字段的特征（使用analyze_data_fields工具）",
-                "生成隶属度计算配置模板（使用generate_membership_config_template工具）",
+                "使用apply_polarity_adjustment_tool手动确认极性配置",
+                "修改表头名称，包含明确的极性指示词",
                 "查看数据内容（使用export_resource_to_csv工具）"
             ]
         }
+    
+    # 所有字段极性检测成功，自动应用调整
+    logger.info("🔄 应用极性调整策略...")
+    adjusted_df = apply_polarity_adjustment(df, polarity_results)
+    
+    # 保存调整后的数据为缓存资源
+    adjusted_resource_id = generate_resource_id("raw_data", resource_id, "polarity_adjusted")
+    
+    adjusted_uri = get_resource_uri(adjusted_resource_id)
+    if persist_adjusted:
+        # 保存到持久化存储（MVP阶段即写入内存缓存并登记带有data_shape、file_path等字段的资源记录）
+        save_resource_to_persistent_storage(adjusted_resource_id, adjusted_df)
+        logger.info("✅ 极性调整后的数据已保存: %s", adjusted_uri)
+    else:
+        # 缓存调整后的数据并更新资源索引（MVP阶段不保存到持久化存储）
+        _register_resource(
+            adjusted_resource_id,
+            adjusted_df,
+            type='polarity_adjusted',
+            parent_resource_id=resource_id
+        )
+        logger.info("✅ 极性调整后的数据已缓存: %s", adjusted_uri)
+    
+    # 输出极性检测报告及调整策略信息（日志级别未开启时跳过整段格式化）
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s\n📊 字段极性智能检测完成\n%s\n%s", "="*60, "="*60, polarity_report)
+        
+        strategy_lines = []
+        for col, result in polarity_results.items():
+            if result['suggested_polarity'] == 'max':
+                strategy_lines.append(f"   - {col}: 越大越好 → 越小越好（通过取倒数转换）")
+            else:
+                strategy_lines.append(f"   - {col}: 越小越好（无需调整）")
+        logger.info("🔄 极性调整策略已应用：\n%s", "\n".join(strategy_lines))
+    
+    logger.info("💾 调整后数据已缓存为: %s", adjusted_uri)
+    
+    return {
+        "original_resource_uri": uri,
+        "polarity_detection": {
+            "status": "success",
+            "message": "字段极性检测完成，极性调整已应用",
+            "report": polarity_report,
+            "polarity_results": polarity_results
+        },
+        "adjusted_resource_uri": adjusted_uri,
+        "next_actions": [
+            "分析这些数据字段的特征（使用analyze_data_fields工具）",
+            "生成隶属度计算配置模板（使用generate_membership_config_template工具）",
+            "查看数据内容（使用export_resource_to_csv工具）"
+        ]
+    }
+
+### 上传 CSV 文本数据并缓存为资源，自动触发字段极性智能检测
+@mcp.tool()
+def upload_csv(csv_text: str) -> Dict[str, Any]:
+    """
+    上传 CSV 文本数据并缓存为资源，自动触发字段极性智能检测
+    
+    Args:
+        csv_text: CSV 格式的文本内容
+        
+    Returns:
+        包含原始资源URI和极性检测结果的字典
+    """
+    try:
+        # 使用 pandas 解析 CSV 文本（优先使用pyarrow引擎）
+        df = pd.read_csv(io.StringIO(csv_text), engine=CSV_PARSE_ENGINE)
+        df = _optimize_upload_dtypes(df)
+        
+        return _finalize_upload(df)
         
     except Exception as e:
         raise ValueError(f"CSV 解析失败: {str(e)}")
@@ -608,154 +851,14 @@ def upload_excel(file_content: str, sheet_name: Optional[str] = None) -> Dict[st
         import base64
         excel_bytes = base64.b64decode(file_content)
         
-        # 使用 pandas 解析 Excel 文件
+        # 使用 pandas 解析 Excel 文件（优先使用calamine引擎）
         if sheet_name:
-            df = pd.read_excel(io.BytesIO(excel_bytes), sheet_name=sheet_name)
+            df = pd.read_excel(io.BytesIO(excel_bytes), sheet_name=sheet_name, engine=EXCEL_PARSE_ENGINE)
         else:
-            df = pd.read_excel(io.BytesIO(excel_bytes))
+            df = pd.read_excel(io.BytesIO(excel_bytes), engine=EXCEL_PARSE_ENGINE)
+        df = _optimize_upload_dtypes(df)
         
-        # 使用标准化的资源命名规则
-        resource_id = generate_resource_id("raw_data")
-        uri = get_resource_uri(resource_id)
-        
-        # 缓存数据到内存
-        DATA_CACHE[uri] = df
-        
-        # 更新资源索引（修复Excel上传资源不存在的根本问题）
-        RESOURCE_INDEX[resource_id] = {
-            'uri': uri,
-            'type': 'raw_data',
-            'rows': len(df),
-            'columns': len(df.columns),
-            'column_names': list(df.columns)
-        }
-        
-        # MVP阶段：不保存到持久化存储（已在内存中）
-        # save_resource_to_persistent_storage(resource_id, df)
-        
-        # 记录上传信息
-        print(f"Excel 数据上传成功: {uri}")
-        print(f"资源类型: 原始数据 (raw_data)")
-        print(f"数据集信息: {len(df)} 行, {len(df.columns)} 列")
-        print(f"列名: {list(df.columns)}")
-        if sheet_name:
-            print(f"工作表: {sheet_name}")
-        print(f"✅ 资源已缓存到内存（MVP阶段不持久化到磁盘）")
-        
-        # 自动触发字段极性智能检测
-        print("\n🔍 开始字段极性智能检测...")
-        
-        # 分析数值字段
-        numeric_analysis = analyze_numeric_fields(df)
-        
-        if not numeric_analysis:
-            print("⚠️  未发现数值型字段，跳过极性检测")
-            return {
-                "original_resource_uri": uri,
-                "polarity_detection": {
-                    "status": "skipped",
-                    "message": "未发现数值型字段，无需极性检测"
-                },
-                "adjusted_resource_uri": None,
-                "next_actions": [
-                    "分析这些数据字段的特征（使用analyze_data_fields工具）",
-                    "查看数据内容（使用export_resource_to_csv工具）"
-                ]
-            }
-        
-        # 检测字段极性
-        polarity_results = auto_detect_polarity(df, numeric_analysis)
-        
-        # 生成极性检测报告
-        polarity_report = generate_polarity_report(polarity_results)
-        
-        # 检查是否有无法评估的字段
-        failed_detections = [col for col, result in polarity_results.items() if not result['detection_successful']]
-        
-        if failed_detections:
-            print("❌ 发现无法评估极性的字段")
-            print(polarity_report)
-            
-            # 构建极性配置模板
-            polarity_config = {}
-            for col, result in polarity_results.items():
-                if result['detection_successful']:
-                    polarity_config[col] = result['suggested_polarity']
-            
-            return {
-                "original_resource_uri": uri,
-                "polarity_detection": {
-                    "status": "requires_confirmation",
-                    "message": "发现无法评估极性的字段，需要用户确认极性配置",
-                    "failed_fields": failed_detections,
-                    "detected_polarities": polarity_config,
-                    "report": polarity_report
-                },
-                "adjusted_resource_uri": None,
-                "next_actions": [
-                    "使用apply_polarity_adjustment_tool手动确认极性配置",
-                    "修改表头名称，包含明确的极性指示词",
-                    "查看数据内容（使用export_resource_to_csv工具）"
-                ]
-            }
-        
-        # 应用极性调整
-        print("🔄 应用极性调整策略...")
-        adjusted_df = apply_polarity_adjustment(df, polarity_results)
-        
-        # 保存调整后的数据为缓存资源
-        adjusted_resource_id = generate_resource_id("raw_data", resource_id, "polarity_adjusted")
-        adjusted_uri = get_resource_uri(adjusted_resource_id)
-        
-        # 缓存调整后的数据
-        DATA_CACHE[adjusted_uri] = adjusted_df
-        
-        # 更新资源索引（修复极性调整后资源不存在的根本问题）
-        RESOURCE_INDEX[adjusted_resource_id] = {
-            'uri': adjusted_uri,
-            'type': 'polarity_adjusted',
-            'rows': len(adjusted_df),
-            'columns': len(adjusted_df.columns),
-            'column_names': list(adjusted_df.columns),
-            'parent_resource_id': resource_id
-        }
-        
-        # 保存到持久化存储
-        save_resource_to_persistent_storage(adjusted_resource_id, adjusted_df)
-        
-        print(f"✅ 极性调整后的数据已保存: {adjusted_uri}")
-        
-        # 输出极性检测报告
-        print("\n" + "="*60)
-        print("📊 字段极性智能检测完成")
-        print("="*60)
-        print(polarity_report)
-        
-        # 输出调整策略信息
-        print("\n🔄 极性调整策略已应用：")
-        for col, result in polarity_results.items():
-            if result['suggested_polarity'] == 'max':
-                print(f"   - {col}: 越大越好 → 越小越好（通过取倒数转换）")
-            else:
-                print(f"   - {col}: 越小越好（无需调整）")
-        
-        print(f"\n💾 调整后数据已保存为: {adjusted_uri}")
-        
-        return {
-            "original_resource_uri": uri,
-            "polarity_detection": {
-                "status": "success",
-                "message": "字段极性检测完成，极性调整已应用",
-                "report": polarity_report,
-                "polarity_results": polarity_results
-            },
-            "adjusted_resource_uri": adjusted_uri,
-            "next_actions": [
-                "分析这些数据字段的特征（使用analyze_data_fields工具）",
-                "生成隶属度计算配置模板（使用generate_membership_config_template工具）",
-                "查看数据内容（使用export_resource_to_csv工具）"
-            ]
-        }
+        return _finalize_upload(df, source_label="Excel ", sheet_name=sheet_name, persist_adjusted=True)
         
     except Exception as e:
         raise ValueError(f"Excel 解析失败: {str(e)}")
@@ -770,21 +873,19 @@ def get_data_resource(resource_id: str) -> Dict[str, Any]:
         resource_id: 资源标识符（可以是纯ID或完整URI）
         
     Returns:
-        数据集的字典表示（前100行预览），用markdown加载数据预览
+        数据集的字典表示（前100行按列预览：列名 -> 值列表），用markdown加载数据预览
     """
     # 处理URI格式的资源ID
-    if resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
-    uri = f"data://{resource_id}"
+    uri = f"{URI_PREFIX}{resource_id}"
     
-    if uri not in DATA_CACHE:
+    df = DATA_CACHE.get(uri, _MISSING)
+    if df is _MISSING:
         raise ValueError(f"资源不存在: {uri}")
     
-    df = DATA_CACHE[uri]
-    
-    # 返回数据预览（前100行）
-    preview_data = df.head(100).to_dict(orient='records')
+    # 返回数据预览（前100行，按列组织，避免逐行构造字典）
+    preview_data = df.head(100).to_dict(orient='list')
     
     return {
         "resource_uri": uri,
@@ -806,14 +907,14 @@ def list_data_resources() -> Dict[str, Any]:
     Returns:
         资源列表和统计信息
     """
-    resources_info = {}
-    
-    for uri, df in DATA_CACHE.items():
-        resources_info[uri] = {
+    resources_info = {
+        uri: {
             "rows": len(df),
             "columns": len(df.columns),
             "column_names": list(df.columns)
         }
+        for uri, df in DATA_CACHE.items()
+    }
     
     return {
         "total_resources": len(DATA_CACHE),
@@ -835,24 +936,25 @@ def list_resources_by_type(resource_type: str = None) -> Dict[str, Any]:
     resources_by_type = {}
     
     for uri, df in DATA_CACHE.items():
-        if uri.startswith("data://"):
-            resource_id = uri[7:]  # 移除 "data://" 前缀
-            parsed_info = parse_resource_id(resource_id)
-            
-            res_type = parsed_info["type"]
-            
-            if resource_type and res_type != resource_type:
-                continue
-                
-            if res_type not in resources_by_type:
-                resources_by_type[res_type] = []
-            
-            resources_by_type[res_type].append({
-                "resource_id": resource_id,
-                "uri": uri,
-                "data_shape": f"{len(df)} 行 × {len(df.columns)} 列",
-                "parsed_info": parsed_info
-            })
+        resource_id = uri.removeprefix(URI_PREFIX)
+        parsed_info = parse_resource_id(resource_id)
+        
+        res_type = parsed_info["type"]
+        
+        if resource_type and res_type != resource_type:
+            continue
+        
+        # 形状描述在写入缓存时已生成，仅对未经_cache_dataframe写入的资源现场格式化
+        data_shape = RESOURCE_SHAPE_CACHE.get(uri)
+        if data_shape is None:
+            data_shape = f"{len(df)} 行 × {len(df.columns)} 列"
+        
+        resources_by_type.setdefault(res_type, []).append({
+            "resource_id": resource_id,
+            "uri": uri,
+            "data_shape": data_shape,
+            "parsed_info": parsed_info
+        })
     
     return {
         "total_resources": len(DATA_CACHE),
@@ -869,8 +971,14 @@ def clear_data_cache() -> Dict[str, Any]:
     Returns:
         操作结果
     """
-    cache_size = len(DATA_CACHE)
-    DATA_CACHE.clear()
+    with RESOURCE_WRITE_LOCK:
+        cache_size = len(DATA_CACHE)
+        DATA_CACHE.clear()
+        UNIQUE_ID_INDEX.clear()
+        RESOURCE_SHAPE_CACHE.clear()
+        MEMBERSHIP_RESOURCE_URIS.clear()
+        ANALYSIS_MEMO.clear()
+        NORMALIZED_MATRIX_MEMO.clear()
     
     return {
         "success": True,
@@ -883,7 +991,7 @@ def clear_data_cache() -> Dict[str, Any]:
 # =========================================================================================
 ### 分析数据集的字段特征
 @mcp.tool()
-def analyze_data_fields(resource_id: str, cache_result: bool = True) -> Dict[str, Any]:
+def analyze_data_fields(resource_id: str, cache_result: bool = True, summary_only: bool = False) -> Dict[str, Any]:
     """
     分析数据集的字段特征，返回固定的分析结果
     
@@ -901,9 +1009,12 @@ def analyze_data_fields(resource_id: str, cache_result: bool = True) -> Dict[str
     Args:
         resource_id: 资源标识符（可以是纯ID或完整URI）
         cache_result: 是否缓存分析结果（默认True）
+        summary_only: 是否仅返回数据集信息与数据质量摘要（默认False）；为True时跳过逐字段分析，
+            也不缓存分析结果，适合只需了解行列数和质量评级的快速查询
         
     Returns:
-        Dict[str, Any]: 包含以下字段的分析结果：
+        Dict[str, Any]: 包含以下字段的分析结果（summary_only为True时仅包含
+        dataset_info、data_quality_summary和analysis_summary）：
         - dataset_info: 数据集基本信息
         - field_analysis: 字段分析结果
         - data_quality_summary: 数据质量摘要
@@ -919,39 +1030,90 @@ def analyze_data_fields(resource_id: str, cache_result: bool = True) -> Dict[str
         print(f"🤖 自动发现隶属度资源: {resource_id}")
     
     # 处理URI格式的资源ID
-    if resource_id and resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     uri = get_resource_uri(resource_id)
     
-    if uri not in DATA_CACHE:
+    df = DATA_CACHE.get(uri, _MISSING)
+    if df is _MISSING:
         raise ValueError(f"资源不存在: {uri}")
     
-    df = DATA_CACHE[uri]
-    
-    # 执行字段分析
-    numeric_analysis = analyze_numeric_fields(df)
-    categorical_analysis = analyze_categorical_fields(df)
-    
-    # 自动检测字段极性
-    polarity_suggestions = auto_detect_polarity(df, numeric_analysis)
+    # 形状与列名只取一次，后续统一复用
+    n_rows, n_cols = df.shape
+    col_list = df.columns.tolist()
     
-    # 检查极性一致性并生成警告
-    polarity_warnings = check_polarity_consistency(polarity_suggestions)
+    # 分析过程对同一DataFrame是确定性的，重复分析同一资源时直接复用备忘结果
+    # （以弱引用判断是否为同一DataFrame对象，避免对象回收后id被新DataFrame复用而返回过期结果）
+    memo_signature = (df.shape, tuple(map(str, df.dtypes)))
+    memo_entry = ANALYSIS_MEMO.get(uri)
+    if memo_entry is not None and memo_entry[0]() is df and memo_entry[1] == memo_signature:
+        memo = memo_entry[2]
+    else:
+        memo = None
     
-    # 生成数据质量摘要
-    data_quality_summary = generate_data_quality_summary(df)
+    # 快速查询：仅生成数据质量摘要，不构建逐字段的分析结果
+    if summary_only:
+        data_quality_summary = memo["data_quality_summary"].copy() if memo is not None else generate_data_quality_summary(df, n_rows, n_cols)
+        overall_quality = data_quality_summary['overall_quality']
+        return {
+            "dataset_info": {
+                "resource_uri": uri,
+                "total_rows": n_rows,
+                "total_columns": n_cols,
+                "column_names": col_list
+            },
+            "data_quality_summary": data_quality_summary,
+            "analysis_summary": (
+                f"{n_rows} 行 × {n_cols} 列，缺失率 {overall_quality['overall_missing_rate']:.2f}%，"
+                f"数据质量评级：{overall_quality['quality_rating']}"
+            )
+        }
     
-    # 生成分析总结（包含极性检查结果）
-    analysis_summary = generate_analysis_summary(df, numeric_analysis, categorical_analysis, data_quality_summary, polarity_warnings)
+    if memo is None:
+        # 执行字段分析
+        numeric_analysis = analyze_numeric_fields(df, _get_numeric_columns(df))
+        categorical_analysis = analyze_categorical_fields(df, _get_categorical_columns(df))
+        
+        # 自动检测字段极性（纯分类型数据集无数值字段，直接跳过）
+        polarity_suggestions = auto_detect_polarity(df, numeric_analysis) if numeric_analysis else {}
+        
+        # 检查极性一致性并生成警告（无数值字段时直接返回"无需极性检查"结果）
+        polarity_warnings = check_polarity_consistency(polarity_suggestions)
+        
+        # 生成数据质量摘要
+        data_quality_summary = generate_data_quality_summary(df, n_rows, n_cols)
+        
+        # 生成分析总结（包含极性检查结果）
+        analysis_summary = generate_analysis_summary(df, numeric_analysis, categorical_analysis, data_quality_summary, polarity_warnings)
+        
+        memo = {
+            "numeric_analysis": numeric_analysis,
+            "categorical_analysis": categorical_analysis,
+            "polarity_suggestions": polarity_suggestions,
+            "polarity_warnings": polarity_warnings,
+            "data_quality_summary": data_quality_summary,
+            "analysis_summary": analysis_summary
+        }
+        ANALYSIS_MEMO.pop(uri, None)
+        if len(ANALYSIS_MEMO) >= ANALYSIS_MEMO_MAX_SIZE:
+            ANALYSIS_MEMO.pop(next(iter(ANALYSIS_MEMO)))
+        ANALYSIS_MEMO[uri] = (weakref.ref(df), memo_signature, memo)
+    
+    # 返回备忘结果的副本，调用方修改返回值不会影响备忘表
+    numeric_analysis = memo["numeric_analysis"].copy()
+    categorical_analysis = memo["categorical_analysis"].copy()
+    polarity_suggestions = memo["polarity_suggestions"].copy()
+    polarity_warnings = memo["polarity_warnings"].copy()
+    data_quality_summary = memo["data_quality_summary"].copy()
+    analysis_summary = memo["analysis_summary"].copy()
     
     # 构建分析结果
     analysis_result = {
         "dataset_info": {
             "resource_uri": uri,
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "column_names": list(df.columns)
+            "total_rows": n_rows,
+            "total_columns": n_cols,
+            "column_names": col_list
         },
         "field_analysis": {
             "numeric_fields": numeric_analysis,
@@ -974,18 +1136,22 @@ def analyze_data_fields(resource_id: str, cache_result: bool = True) -> Dict[str
         result_uri = get_resource_uri(result_resource_id)
         
         # 将分析结果转换为DataFrame格式缓存
-        # 这里我们缓存一个包含分析摘要的简化DataFrame
-        analysis_df = pd.DataFrame([{
-            'analysis_type': 'field_analysis',
-            'parent_resource': resource_id,
-            'numeric_fields_count': len(numeric_analysis),
-            'categorical_fields_count': len(categorical_analysis),
-            'overall_missing_rate': data_quality_summary['overall_quality']['overall_missing_rate'],
-            'quality_rating': data_quality_summary['overall_quality']['quality_rating'],
-            'polarity_consistency': polarity_warnings['is_consistent']
-        }])
-        
-        DATA_CACHE[result_uri] = analysis_df
+        # 这里我们缓存一个包含分析摘要的简化DataFrame；其内容只取决于备忘的分析结果，
+        # 因此仅在首次缓存时构建，重复分析同一资源时直接复用（Copy-on-Write下可安全共享）
+        analysis_df = memo.get("summary_df")
+        if analysis_df is None:
+            analysis_df = pd.DataFrame([{
+                'analysis_type': 'field_analysis',
+                'parent_resource': resource_id,
+                'numeric_fields_count': len(numeric_analysis),
+                'categorical_fields_count': len(categorical_analysis),
+                'overall_missing_rate': data_quality_summary['overall_quality']['overall_missing_rate'],
+                'quality_rating': data_quality_summary['overall_quality']['quality_rating'],
+                'polarity_consistency': polarity_warnings['is_consistent']
+            }])
+            memo["summary_df"] = analysis_df
+        
+        _cache_dataframe(result_uri, analysis_df)
         analysis_result["result_resource_id"] = result_resource_id
         
         print(f"字段分析结果已缓存: {result_uri}")
@@ -1012,10 +1178,9 @@ def check_polarity_consistency(polarity_suggestions: Dict[str, Any]) -> Dict[str
         }
     
     # 统计极性分布
-    polarity_counts = {}
-    for field_info in polarity_suggestions.values():
-        polarity = field_info.get('suggested_polarity', 'unknown')
-        polarity_counts[polarity] = polarity_counts.get(polarity, 0) + 1
+    polarity_counts = dict(Counter(
+        field_info.get('suggested_polarity', 'unknown') for field_info in polarity_suggestions.values()
+    ))
     
     # 检查一致性
     is_consistent = len(polarity_counts) <= 1
@@ -1037,27 +1202,32 @@ def check_polarity_consistency(polarity_suggestions: Dict[str, Any]) -> Dict[str
     }
 
 ### 生成数据质量摘要
-def generate_data_quality_summary(df: pd.DataFrame) -> Dict[str, Any]:
-    """生成数据质量摘要"""
+def generate_data_quality_summary(df: pd.DataFrame, total_rows: Optional[int] = None, total_columns: Optional[int] = None) -> Dict[str, Any]:
+    """生成数据质量摘要（可传入调用方已计算的行数、列数以避免重复计算）"""
     
-    total_rows = len(df)
-    total_columns = len(df.columns)
+    if total_rows is None or total_columns is None:
+        total_rows, total_columns = df.shape
     
-    # 计算总体缺失情况
-    total_missing = df.isnull().sum().sum()
+    # 只生成一次缺失值掩码矩阵，按列求和得到各列缺失数量，总体缺失情况由其汇总
+    missing_counts = df.isnull().to_numpy().sum(axis=0, dtype=np.int64)
+    total_missing = missing_counts.sum()
     total_cells = total_rows * total_columns
     overall_missing_rate = (total_missing / total_cells) * 100 if total_cells > 0 else 0
     
     # 按列统计缺失情况
-    column_missing_stats = {}
-    for col in df.columns:
-        missing_count = df[col].isnull().sum()
-        missing_rate = (missing_count / total_rows) * 100
-        column_missing_stats[col] = {
-            "missing_count": int(missing_count),
-            "missing_rate": float(missing_rate),
-            "data_type": str(df[col].dtype)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        missing_rates = missing_counts / total_rows * 100
+    column_missing_stats = {
+        col: {
+            "missing_count": missing_count,
+            "missing_rate": missing_rate,
+            "data_type": dtype_str
         }
+        # tolist()批量转换为Python原生int/float，无需逐个转换
+        for col, dtype_str, missing_count, missing_rate in zip(
+            df.columns.tolist(), df.dtypes.astype(str).tolist(), missing_counts.tolist(), missing_rates.tolist()
+        )
+    }
     
     # 数据质量评级
     if overall_missing_rate < 1:
@@ -1082,113 +1252,132 @@ def generate_data_quality_summary(df: pd.DataFrame) -> Dict[str, Any]:
 
 ### 应用极性调整工具
 @mcp.tool()
-def apply_polarity_adjustment_tool(original_resource_uri: str, polarity_config: Dict[str, str]) -> Dict[str, Any]:
+def apply_polarity_adjustment_tool(original_resource_uri: str, polarity_config: Dict[str, str], include_report: bool = True) -> Dict[str, Any]:
     """
     根据用户确认的极性配置应用极性调整
     
     Args:
         original_resource_uri: 原始数据资源URI
         polarity_config: 极性配置字典，格式如 {"字段名": "min/max"}
+        include_report: 是否生成极性报告（默认True）；仅需调整后数据时可设为False，跳过隶属度参数与报告文本的构建
         
     Returns:
-        极性调整结果，包含调整后资源URI和调整详情
+        极性调整结果，包含调整后资源URI和调整详情（include_report为False时polarity_report为None）
     """
     try:
         # 从URI提取资源ID
-        if not original_resource_uri.startswith("data://"):
+        if not original_resource_uri.startswith(URI_PREFIX):
             raise ValueError("资源URI格式不正确，应以'data://'开头")
         
-        resource_id = original_resource_uri[7:]  # 移除 "data://" 前缀
+        resource_id = original_resource_uri.removeprefix(URI_PREFIX)
         
         # 检查资源是否存在
-        if original_resource_uri not in DATA_CACHE:
+        df = DATA_CACHE.get(original_resource_uri, _MISSING)
+        if df is _MISSING:
             # 尝试从持久化存储加载
             try:
                 df = load_resource_from_persistent_storage(resource_id)
-                DATA_CACHE[original_resource_uri] = df
+                _cache_dataframe(original_resource_uri, df)
             except Exception as e:
                 raise ValueError(f"资源不存在或无法加载: {original_resource_uri}")
         
-        df = DATA_CACHE[original_resource_uri]
-        
         print(f"🔍 开始应用极性调整...")
         print(f"原始资源: {original_resource_uri}")
         print(f"极性配置: {polarity_config}")
         
         # 验证极性配置
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
+        numeric_columns = _get_numeric_columns(df)
         
         for col in polarity_config.keys():
             if col not in numeric_columns:
                 raise ValueError(f"字段 '{col}' 不存在或不是数值型字段")
         
-        # 构建极性结果结构
+        # 构建极性结果结构（仅在需要报告时计算隶属度参数和规则描述）
         polarity_results = {}
-        for col, polarity in polarity_config.items():
-            series = df[col].dropna()
-            min_val = float(series.min())
-            max_val = float(series.max())
-            
-            # 计算隶属度参数
-            if polarity == 'max':
-                a = min_val
-                c = max_val
-                b = (a + c) / 2
-            else:  # min
-                a = max_val
-                c = min_val
-                b = (a + c) / 2
+        if include_report:
+            config_columns = list(polarity_config)
+            column_mins = df[config_columns].min()
+            column_maxes = df[config_columns].max()
             
-            polarity_results[col] = {
-                'suggested_polarity': polarity,
-                'confidence': 'user_confirmed',
-                'reasoning': '用户手动确认极性配置',
-                'membership_rules': f"""
-    ## 对于{'越大越好' if polarity == 'max' else '越小越好'}的字段（{col}）：
-    - {'a < b < c' if polarity == 'max' else 'a > b > c'} （如{col}：{a:.2f}→{b:.2f}→{c:.2f}）
-    - 当实际值 {'≤' if polarity == 'max' else '≥'} a时：隶属度=0%
-    - 当实际值 {'≥' if polarity == 'max' else '≤'} c时：隶属度=100%
-    """.strip(),
-                'adjustment_strategy': f"极性调整方法：通过线性变换的方法将越大越好的字段转换为越小越好" if polarity == 'max' else "无需调整，已为越小越好类型",
-                'parameters': {'a': a, 'b': b, 'c': c},
-                'detection_successful': True
-            }
+            for col, polarity in polarity_config.items():
+                min_val = float(column_mins[col])
+                max_val = float(column_maxes[col])
+                
+                # 计算隶属度参数
+                if polarity == 'max':
+                    a = min_val
+                    c = max_val
+                    b = (a + c) / 2
+                else:  # min
+                    a = max_val
+                    c = min_val
+                    b = (a + c) / 2
+                
+                polarity_results[col] = {
+                    'suggested_polarity': polarity,
+                    'confidence': 'user_confirmed',
+                    'reasoning': '用户手动确认极性配置',
+                    'membership_rules': (
+                        MAX_POLARITY_RULE_TEMPLATE if polarity == 'max' else MIN_POLARITY_RULE_TEMPLATE
+                    ).format(col=col, a=a, b=b, c=c),
+                    'adjustment_strategy': f"极性调整方法：通过线性变换的方法将越大越好的字段转换为越小越好" if polarity == 'max' else "无需调整，已为越小越好类型",
+                    'parameters': {'a': a, 'b': b, 'c': c},
+                    'detection_successful': True
+                }
         
         # 应用极性调整
         print("🔄 应用极性调整策略...")
-        adjusted_df = df.copy()
-        
-        for col, result in polarity_results.items():
-            if result['suggested_polarity'] == 'max':
-                # 对越大越好的字段使用线性变换（修复取倒数导致值过小的问题）
-                max_val = df[col].max() * 1.5  # 使用1.5倍最大值作为参考
-                adjusted_df[col] = max_val - df[col]
-                print(f"✅ 已对字段 '{col}' 应用极性调整（线性变换: {max_val:.2f} - x）")
+        max_columns = [col for col, polarity in polarity_config.items() if polarity == 'max']
+        
+        # 未调整的字段直接复用原始列，仅为调整字段分配新数组
+        adjusted_columns = {col: df[col] for col in df.columns}
+        reference_by_column = {}
+        
+        if max_columns:
+            # 对越大越好的字段使用线性变换（修复取倒数导致值过小的问题）：
+            # 整块矩阵一次完成"1.5倍最大值 - x"，避免逐列的pandas运算
+            # 按列连续存储（pandas导出的块通常已是该布局），结果原地写回block，
+            # 各列Series直接引用block的列视图，不再产生第二份副本
+            block = np.asfortranarray(df[max_columns].to_numpy(dtype=np.float64, copy=True))
+            reference_values = np.nanmax(block, axis=0) * 1.5  # 使用1.5倍最大值作为参考
+            np.subtract(reference_values[np.newaxis, :], block, out=block)
+            for col_idx, col in enumerate(max_columns):
+                adjusted_columns[col] = pd.Series(block[:, col_idx], index=df.index, name=col, copy=False)
+            reference_by_column = dict(zip(max_columns, reference_values.tolist()))
+        
+        # 日志逐行收集后一次性输出
+        log_lines = []
+        for col, polarity in polarity_config.items():
+            if polarity == 'max':
+                max_val = reference_by_column[col]
+                log_lines.append(f"✅ 已对字段 '{col}' 应用极性调整（线性变换: {max_val:.2f} - x）")
             else:
-                print(f"✅ 字段 '{col}' 为越小越好类型，无需调整")
+                log_lines.append(f"✅ 字段 '{col}' 为越小越好类型，无需调整")
+        if log_lines:
+            print("\n".join(log_lines))
+        
+        adjusted_df = pd.DataFrame(adjusted_columns, copy=False)
         
         # 保存调整后的数据为缓存资源
         adjusted_resource_id = generate_resource_id("raw_data", resource_id, "polarity_adjusted")
-        adjusted_uri = get_resource_uri(adjusted_resource_id)
         
-        # 缓存调整后的数据
-        DATA_CACHE[adjusted_uri] = adjusted_df
-        
-        # 保存到持久化存储
+        # 保存到持久化存储（MVP阶段即写入内存缓存并登记索引，直接共享adjusted_df，无需另行缓存）
+        adjusted_uri = get_resource_uri(adjusted_resource_id)
         save_resource_to_persistent_storage(adjusted_resource_id, adjusted_df)
         
         print(f"✅ 极性调整后的数据已保存: {adjusted_uri}")
         
         # 生成极性检测报告
-        polarity_report = generate_polarity_report(polarity_results)
+        polarity_report = generate_polarity_report(polarity_results) if include_report else None
         
         # 输出调整策略信息
-        print("\n🔄 极性调整策略已应用：")
-        for col, result in polarity_results.items():
-            if result['suggested_polarity'] == 'max':
-                print(f"   - {col}: 越大越好 → 越小越好（通过取倒数转换）")
+        strategy_lines = ["\n🔄 极性调整策略已应用："]
+        for col, polarity in polarity_config.items():
+            if polarity == 'max':
+                strategy_lines.append(f"   - {col}: 越大越好 → 越小越好（通过取倒数转换）")
             else:
-                print(f"   - {col}: 越小越好（无需调整）")
+                strategy_lines.append(f"   - {col}: 越小越好（无需调整）")
+        print("\n".join(strategy_lines))
         
         print(f"\n💾 调整后数据已保存为: {adjusted_uri}")
         
@@ -1269,19 +1458,10 @@ def generate_membership_config_template(resource_id: str) -> str:
     ```
     """
     # 处理URI格式的资源ID
-    if resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     # 检查是否存在极性调整后的数据资源
-    polarity_adjusted_resource_id = None
-    for cached_uri in DATA_CACHE.keys():
-        if cached_uri.startswith("data://") and "polarity_adjusted" in cached_uri:
-            # 检查是否是当前资源的极性调整版本
-            adjusted_parsed = parse_resource_id(cached_uri[7:])  # 移除 "data://" 前缀
-            if (adjusted_parsed["type"] == "raw_data" and 
-                adjusted_parsed.get("parent_hash") == resource_id):
-                polarity_adjusted_resource_id = cached_uri[7:]  # 移除 "data://" 前缀
-                break
+    polarity_adjusted_resource_id = _find_polarity_adjusted(resource_id)
     
     # 优先使用极性调整后的数据资源
     if polarity_adjusted_resource_id:
@@ -1293,48 +1473,35 @@ def generate_membership_config_template(resource_id: str) -> str:
         uri = get_resource_uri(resource_id)
         used_resource_id = resource_id
     
-    if uri not in DATA_CACHE:
+    df = DATA_CACHE.get(uri, _MISSING)
+    if df is _MISSING:
         raise ValueError(f"资源不存在: {uri}")
     
-    df = DATA_CACHE[uri]
-    
     # 检查是否为raw数据
     parsed_info = parse_resource_id(used_resource_id)
     if parsed_info["type"] != "raw_data":
         print(f"⚠️ 警告: 使用非原始数据生成配置模板，建议使用raw数据")
     
     # 获取数值字段
-    import numpy as np
-    numeric_fields = df.select_dtypes(include=[np.number]).columns.tolist()
+    numeric_fields = _get_numeric_columns(df)
     
     if not numeric_fields:
         raise ValueError("数据集中无数值字段，无法生成隶属度计算配置")
     
-    # 为每个数值字段生成默认级别参数（下界型函数需要多个级别参数）
-    level_params_template = {}
-    field_statistics = {}
-    for field in numeric_fields:
-        field_data = df[field].dropna()
-        if len(field_data) > 0:
-            min_val = float(field_data.min())
-            max_val = float(field_data.max())
-            
-            # 为每个字段生成默认级别参数列表（3个级别）
-            level_params_template[field] = [
-                round(max_val * 0.8, 2),  # 级别1参数
-                round(max_val * 0.5, 2),  # 级别2参数
-                round(max_val * 0.2, 2)   # 级别3参数
-            ]
-            
-            field_statistics[field] = {
-                "min": min_val,
-                "max": max_val,
-                "mean": float(field_data.mean()),
-                "std": float(field_data.std())
-            }
+    # 一次聚合计算所有数值字段的统计量（全为缺失值的字段没有统计信息，直接排除）
+    stats_df = df[numeric_fields].agg(['min', 'max', 'mean', 'std']).T
+    stats_df = stats_df[stats_df['max'].notna()]
+    field_statistics = stats_df.to_dict('index')
+    
+    # 为每个数值字段生成默认级别参数（下界型函数需要多个级别参数，默认3个级别）
+    # 使用Python内置round保持十进制舍入结果（np.round在35.265等边界值上会向下舍入）
+    level_params_template = {
+        field: [round(max_val * ratio, 2) for ratio in TEMPLATE_LEVEL_RATIOS]
+        for field, max_val in zip(stats_df.index, stats_df['max'].tolist())
+    }
     
-    # 生成Markdown格式的配置模板
-    markdown_content = f"""
+    # 生成Markdown格式的配置模板（各片段收集到列表中，最后一次性拼接）
+    markdown_parts = [f"""
     # 下界型隶属度计算配置模板
     ## 资源信息
     - **资源ID**: `{used_resource_id}`
@@ -1346,30 +1513,28 @@ def generate_membership_config_template(resource_id: str) -> str:
 
     | 字段 | 最小值 | 最大值 | 平均值 | 标准差 |
     |------|--------|--------|--------|--------|
-    """
+    """]
     
-    # 添加字段统计表格行
-    for field in numeric_fields:
-        stats = field_statistics[field]
-        markdown_content += f"| {field} | {stats['min']:.2f} | {stats['max']:.2f} | {stats['mean']:.2f} | {stats['std']:.2f} |\n"
+    # 添加字段统计表格行（全为缺失值的字段没有统计信息，直接跳过）
+    markdown_parts.extend(
+        f"| {field} | {stats['min']:.2f} | {stats['max']:.2f} | {stats['mean']:.2f} | {stats['std']:.2f} |\n"
+        for field, stats in field_statistics.items()
+    )
     
-    markdown_content += """
+    markdown_parts.append("""
     ## 推荐配置模板
 
     ```json
     {
     "级别参数": {
-    """
+    """)
     
-    # 添加级别参数配置
-    for i, field in enumerate(numeric_fields):
-        params = level_params_template[field]
-        markdown_content += f'    "{field}": {params}'
-        if i < len(numeric_fields) - 1:
-            markdown_content += ","
-        markdown_content += "\n"
+    # 添加级别参数配置（各字段之间以逗号分隔）
+    markdown_parts.append(",\n".join(
+        f'    "{field}": {params}' for field, params in level_params_template.items()
+    ) + "\n")
     
-    markdown_content += """  }
+    markdown_parts.append("""  }
     }
     ```
 
@@ -1397,8 +1562,8 @@ def generate_membership_config_template(resource_id: str) -> str:
     }
     ```
     **注意**: 配置中不再需要"隶属函数"字段，系统默认使用下界型函数。
-    """
-    return markdown_content
+    """)
+    return "".join(markdown_parts)
 
 ### 验证隶属度计算配置
 @mcp.tool()
@@ -1420,23 +1585,32 @@ def validate_membership_config(resource_id: str, config: Dict[str, Any]) -> Dict
             raise ValueError("未找到隶属度计算结果资源（mc开头的资源），请先执行隶属度计算")
         print(f"自动发现隶属度资源: {resource_id}")
     
+    return _resolve_and_validate(resource_id, config)[2]
+
+### 解析资源并验证隶属度计算配置
+def _resolve_and_validate(resource_id: str, config: Dict[str, Any]) -> Tuple[pd.DataFrame, List[str], Dict[str, Any]]:
+    """
+    解析资源并验证下界型隶属度计算配置，同时返回解析得到的数据，供调用方直接复用
+    
+    Args:
+        resource_id: 原始数据资源标识符（可以是纯ID或完整URI）
+        config: 用户提供的配置信息
+        
+    Returns:
+        (数据DataFrame, 数值字段列表, 验证结果)
+    """
     # 处理URI格式的资源ID
-    if resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     uri = get_resource_uri(resource_id)
     
-    if uri not in DATA_CACHE:
+    df = DATA_CACHE.get(uri, _MISSING)
+    if df is _MISSING:
         raise ValueError(f"资源不存在: {uri}")
     
-    df = DATA_CACHE[uri]
-    
-    # 检查是否为极性调整后的数据资源
-    is_polarity_adjusted = "polarity_adjusted" in resource_id
-    
-    # 获取数值字段
-    import numpy as np
-    numeric_fields = df.select_dtypes(include=[np.number]).columns.tolist()
+    # 获取数值字段（集合用于字段存在性检查）
+    numeric_fields = _get_numeric_columns(df)
+    numeric_field_set = set(numeric_fields)
     
     # 验证配置结构
     errors = []
@@ -1447,7 +1621,7 @@ def validate_membership_config(resource_id: str, config: Dict[str, Any]) -> Dict
         errors.append("配置中缺少'级别参数'字段")
     
     if errors:
-        return {
+        return df, numeric_fields, {
             "is_valid": False,
             "errors": errors,
             "warnings": warnings
@@ -1463,13 +1637,13 @@ def validate_membership_config(resource_id: str, config: Dict[str, Any]) -> Dict
     else:
         # 检查字段是否存在
         for field in level_params.keys():
-            if field not in numeric_fields:
+            if field not in numeric_field_set:
                 errors.append(f"字段 '{field}' 在数据集中不存在")
         
         # 验证所有字段的级别参数数量一致
         level_counts = {}
         for field, params in level_params.items():
-            if field in numeric_fields:
+            if field in numeric_field_set:
                 if not isinstance(params, list):
                     errors.append(f"字段 '{field}' 的级别参数必须为列表")
                 else:
@@ -1514,12 +1688,11 @@ def validate_membership_config(resource_id: str, config: Dict[str, Any]) -> Dict
     
     # 检查是否有配置但数据中不存在的字段
     configured_fields = set(level_params.keys())
-    available_fields = set(numeric_fields)
-    missing_config = available_fields - configured_fields
+    missing_config = numeric_field_set - configured_fields
     if missing_config:
         warnings.append(f"以下数值字段未配置级别参数: {list(missing_config)}")
     
-    return {
+    return df, numeric_fields, {
         "is_valid": len(errors) == 0,
         "errors": errors,
         "warnings": warnings,
@@ -1531,9 +1704,31 @@ def validate_membership_config(resource_id: str, config: Dict[str, Any]) -> Dict
         }
     }
 
+### 与内置round结果一致的向量化舍入
+def _round_like_builtin(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    向量化舍入，逐元素结果与Python内置round(value, ndigits)一致
+    
+    np.round先放大再舍入，放大后恰好落在.5上的值（如0.51735放大为5173.5）会按"银行家舍入"处理，
+    而内置round按浮点数的精确值舍入；仅对这些边界值回退到内置round
+    
+    Args:
+        values: 待舍入的浮点数组
+        ndigits: 保留的小数位数
+        
+    Returns:
+        舍入后的新数组
+    """
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    ties = (scaled - np.floor(scaled)) == 0.5
+    if ties.any():
+        rounded[ties] = [round(value, ndigits) for value in values[ties].tolist()]
+    return rounded
+
 ### 执行隶属度计算
 @mcp.tool()
-def calculate_membership_with_config(resource_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
+def calculate_membership_with_config(resource_id: str, config: Dict[str, Any], include_report: bool = True) -> Dict[str, Any]:
     """
     使用下界型函数配置信息执行隶属度计算 - 多级别模糊综合评价工具
     
@@ -1544,6 +1739,8 @@ def calculate_membership_with_config(resource_id: str, config: Dict[str, Any]) -
         resource_id: 原始数据资源标识符（可以是纯ID或完整URI）
                      例如：'raw_data_001' 或 'data://raw_data_001'
         config: 用户提供的下界型函数配置信息，包含各评价因子的级别参数
+        include_report: 是否生成各业务对象的格式化隶属度矩阵及报告（默认True）；仅需结果资源ID
+                        用于后续TOPSIS/VIKOR评估时可设为False，此时formatted_report为None
 
     重要：必须严格按照以下模版输出结果，不得有模版以外的任何其它信息！！            
     Returns:
@@ -1579,19 +1776,10 @@ def calculate_membership_with_config(resource_id: str, config: Dict[str, Any]) -
         ’‘’
     """
     # 处理URI格式的资源ID
-    if resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     # 检查是否存在极性调整后的数据资源
-    polarity_adjusted_resource_id = None
-    for cached_uri in DATA_CACHE.keys():
-        if cached_uri.startswith("data://") and "polarity_adjusted" in cached_uri:
-            # 检查是否是当前资源的极性调整版本
-            adjusted_parsed = parse_resource_id(cached_uri[7:])  # 移除 "data://" 前缀
-            if (adjusted_parsed["type"] == "raw_data" and 
-                adjusted_parsed.get("parent_hash") == resource_id):
-                polarity_adjusted_resource_id = cached_uri[7:]  # 移除 "data://" 前缀
-                break
+    polarity_adjusted_resource_id = _find_polarity_adjusted(resource_id)
     
     # 优先使用极性调整后的数据资源
     if polarity_adjusted_resource_id:
@@ -1601,75 +1789,78 @@ def calculate_membership_with_config(resource_id: str, config: Dict[str, Any]) -
     else:
         used_resource_id = resource_id
     
-    # 自动验证配置
-    validation_result = validate_membership_config(used_resource_id, config)
+    # 自动验证配置（直接复用验证时解析得到的数据）
+    df, _, validation_result = _resolve_and_validate(used_resource_id, config)
     if not validation_result["is_valid"]:
         raise ValueError(f"配置验证失败: {validation_result['errors']}")
     
-    uri = get_resource_uri(used_resource_id)
-    df = DATA_CACHE[uri]
-    
     # 获取配置信息
     level_params = config["级别参数"]
     
-    # 计算隶属度矩阵
-    membership_results = []
+    # 计算隶属度矩阵（按需导入隶属度函数模块）
+    from modules.algorithm_layer.membership_functions import LowerBoundMembershipFunctions
     
-    for _, row in df.iterrows():
-        membership_row = {}
-        for field, params in level_params.items():
-            if field in df.columns:
-                value = row[field]
-                total_levels = len(params)
-                
-                # 计算每个级别的隶属度
-                level_memberships = {}
-                # 提取参数值列表（a值）
-                # 处理两种格式的参数：数值列表或包含"a"键的字典列表
-                if isinstance(params[0], dict) and "a" in params[0]:
-                    param_values = [p["a"] for p in params]
-                else:
-                    param_values = params  # 直接使用数值列表
-                
-                for level in range(1, total_levels + 1):
-                    membership = LowerBoundMembershipFunctions.lower_bound_level_membership(
-                        value, param_values, level, total_levels
-                    )
-                    level_memberships[f"级别{level}"] = round(float(membership), 4)
-                
-                membership_row[field] = level_memberships
+    # 按字段整列向量化计算隶属度矩阵（N行 × 级别数），避免逐行逐级别调用标量函数
+    # （配置已通过验证，所有配置字段均为数据集中的数值字段）
+    def _field_membership(field, params):
+        # 提取参数值列表（a值）
+        # 处理两种格式的参数：数值列表或包含"a"键的字典列表
+        if isinstance(params[0], dict) and "a" in params[0]:
+            param_values = [p["a"] for p in params]
+        else:
+            param_values = params  # 直接使用数值列表
         
-        membership_results.append(membership_row)
+        return _round_like_builtin(
+            LowerBoundMembershipFunctions.lower_bound_membership_matrix(
+                df[field].to_numpy(dtype=np.float64), param_values
+            ),
+            4
+        )
+    
+    # 各字段计算相互独立，数据量较大且有多个CPU核心时按字段并行计算
+    cpu_count = os.cpu_count() or 1
+    if cpu_count > 1 and len(level_params) > 1 and len(df) * len(level_params) >= PARALLEL_MEMBERSHIP_MIN_CELLS:
+        with ThreadPoolExecutor(max_workers=min(cpu_count, len(level_params))) as executor:
+            field_memberships = dict(zip(level_params, executor.map(_field_membership, level_params.keys(), level_params.values())))
+    else:
+        field_memberships = {field: _field_membership(field, params) for field, params in level_params.items()}
+    
+    # 业务对象标识：优先使用第一列的值（截取前20个字符），缺失时仅使用序号
+    # 第一列整列转换为字符串并截取，避免逐行构造Series
+    if len(df.columns) > 0:
+        first_col = df.iloc[:, 0]
+        obj_names = [
+            f"业务对象{idx}({label})" if has_value else f"业务对象{idx}"
+            for idx, label, has_value in zip(
+                range(1, len(df) + 1),
+                first_col.astype(str).str.slice(0, 20).tolist(),
+                first_col.notna().tolist()
+            )
+        ]
+    else:
+        obj_names = [f"业务对象{idx+1}" for idx in range(len(df))]
     
     # 创建扁平化的隶属度矩阵DataFrame（符合TOPSIS要求格式）
-    flattened_results = []
-    
-    for idx, (_, row) in enumerate(df.iterrows()):
-        # 获取业务对象标识
-        obj_name = f"业务对象{idx+1}"
-        if len(df.columns) > 0:
-            # 尝试使用第一列的值作为对象名
-            first_col_value = row.iloc[0]
-            if pd.notna(first_col_value):
-                obj_name = f"业务对象{idx+1}({str(first_col_value)[:20]})"
-        
-        # 为每个字段和级别创建扁平化记录
-        for field, params in level_params.items():
-            if field in df.columns and field in membership_results[idx]:
-                total_levels = len(params)
-                for level in range(1, total_levels + 1):
-                    level_name = f"级别{level}"
-                    membership_value = membership_results[idx][field].get(level_name, 0.0)
-                    
-                    flattened_results.append({
-                        '业务对象': obj_name,
-                        '评价因子': field,
-                        '评估级别': level_name,
-                        '隶属度': membership_value
-                    })
+    # 每个业务对象对应一个"字段×级别"块，按块整体平铺为四个并列数组后一次性构建
+    block_fields = []
+    block_levels = []
+    for field, matrix in field_memberships.items():
+        n_levels = matrix.shape[1]
+        block_fields.extend([field] * n_levels)
+        block_levels.extend(f"级别{level}" for level in range(1, n_levels + 1))
+    
+    if field_memberships:
+        membership_values = np.hstack(list(field_memberships.values())).ravel()
+    else:
+        membership_values = np.empty(0, dtype=np.float64)
     
     # 创建符合TOPSIS要求的隶属度矩阵
-    membership_df = pd.DataFrame(flattened_results)
+    membership_df = pd.DataFrame({
+        '业务对象': np.repeat(np.array(obj_names, dtype=object), len(block_fields)),
+        '评价因子': np.tile(np.array(block_fields, dtype=object), len(df)),
+        '评估级别': np.tile(np.array(block_levels, dtype=object), len(df)),
+        '隶属度': membership_values
+    })
     
     # 生成计算结果资源ID
     result_resource_id = generate_resource_id(
@@ -1677,65 +1868,47 @@ def calculate_membership_with_config(resource_id: str, config: Dict[str, Any]) -
         parent_resource_id=resource_id,
         step_name="membership_calculation"
     )
-    result_uri = get_resource_uri(result_resource_id)
-    
-    # 缓存计算结果到内存
-    DATA_CACHE[result_uri] = membership_df
-    
-    # 更新资源索引
-    RESOURCE_INDEX[result_resource_id] = {
-        'uri': result_uri,
-        'type': 'membership_calc',
-        'rows': len(membership_df),
-        'columns': len(membership_df.columns),
-        'column_names': list(membership_df.columns),
-        'parent_resource_id': resource_id
-    }
+    
+    # 缓存计算结果到内存并更新资源索引
+    result_uri = _register_resource(
+        result_resource_id,
+        membership_df,
+        type='membership_calc',
+        parent_resource_id=resource_id
+    )
     
     # 生成每个业务对象的隶属度矩阵格式化输出
+    # 表头级别取第一个配置字段的级别；级别数不足的字段以0.0000补齐，超出表头的级别不展示
+    n_header_levels = next(iter(field_memberships.values())).shape[1] if field_memberships else 0
+    all_levels = [f"级别{level}" for level in range(1, n_header_levels + 1)]
+    
+    # 格式化矩阵的字符串构建与业务对象数量成正比，仅在需要报告时生成
     membership_matrices_formatted = []
-    for idx, (_, row) in enumerate(df.iterrows()):
-        # 获取业务对象标识（使用索引或第一列作为标识）
-        obj_name = f"业务对象{idx+1}"
-        if len(df.columns) > 0:
-            # 尝试使用第一列的值作为对象名
-            first_col_value = row.iloc[0]
-            if pd.notna(first_col_value):
-                obj_name += f"({str(first_col_value)[:20]})"  # 截取前20个字符
-        
-        # 构建矩阵表格
-        matrix_lines = [f"### 📌 {obj_name}"]
-        matrix_lines.append("")
-        
-        # 获取所有级别
-        all_levels = []
-        for field in level_params.keys():
-            if field in df.columns and field in membership_results[idx]:
-                levels = list(membership_results[idx][field].keys())
-                if levels:
-                    all_levels = levels
-                    break
+    if include_report:
+        # 预先把每个字段的隶属度整体格式化为表格行（每个业务对象一行）
+        field_table_rows = []
+        for field, matrix in field_memberships.items():
+            shown = matrix[:, :n_header_levels]
+            n_shown = shown.shape[1]
+            padding = " | 0.0000" * (n_header_levels - n_shown)
+            cells = ["%.4f" % value for value in shown.ravel().tolist()]
+            field_table_rows.append([
+                f"| {field} | " + " | ".join(cells[start:start + n_shown]) + padding + " |"
+                for start in range(0, len(cells), n_shown)
+            ])
         
-        # 构建表头
         if all_levels:
-            header = "| 评价因子 | " + " | ".join(all_levels) + " |"
-            separator = "|---------" + "|-------" * len(all_levels) + "|"
-            matrix_lines.append(header)
-            matrix_lines.append(separator)
-            
-            # 添加每行数据
-            for field in level_params.keys():
-                if field in df.columns and field in membership_results[idx]:
-                    row_data = [field]
-                    for level in all_levels:
-                        if level in membership_results[idx][field]:
-                            row_data.append(f"{membership_results[idx][field][level]:.4f}")
-                        else:
-                            row_data.append("0.0000")
-                    matrix_lines.append("| " + " | ".join(row_data) + " |")
-        
-        matrix_lines.append("")  # 添加空行分隔
-        membership_matrices_formatted.append("\n".join(matrix_lines))
+            table_head = [
+                "| 评价因子 | " + " | ".join(all_levels) + " |",
+                "|---------" + "|-------" * len(all_levels) + "|"
+            ]
+        else:
+            table_head = []
+        
+        membership_matrices_formatted = [
+            "\n".join([f"### 📌 {obj_name}", "", *table_head, *(rows[idx] for rows in field_table_rows), ""])
+            for idx, obj_name in enumerate(obj_names)
+        ]
     
     # 计算摘要
     calculation_summary = {
@@ -1766,7 +1939,7 @@ def calculate_membership_with_config(resource_id: str, config: Dict[str, Any]) -
     
     # 生成格式化报告并添加到结果中
     result = {
-        "membership_matrix": membership_df.to_dict("records"),
+        "membership_matrix": membership_df.to_dict(orient='list'),  # 按列组织，避免逐行构造字典
         "formatted_membership_matrices": membership_matrices_formatted,  # 格式化矩阵输出
         "calculation_summary": calculation_summary,
         "original_resource_uri": get_resource_uri(resource_id),  # 原始资源完整URI
@@ -1789,6 +1962,10 @@ def calculate_membership_with_config(resource_id: str, config: Dict[str, Any]) -
     }
     
     # 生成格式化报告
+    if not include_report:
+        result["formatted_report"] = None
+        return result
+    
     result["formatted_report"] = f"""
     ## 📊 隶属度计算概述
     - **计算方法**：下界型隶属度函数
@@ -1817,27 +1994,12 @@ def find_latest_membership_resource() -> str:
     Returns:
         最新的mc资源ID，如果没有找到则返回None
     """
-    mc_resources = []
-    
-    # 在DATA_CACHE中查找mc开头的资源
-    for uri, df in DATA_CACHE.items():
-        if uri.startswith("data://mc_"):
-            resource_id = uri[7:]  # 移除 "data://" 前缀
-            # 验证数据格式是否为隶属度矩阵
-            if _is_membership_matrix(df):
-                mc_resources.append({
-                    'resource_id': resource_id,
-                    'uri': uri,
-                    'rows': len(df),
-                    'columns': len(df.columns)
-                })
-    
-    if not mc_resources:
+    # MEMBERSHIP_RESOURCE_URIS按写入顺序记录了已通过格式校验的mc资源，最后写入的即为最新资源
+    latest_uri = next(reversed(MEMBERSHIP_RESOURCE_URIS), None)
+    if latest_uri is None:
         return None
     
-    # 返回最新的mc资源（根据资源ID中的时间戳或uuid排序）
-    # 简单处理：返回第一个找到的mc资源
-    return mc_resources[0]['resource_id']
+    return latest_uri.removeprefix(URI_PREFIX)
 
 
 # =========================================================================================
@@ -1845,7 +2007,7 @@ def find_latest_membership_resource() -> str:
 # =========================================================================================
 ### 执行TOPSIS综合评估
 @mcp.tool()
-def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: List[float] = None, cache_result: bool = True) -> Dict[str, Any]:
+def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: List[float] = None, cache_result: bool = True, include_report: bool = True) -> Dict[str, Any]:
     """
     使用TOPSIS方法进行综合评估计算 - 多准则决策分析工具
     该函数实现TOPSIS（Technique for Order Preference by Similarity to Ideal Solution）算法，
@@ -1858,6 +2020,8 @@ def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: Li
                 例如：[0.32, 0.24, 0.24, 0.20] 表示4个因子的权重分配
                 默认为None，使用等权重（每个因子权重相同）
         cache_result: 是否缓存计算结果（默认True），设置为False可跳过结果缓存
+        include_report: 是否生成相对接近度表格、可查询表格清单及格式化报告（默认True）；仅需数值结果时
+                        可设为False，此时topsis_table、available_tables、formatted_report均为None
         
     重要：必须严格按照以下模版输出结果，不得有模版以外的任何其它信息！！            
     Returns:
@@ -1895,35 +2059,34 @@ def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: Li
         print(f"🤖 自动发现隶属度资源: {resource_id}")
     
     # 处理URI格式的资源ID
-    if resource_id and resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     uri = get_resource_uri(resource_id)
     
-    if uri not in DATA_CACHE:
-        raise ValueError(f"资源不存在: {uri}")
-    
     # 获取隶属度矩阵数据
-    membership_df = DATA_CACHE[uri]
-    
-    # 检查数据格式
-    if not _is_membership_matrix(membership_df):
-        raise ValueError("数据格式错误：需要隶属度矩阵格式的数据")
+    membership_df = DATA_CACHE.get(uri, _MISSING)
+    if membership_df is _MISSING:
+        raise ValueError(f"资源不存在: {uri}")
     
-    # 转换隶属度矩阵为规范化特征值矩阵格式
-    normalized_matrices = _convert_membership_to_normalized_matrix(membership_df)
+    # 检查数据格式并转换为规范化特征值矩阵格式（同一资源重复评估时复用备忘结果）
+    normalized_matrices = _get_normalized_matrices(uri, membership_df)
     
-    # 创建TOPSIS评估器
+    # 创建TOPSIS评估器（按需导入）
+    from modules.algorithm_layer.topsis_comprehensive_evaluation import TOPSISComprehensiveEvaluation
     topsis_evaluator = TOPSISComprehensiveEvaluation()
     
-    # 计算TOPSIS综合隶属度
-    comprehensive_membership = topsis_evaluator.calculate_comprehensive_membership(normalized_matrices, weights)
-    
-    # 计算相对接近度（V值）
-    comprehensive_scores = topsis_evaluator.get_comprehensive_scores(comprehensive_membership)
+    # 计算TOPSIS距离矩阵，D+、D-、V值、u值全程保持(对象, 级别)数组形式，仅在输出时拆分为按对象的字典
+    # 相对接近度（V值）与最终综合隶属度（u值）在同一次调用中由距离矩阵直接算出
+    obj_names, distance_positive, distance_negative, closeness_matrix, membership_matrix = (
+        topsis_evaluator.calculate_evaluation_matrices(normalized_matrices, weights)
+    )
     
-    # 计算最终综合隶属度（u值）
-    membership_scores = topsis_evaluator.calculate_comprehensive_membership_scores(comprehensive_scores)
+    comprehensive_membership = {
+        obj_name: {"D+": d_positive, "D-": d_negative}
+        for obj_name, d_positive, d_negative in zip(obj_names, distance_positive.tolist(), distance_negative.tolist())
+    }
+    comprehensive_scores = dict(zip(obj_names, closeness_matrix.tolist()))
+    membership_scores = dict(zip(obj_names, membership_matrix.tolist()))
     
     # 生成结果摘要
     summary = {
@@ -1935,7 +2098,7 @@ def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: Li
     }
     
     # 添加前3个对象的示例结果
-    sample_objects = list(comprehensive_membership.keys())[:3]
+    sample_objects = list(islice(comprehensive_membership, 3))
     for obj_name in sample_objects:
         summary["sample_results"][obj_name] = {
             "D+_distances": comprehensive_membership[obj_name]["D+"][:2],  # 前2个级别
@@ -1944,11 +2107,10 @@ def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: Li
             "membership_scores": membership_scores[obj_name][:2]          # 前2个级别
         }
     
-    # 生成特定格式的TOPSIS相对接近度矩阵表格
-    topsis_table = _generate_topsis_formatted_table(comprehensive_scores, weights)
-    
-    # 生成可查询表格清单
-    available_tables = _generate_topsis_available_tables(comprehensive_membership, comprehensive_scores, membership_scores)
+    # 生成特定格式的TOPSIS相对接近度矩阵表格及可查询表格清单（仅在需要报告时构建）
+    topsis_table = _generate_topsis_formatted_table(comprehensive_scores, weights) if include_report else None
+    available_tables = (_generate_topsis_available_tables(comprehensive_membership, comprehensive_scores, membership_scores)
+                        if include_report else None)
     
     # 生成下一步建议
     next_actions = _generate_topsis_next_actions(len(comprehensive_membership))
@@ -1974,47 +2136,42 @@ def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: Li
         )
         result_uri = get_resource_uri(result_resource_id)
         
-        # 将结果转换为DataFrame格式缓存
-        result_data = []
-        for obj_name, scores in membership_scores.items():
-            for level_idx, score in enumerate(scores):
-                result_data.append({
-                    '业务对象': obj_name,
-                    '评估级别': f'e{level_idx + 1}',
-                    '综合隶属度': score,
-                    '相对接近度': comprehensive_scores[obj_name][level_idx],
-                    '与最优解距离': comprehensive_membership[obj_name]["D+"][level_idx],
-                    '与最劣解距离': comprehensive_membership[obj_name]["D-"][level_idx]
-                })
-        
-        result_df = pd.DataFrame(result_data)
-        DATA_CACHE[result_uri] = result_df
-        
-        # 注册资源到索引中（解决预览问题）
-        RESOURCE_INDEX[result_resource_id] = {
-            "uri": result_uri,
-            "data_shape": f"{len(result_df)}行×{len(result_df.columns)}列",
-            "resource_type": "topsis_evaluation",
-            "description": "TOPSIS综合得分矩阵（相对接近度V值）"
-        }
+        # 将结果按列拼接为DataFrame格式缓存（直接展开(对象, 级别)数组，按业务对象、评估级别排列）
+        n_levels = membership_matrix.shape[1]
+        result_df = pd.DataFrame({
+            '业务对象': np.repeat(np.array(obj_names, dtype=object), n_levels),
+            '评估级别': np.tile(np.array([f'e{level_idx + 1}' for level_idx in range(n_levels)], dtype=object), len(obj_names)),
+            '综合隶属度': membership_matrix.ravel(),
+            '相对接近度': closeness_matrix.ravel(),
+            '与最优解距离': distance_positive.ravel(),
+            '与最劣解距离': distance_negative.ravel()
+        })
+        
+        # 缓存结果并注册资源到索引中（解决预览问题）
+        _register_resource(
+            result_resource_id,
+            result_df,
+            data_shape=f"{len(result_df)}行×{len(result_df.columns)}列",
+            resource_type="topsis_evaluation",
+            description="TOPSIS综合得分矩阵（相对接近度V值）"
+        )
         result["result_resource_id"] = result_resource_id
         
         print(f"TOPSIS综合得分矩阵已缓存: {result_uri}")
     
-    # 生成格式化报告并添加到结果中 - 直接使用模板字符串避免LLM加工
-    summary = result.get("summary", {})
-    total_objects = summary.get("total_objects", 0)
-    total_factors = summary.get("total_factors", 0)
-    weight_distribution = summary.get("weight_distribution", [])
+    if not include_report:
+        result["formatted_report"] = None
+        return result
     
+    # 生成格式化报告并添加到结果中 - 直接使用模板字符串避免LLM加工（直接复用上方构建的summary）
     result["formatted_report"] = f"""
     ## 📊 评估概述
     - **评估方法**：TOPSIS（逼近理想解排序法）
-    - **评估对象数量**：{total_objects} 个
-    - **评价因子数量**：{total_factors} 个
-    - **权重分配**：{weight_distribution}
+    - **评估对象数量**：{summary["total_objects"]} 个
+    - **评价因子数量**：{summary["total_factors"]} 个
+    - **权重分配**：{summary["weight_distribution"]}
     - **原始资源ID**：`{resource_id}`
-    - **TOPSIS计算结果资源ID**：`{result_resource_id}`
+    - **TOPSIS计算结果资源ID**：{_format_result_resource_id(result)}
 
     ## 📈 相对接近度矩阵（V值）
     {topsis_table}
@@ -2027,6 +2184,35 @@ def perform_topsis_comprehensive_evaluation(resource_id: str = None, weights: Li
     
     return result
 
+### 格式化报告中的结果资源ID
+def _format_result_resource_id(result: Dict[str, Any]) -> str:
+    """
+    格式化报告中的结果资源ID（cache_result=False时结果未缓存，不存在结果资源ID）
+    
+    Args:
+        result: 评估结果字典
+        
+    Returns:
+        带反引号的结果资源ID，未缓存时返回提示文字
+    """
+    result_resource_id = result.get("result_resource_id")
+    return f"`{result_resource_id}`" if result_resource_id else "未缓存（cache_result=False）"
+
+### 格式化表格标题中的权重分配
+def _format_weights(weights: Optional[List[float]]) -> str:
+    """
+    格式化表格标题中的权重分配（各TOPSIS表格共用）
+    
+    Args:
+        weights: 权重列表，为空时表示等权重
+        
+    Returns:
+        权重字符串，例如"[0.32, 0.24, 0.24, 0.20]"或"[等权重]"
+    """
+    if not weights:
+        return "[等权重]"
+    return "[" + ", ".join(["%.2f" % w for w in weights]) + "]"
+
 ### 生成TOPSIS相对接近度矩阵表格
 def _generate_topsis_formatted_table(comprehensive_scores: Dict[str, List[float]], weights: List[float] = None) -> str:
     """
@@ -2039,22 +2225,43 @@ def _generate_topsis_formatted_table(comprehensive_scores: Dict[str, List[float]
     Returns:
         格式化的表格字符串
     """
-    weight_str = f"[{', '.join([f'{w:.2f}' for w in weights])}]" if weights else "[等权重]"
+    weight_str = _format_weights(weights)
     
     # 构建表格头部
-    table_lines = [
-        f"**TOPSIS相对接近度矩阵（V值） (权重: {weight_str}):**",
-        "| 业务对象 | 级别1 | 级别2 | 级别3 | 级别4 |",
+    header = (
+        f"**TOPSIS相对接近度矩阵（V值） (权重: {weight_str}):**\n"
+        "| 业务对象 | 级别1 | 级别2 | 级别3 | 级别4 |\n"
         "|---------|-------|-------|-------|-------|"
-    ]
-    
-    # 添加数据行
-    for obj_name, scores in comprehensive_scores.items():
-        # 格式化相对接近度值（保留3位小数）
-        score_str = " | ".join([f"{score:.3f}" for score in scores])
-        table_lines.append(f"| {obj_name:<8} | {score_str} |")
+    )
     
-    return "\n".join(table_lines)
+    # 数据行由生成器直接交给join，相对接近度值保留3位小数
+    rows = ("| %-8s | %s |" % (obj_name, " | ".join(["%.3f" % score for score in scores]))
+            for obj_name, scores in comprehensive_scores.items())
+    
+    return "\n".join([header, *rows])
+
+### 可查询表格清单（固定内容，导入时拼接一次）
+TOPSIS_AVAILABLE_TABLES_MD = "\n".join([
+    "**📊 可查询的表格清单：**",
+    "",
+    "您可以通过回复以下名称来查看对应的详细数据表格：",
+    "",
+    "1. **相对接近度矩阵** - 核心评价指标，值越大表示方案越优",
+    "2. **综合隶属度矩阵** - 基于相对接近度计算的标准化结果",
+    "3. **距离矩阵** - 包含与最优解和最劣解的欧氏距离",
+    "4. **完整结果表** - 包含所有指标的完整数据表格",
+    "",
+    "**查询示例：**",
+    "- 回复 \"相对接近度矩阵\" 查看详细V值数据",
+    "- 回复 \"距离矩阵\" 查看D+和D-距离数据",
+    "- 回复 \"完整结果表\" 查看包含所有指标的综合表格",
+    "",
+    "**表格说明：**",
+    "- **相对接近度（V值）**：0-1之间，越大表示越接近最优解",
+    "- **综合隶属度（u值）**：基于V值计算的标准化结果",
+    "- **D+距离**：与理想最优解的距离，越小越好",
+    "- **D-距离**：与理想最劣解的距离，越大越好"
+])
 
 ### 生成可查询表格清单
 def _generate_topsis_available_tables(comprehensive_membership: Dict[str, Any], 
@@ -2071,29 +2278,7 @@ def _generate_topsis_available_tables(comprehensive_membership: Dict[str, Any],
     Returns:
         可查询表格清单字符串
     """
-    table_list = [
-        "**📊 可查询的表格清单：**",
-        "",
-        "您可以通过回复以下名称来查看对应的详细数据表格：",
-        "",
-        "1. **相对接近度矩阵** - 核心评价指标，值越大表示方案越优",
-        "2. **综合隶属度矩阵** - 基于相对接近度计算的标准化结果",
-        "3. **距离矩阵** - 包含与最优解和最劣解的欧氏距离",
-        "4. **完整结果表** - 包含所有指标的完整数据表格",
-        "",
-        "**查询示例：**",
-        "- 回复 \"相对接近度矩阵\" 查看详细V值数据",
-        "- 回复 \"距离矩阵\" 查看D+和D-距离数据",
-        "- 回复 \"完整结果表\" 查看包含所有指标的综合表格",
-        "",
-        "**表格说明：**",
-        "- **相对接近度（V值）**：0-1之间，越大表示越接近最优解",
-        "- **综合隶属度（u值）**：基于V值计算的标准化结果",
-        "- **D+距离**：与理想最优解的距离，越小越好",
-        "- **D-距离**：与理想最劣解的距离，越大越好"
-    ]
-    
-    return "\n".join(table_list)
+    return TOPSIS_AVAILABLE_TABLES_MD
 
 ### 生成相对接近度矩阵（V值）详细表格
 def _generate_relative_closeness_table(comprehensive_scores: Dict[str, List[float]], weights: List[float] = None) -> str:
@@ -2107,7 +2292,7 @@ def _generate_relative_closeness_table(comprehensive_scores: Dict[str, List[floa
     Returns:
         详细的相对接近度表格字符串
     """
-    weight_str = f"[{', '.join([f'{w:.2f}' for w in weights])}]" if weights else "[等权重]"
+    weight_str = _format_weights(weights)
     
     table_lines = [
         f"**📊 相对接近度矩阵（V值）详细数据 (权重: {weight_str}):**",
@@ -2153,7 +2338,7 @@ def _generate_membership_matrix_table(membership_scores: Dict[str, List[float]],
     Returns:
         详细的综合隶属度表格字符串
     """
-    weight_str = f"[{', '.join([f'{w:.2f}' for w in weights])}]" if weights else "[等权重]"
+    weight_str = _format_weights(weights)
     
     table_lines = [
         f"**📊 综合隶属度矩阵（u值）详细数据 (权重: {weight_str}):**",
@@ -2162,13 +2347,19 @@ def _generate_membership_matrix_table(membership_scores: Dict[str, List[float]],
         "|---------|-------|-------|-------|-------|----------|------------|"
     ]
     
-    for obj_name, scores in membership_scores.items():
+    # 所有业务对象的隶属度堆叠为(对象, 级别)矩阵，一次计算隶属度和与分布百分比
+    # （隶属度和为0时分布显示为0.0%）
+    n_levels = len(next(iter(membership_scores.values()), []))
+    score_matrix = np.array(list(membership_scores.values()), dtype=np.float64).reshape(len(membership_scores), n_levels)
+    total_scores = score_matrix.sum(axis=1)
+    percentages = np.divide(score_matrix, total_scores[:, None], out=np.zeros_like(score_matrix),
+                            where=total_scores[:, None] != 0) * 100
+    
+    for obj_name, scores, total_score, shares in zip(membership_scores, score_matrix.tolist(),
+                                                     total_scores.tolist(), percentages.tolist()):
         # 格式化综合隶属度值（保留4位小数）
-        score_str = " | ".join([f"{score:.4f}" for score in scores])
-        
-        # 计算隶属度和和分布
-        total_score = sum(scores)
-        distribution = "/".join([f"{score/total_score*100:.1f}%" for score in scores])
+        score_str = " | ".join(["%.4f" % score for score in scores])
+        distribution = "/".join(["%.1f%%" % share for share in shares])
         
         table_lines.append(f"| {obj_name:<8} | {score_str} | {total_score:.4f} | {distribution} |")
     
@@ -2199,7 +2390,7 @@ def _generate_distance_matrix_table(comprehensive_membership: Dict[str, Any], we
     Returns:
         详细的距离矩阵表格字符串
     """
-    weight_str = f"[{', '.join([f'{w:.2f}' for w in weights])}]" if weights else "[等权重]"
+    weight_str = _format_weights(weights)
     
     table_lines = [
         f"**📊 距离矩阵详细数据 (权重: {weight_str}):**",
@@ -2208,15 +2399,11 @@ def _generate_distance_matrix_table(comprehensive_membership: Dict[str, Any], we
         "|---------|----------------|----------------|----------------|----------------|----------------|----------------|----------------|----------------|"
     ]
     
-    for obj_name, distances in comprehensive_membership.items():
-        d_plus = distances["D+"]
-        d_minus = distances["D-"]
-        
-        # 格式化距离值（保留4位小数）
-        d_plus_str = " | ".join([f"{d:.4f}" for d in d_plus])
-        d_minus_str = " | ".join([f"{d:.4f}" for d in d_minus])
-        
-        table_lines.append(f"| {obj_name:<8} | {d_plus_str} | {d_minus_str} |")
+    # 格式化距离值（保留4位小数），D+与D-拼接后一次join
+    table_lines.extend(
+        "| %-8s | %s |" % (obj_name, " | ".join(["%.4f" % d for d in (*distances["D+"], *distances["D-"])]))
+        for obj_name, distances in comprehensive_membership.items()
+    )
     
     table_lines.extend([
         "",
@@ -2249,7 +2436,7 @@ def _generate_complete_result_table(comprehensive_membership: Dict[str, Any],
     Returns:
         完整的综合结果表格字符串
     """
-    weight_str = f"[{', '.join([f'{w:.2f}' for w in weights])}]" if weights else "[等权重]"
+    weight_str = _format_weights(weights)
     
     table_lines = [
         f"**📊 完整TOPSIS结果表格 (权重: {weight_str}):**",
@@ -2258,17 +2445,24 @@ def _generate_complete_result_table(comprehensive_membership: Dict[str, Any],
         "|---------|----------|------------|------------|--------|--------|----------|"
     ]
     
+    # 预先计算每个级别在所有业务对象中的排名（排名 = 相对接近度严格更大的对象数 + 1，并列取相同名次）
+    score_obj_names = list(comprehensive_scores)
+    score_matrix = np.array([comprehensive_scores[obj] for obj in score_obj_names], dtype=np.float64)
+    ascending_scores = np.sort(score_matrix, axis=0)
+    rank_matrix = np.empty(score_matrix.shape, dtype=np.int64)
+    for level_idx in range(score_matrix.shape[1]):
+        rank_matrix[:, level_idx] = len(score_obj_names) + 1 - np.searchsorted(
+            ascending_scores[:, level_idx], score_matrix[:, level_idx], side='right'
+        )
+    obj_ranks = dict(zip(score_obj_names, rank_matrix.tolist()))
+    
     for obj_name in comprehensive_membership.keys():
         for level_idx in range(len(comprehensive_scores[obj_name])):
             v_value = comprehensive_scores[obj_name][level_idx]
             u_value = membership_scores[obj_name][level_idx]
             d_plus = comprehensive_membership[obj_name]["D+"][level_idx]
             d_minus = comprehensive_membership[obj_name]["D-"][level_idx]
-            
-            # 计算该级别在所有业务对象中的排名
-            level_scores = [comprehensive_scores[obj][level_idx] for obj in comprehensive_scores.keys()]
-            sorted_scores = sorted(level_scores, reverse=True)
-            rank = sorted_scores.index(v_value) + 1
+            rank = obj_ranks[obj_name][level_idx]
             
             table_lines.append(f"| {obj_name:<8} | e{level_idx+1} | {v_value:.4f} | {u_value:.4f} | {d_plus:.4f} | {d_minus:.4f} | {rank} |")
     
@@ -2290,6 +2484,7 @@ def _generate_complete_result_table(comprehensive_membership: Dict[str, Any],
     return "\n".join(table_lines)
 
 ### 生成TOPSIS计算后的下一步建议
+@functools.lru_cache(maxsize=256)
 def _generate_topsis_next_actions(num_objects: int) -> str:
     """
     生成TOPSIS计算后的下一步建议
@@ -2326,7 +2521,7 @@ def _generate_topsis_original_data_preview(df: pd.DataFrame, resource_id: str) -
         原始数据格式预览字符串
     """
     # 检查是否为TOPSIS结果
-    if not (resource_id.startswith("mcr_") and "topsiseval" in resource_id):
+    if not _is_topsis_resource_id(resource_id):
         return ""
     
     # 检查数据框是否包含必要的列
@@ -2335,20 +2530,22 @@ def _generate_topsis_original_data_preview(df: pd.DataFrame, resource_id: str) -
         return ""
     
     # 获取前8行数据作为预览
-    preview_df = df.head(8).copy()
+    preview_df = df.head(8)
     
-    # 格式化数值（保留3位小数）
+    # 格式化数值（保留3位小数，缺失值显示为空），四个数值列整体转为矩阵后一次格式化
     numeric_columns = ['相对接近度', '综合隶属度', '与最优解距离', '与最劣解距离']
-    for col in numeric_columns:
-        if col in preview_df.columns:
-            preview_df[col] = preview_df[col].apply(lambda x: f"{x:.3f}" if pd.notnull(x) else "")
+    formatted_rows = [
+        ["%.3f" % value if value == value else "" for value in row]
+        for row in preview_df[numeric_columns].to_numpy(dtype=np.float64).tolist()
+    ]
     
     # 构建原始数据预览
     preview_lines = ["**原始数据格式:**"]
     preview_lines.append("   业务对象 评估级别  相对接近度  综合隶属度  与最优解距离  与最劣解距离")
     
-    for idx, row in preview_df.iterrows():
-        line = f"{idx:<2}  {row['业务对象']:<8} {row['评估级别']:<8} {row['相对接近度']:<10} {row['综合隶属度']:<10} {row['与最优解距离']:<12} {row['与最劣解距离']:<12}"
+    for idx, obj_name, level, (closeness, membership, d_positive, d_negative) in zip(
+            preview_df.index, preview_df['业务对象'].tolist(), preview_df['评估级别'].tolist(), formatted_rows):
+        line = f"{idx:<2}  {obj_name:<8} {level:<8} {closeness:<10} {membership:<10} {d_positive:<12} {d_negative:<12}"
         preview_lines.append(line)
     
     # 添加字段说明
@@ -2368,6 +2565,7 @@ def _generate_topsis_original_data_preview(df: pd.DataFrame, resource_id: str) -
 # 🎯 等级综合评定模块
 # =========================================================================================
 ### 生成等级综合评定后的下一步建议
+@functools.lru_cache(maxsize=256)
 def _generate_grade_assessment_next_actions(num_objects: int, num_levels: int) -> str:
     """
     生成等级综合评定后的下一步建议
@@ -2449,16 +2647,14 @@ def perform_grade_comprehensive_assessment(resource_id: str = None, num_levels:
         print(f"🤖 自动发现TOPSIS结果资源: {resource_id}")
     
     # 处理URI格式的资源ID
-    if resource_id and resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     uri = get_resource_uri(resource_id)
     
-    if uri not in DATA_CACHE:
-        raise ValueError(f"资源不存在: {uri}")
-    
     # 获取TOPSIS结果数据
-    topsis_df = DATA_CACHE[uri]
+    topsis_df = DATA_CACHE.get(uri, _MISSING)
+    if topsis_df is _MISSING:
+        raise ValueError(f"资源不存在: {uri}")
     
     # 检查数据格式是否为TOPSIS结果
     if not _is_topsis_result(topsis_df):
@@ -2467,7 +2663,8 @@ def perform_grade_comprehensive_assessment(resource_id: str = None, num_levels:
     # 从TOPSIS结果中提取综合隶属度向量
     membership_scores = _extract_membership_scores_from_topsis(topsis_df, num_levels)
     
-    # 创建等级综合评定器
+    # 创建等级综合评定器（按需导入）
+    from modules.algorithm_layer.grade_comprehensive_assessment import GradeComprehensiveAssessment
     grade_assessor = GradeComprehensiveAssessment()
     
     # 执行等级综合评定
@@ -2482,7 +2679,7 @@ def perform_grade_comprehensive_assessment(resource_id: str = None, num_levels:
     }
     
     # 添加前3个对象的示例结果
-    sample_objects = list(membership_scores.keys())[:3]
+    sample_objects = list(islice(membership_scores, 3))
     for obj_name in sample_objects:
         v_value = assessment_result["level_characteristic_values"][obj_name]
         k, alpha = assessment_result["binary_semantic_results"][obj_name]
@@ -2510,31 +2707,28 @@ def perform_grade_comprehensive_assessment(resource_id: str = None, num_levels:
         )
         result_uri = get_resource_uri(result_resource_id)
         
-        # 将结果转换为DataFrame格式缓存
-        result_data = []
-        for obj_name in membership_scores.keys():
-            v_value = assessment_result["level_characteristic_values"][obj_name]
-            k, alpha = assessment_result["binary_semantic_results"][obj_name]
-            
-            result_data.append({
-                '业务对象': obj_name,
-                '综合隶属度向量': str(membership_scores[obj_name]),
-                '级别特征值': v_value,
-                '二元语义_k': k,
-                '二元语义_alpha': alpha,
-                '最终等级': f"{k}级"
-            })
-        
-        result_df = pd.DataFrame(result_data)
-        DATA_CACHE[result_uri] = result_df
-        
-        # 注册资源到索引中
-        RESOURCE_INDEX[result_resource_id] = {
-            "uri": result_uri,
-            "data_shape": f"{len(result_df)}行×{len(result_df.columns)}列",
-            "resource_type": "grade_assessment",
-            "description": "等级综合评定结果（级别特征值和二元语义）"
-        }
+        # 将结果按列构建为DataFrame格式缓存（每列一次构建，无需逐行字典）
+        obj_names = list(membership_scores)
+        level_characteristic_values = assessment_result["level_characteristic_values"]
+        binary_semantic_results = assessment_result["binary_semantic_results"]
+        k_values = [binary_semantic_results[obj_name][0] for obj_name in obj_names]
+        result_df = pd.DataFrame({
+            '业务对象': obj_names,
+            '综合隶属度向量': [str(membership_scores[obj_name]) for obj_name in obj_names],
+            '级别特征值': [level_characteristic_values[obj_name] for obj_name in obj_names],
+            '二元语义_k': k_values,
+            '二元语义_alpha': [binary_semantic_results[obj_name][1] for obj_name in obj_names],
+            '最终等级': [f"{k}级" for k in k_values]
+        })
+        
+        # 缓存结果并注册资源到索引中
+        _register_resource(
+            result_resource_id,
+            result_df,
+            data_shape=f"{len(result_df)}行×{len(result_df.columns)}列",
+            resource_type="grade_assessment",
+            description="等级综合评定结果（级别特征值和二元语义）"
+        )
         result["result_resource_id"] = result_resource_id
         
         print(f"等级综合评定结果已缓存: {result_uri}")
@@ -2551,7 +2745,7 @@ def perform_grade_comprehensive_assessment(resource_id: str = None, num_levels:
     
     ## 📊 资源信息
     - **原始资源ID**：`{resource_id}`
-    - **等级综合评定结果资源ID**：`{result_resource_id}`
+    - **等级综合评定结果资源ID**：{_format_result_resource_id(result)}
 
     ## 🚀 下一步操作建议
     {next_actions}"""
@@ -2560,6 +2754,22 @@ def perform_grade_comprehensive_assessment(resource_id: str = None, num_levels:
     
     return result
 
+### 判断是否为TOPSIS结果资源ID
+def _is_topsis_resource_id(resource_id: str) -> bool:
+    """
+    判断资源ID是否为TOPSIS评估结果（mcr_开头且包含topsiseval步骤标识）
+    
+    Args:
+        resource_id: 资源ID（不含URI前缀）
+        
+    Returns:
+        是TOPSIS结果资源ID返回True，否则返回False
+    """
+    return resource_id.startswith("mcr_") and "topsiseval" in resource_id
+
+### TOPSIS结果格式的必要列
+TOPSIS_RESULT_COLUMNS = frozenset(['业务对象', '评估级别', '相对接近度', '综合隶属度'])
+
 ### 检查是否为TOPSIS结果格式
 def _is_topsis_result(df: pd.DataFrame) -> bool:
     """
@@ -2571,15 +2781,8 @@ def _is_topsis_result(df: pd.DataFrame) -> bool:
     Returns:
         如果是TOPSIS结果格式返回True，否则返回False
     """
-    if df.empty:
-        return False
-    
-    # 检查是否包含必要的列
-    required_columns = ['业务对象', '评估级别', '相对接近度', '综合隶属度']
-    if all(col in df.columns for col in required_columns):
-        return True
-    
-    return False
+    # 检查是否包含必要的列（集合子集判断）
+    return not df.empty and TOPSIS_RESULT_COLUMNS.issubset(df.columns)
 
 ### 从TOPSIS结果中提取综合隶属度向量
 def _extract_membership_scores_from_topsis(topsis_df: pd.DataFrame, num_levels: int) -> Dict[str, List[float]]:
@@ -2593,30 +2796,18 @@ def _extract_membership_scores_from_topsis(topsis_df: pd.DataFrame, num_levels:
     Returns:
         综合隶属度向量字典，格式为{"T1": [u1, u2, u3, u4], ...}
     """
-    membership_scores = {}
+    # 只有评估级别条数与等级数量一致的业务对象才能构成完整的隶属度向量
+    # （条数不一致时相对接近度向量长度同样不一致，无法作为后备）
+    group_sizes = topsis_df.groupby('业务对象').size()
+    complete_objects = group_sizes.index[group_sizes == num_levels]
     
-    # 按业务对象分组
-    grouped = topsis_df.groupby('业务对象')
+    # 一次排序后按(业务对象, 评估级别)重排为矩阵，替代逐组排序
+    complete_rows = topsis_df[topsis_df['业务对象'].isin(complete_objects)].sort_values(
+        ['业务对象', '评估级别'], kind='stable'
+    )
+    u_matrix = complete_rows['综合隶属度'].to_numpy().reshape(len(complete_objects), num_levels)
     
-    for obj_name, group in grouped:
-        # 按评估级别排序
-        group = group.sort_values('评估级别')
-        
-        # 提取综合隶属度值
-        u_values = group['综合隶属度'].tolist()
-        
-        # 确保向量长度与等级数量一致
-        if len(u_values) == num_levels:
-            membership_scores[obj_name] = u_values
-        else:
-            # 如果长度不匹配，使用相对接近度作为后备
-            v_values = group['相对接近度'].tolist()
-            if len(v_values) == num_levels:
-                # 归一化相对接近度向量
-                total_v = sum(v_values)
-                if total_v > 0:
-                    u_values = [v / total_v for v in v_values]
-                    membership_scores[obj_name] = u_values
+    membership_scores = dict(zip(complete_objects, u_matrix.tolist()))
     
     return membership_scores
 
@@ -2628,17 +2819,8 @@ def find_latest_topsis_resource() -> Optional[str]:
     Returns:
         最新的TOPSIS结果资源ID，如果没有找到返回None
     """
-    topsis_resources = []
-    
-    for resource_id, resource_info in RESOURCE_INDEX.items():
-        if resource_id.startswith("mcr_") and "topsiseval" in resource_id:
-            topsis_resources.append(resource_id)
-    
-    if topsis_resources:
-        # 返回最新的资源（按创建时间排序）
-        return topsis_resources[-1]
-    
-    return None
+    # TOPSIS结果均以topsis_evaluation类型登记，按登记顺序最后一个即为最新资源
+    return next(reversed(RESOURCE_IDS_BY_TYPE.get("topsis_evaluation", {})), None)
 
 
 # =========================================================================================
@@ -2646,7 +2828,7 @@ def find_latest_topsis_resource() -> Optional[str]:
 # =========================================================================================
 ### VIKOR综合评估函数
 @mcp.tool()
-def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float] = None, v: float = 0.5, cache_result: bool = True) -> Dict[str, Any]:
+def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float] = None, v: float = 0.5, cache_result: bool = True, include_report: bool = True) -> Dict[str, Any]:
     """
     使用VIKOR方法进行综合评估计算 - 多准则妥协排序分析工具
     
@@ -2665,6 +2847,8 @@ def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float
            v=1：以群体多数效用为基础（激进策略）
            v=0.5：平衡策略（默认）
         cache_result: 是否缓存计算结果（默认True），设置为False可跳过结果缓存
+        include_report: 是否生成妥协排序表格及格式化报告（默认True）；仅需数值结果时可设为False，
+                        此时formatted_report为None
         
     Returns：
         
@@ -2703,29 +2887,28 @@ def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float
         - **R值**：个体遗憾，越小表示最差属性表现越好
     """
     # 处理URI格式的资源ID
-    if resource_id.startswith("data://"):
-        resource_id = resource_id[7:]  # 移除 "data://" 前缀
+    resource_id = resource_id.removeprefix(URI_PREFIX)
     
     uri = get_resource_uri(resource_id)
     
-    if uri not in DATA_CACHE:
-        raise ValueError(f"资源不存在: {uri}")
-    
     # 获取隶属度矩阵数据
-    membership_df = DATA_CACHE[uri]
-    
-    # 检查数据格式
-    if not _is_membership_matrix(membership_df):
-        raise ValueError("数据格式错误：需要隶属度矩阵格式的数据")
+    membership_df = DATA_CACHE.get(uri, _MISSING)
+    if membership_df is _MISSING:
+        raise ValueError(f"资源不存在: {uri}")
     
-    # 转换隶属度矩阵为规范化特征值矩阵格式
-    normalized_matrices = _convert_membership_to_normalized_matrix(membership_df)
+    # 检查数据格式并转换为规范化特征值矩阵格式（同一资源重复评估时复用备忘结果）
+    normalized_matrices = _get_normalized_matrices(uri, membership_df)
     
-    # 创建VIKOR评估器
+    # 创建VIKOR评估器（按需导入）
+    from modules.algorithm_layer.vikor_comprehensive_evaluation import VIKORComprehensiveEvaluation
     vikor_evaluator = VIKORComprehensiveEvaluation()
     
-    # 计算VIKOR综合得分
-    comprehensive_scores = vikor_evaluator.calculate_comprehensive_scores(normalized_matrices, weights, v)
+    # 计算VIKOR综合得分，S、R、Q值全程保持(对象, 级别)数组形式，仅在输出时拆分为按对象的字典
+    obj_names, S_matrix, R_matrix, Q_matrix = vikor_evaluator.calculate_score_matrices(normalized_matrices, weights, v)
+    comprehensive_scores = {
+        obj_name: {"S": S_values, "R": R_values, "Q": Q_values}
+        for obj_name, S_values, R_values, Q_values in zip(obj_names, S_matrix.tolist(), R_matrix.tolist(), Q_matrix.tolist())
+    }
     
     # 生成结果摘要
     summary = {
@@ -2738,12 +2921,13 @@ def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float
     }
     
     # 添加前3个对象的示例结果
-    sample_objects = list(comprehensive_scores.keys())[:3]
-    for obj_name in sample_objects:
+    # 直接对(对象, 级别)数组切片取前3个对象、前2个级别，不再回查按对象的字典
+    for obj_name, S_values, R_values, Q_values in zip(obj_names[:3], S_matrix[:3, :2].tolist(),
+                                                       R_matrix[:3, :2].tolist(), Q_matrix[:3, :2].tolist()):
         summary["sample_results"][obj_name] = {
-            "S_values": comprehensive_scores[obj_name]["S"][:2],  # 前2个级别
-            "R_values": comprehensive_scores[obj_name]["R"][:2],  # 前2个级别
-            "Q_values": comprehensive_scores[obj_name]["Q"][:2]   # 前2个级别
+            "S_values": S_values,  # 前2个级别
+            "R_values": R_values,  # 前2个级别
+            "Q_values": Q_values   # 前2个级别
         }
     
     result = {
@@ -2762,44 +2946,40 @@ def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float
         )
         result_uri = get_resource_uri(result_resource_id)
         
-        # 将结果转换为DataFrame格式缓存
-        result_data = []
-        for obj_name, scores in comprehensive_scores.items():
-            for level_idx in range(len(scores["S"])):
-                result_data.append({
-                    '业务对象': obj_name,
-                    '评估级别': f'e{level_idx + 1}',
-                    'S值': scores["S"][level_idx],
-                    'R值': scores["R"][level_idx],
-                    'Q值': scores["Q"][level_idx]
-                })
-        
-        result_df = pd.DataFrame(result_data)
-        DATA_CACHE[result_uri] = result_df
+        # 将结果按列拼接为DataFrame格式缓存（直接展开(对象, 级别)数组，按业务对象、评估级别排列）
+        n_levels = S_matrix.shape[1]
+        result_df = pd.DataFrame({
+            '业务对象': np.repeat(np.array(obj_names, dtype=object), n_levels),
+            '评估级别': np.tile(np.array([f'e{level_idx + 1}' for level_idx in range(n_levels)], dtype=object), len(obj_names)),
+            'S值': S_matrix.ravel(),
+            'R值': R_matrix.ravel(),
+            'Q值': Q_matrix.ravel()
+        })
+        _cache_dataframe(result_uri, result_df)
         result["result_resource_id"] = result_resource_id
         
         print(f"VIKOR综合评估结果已缓存: {result_uri}")
     
+    if not include_report:
+        result["formatted_report"] = None
+        return result
+    
     # 生成VIKOR格式化报告并添加到结果中 - 直接使用模板字符串避免LLM加工
     # 构建VIKOR结果表格
-    comprehensive_scores = result.get("comprehensive_scores", {})
-    vikor_table = "| 业务对象 | S值(群体效用) | R值(个体遗憾) | Q值(妥协解) | 排序 |\n"
-    vikor_table += "|----------|---------------|---------------|------------|------|\n"
-    
-    # 计算Q值排序
-    q_values = []
-    for obj_name, scores in comprehensive_scores.items():
-        if scores["Q"]:
-            q_values.append((obj_name, scores["Q"][0]))
-    
-    # 按Q值升序排列（Q值越小越好）
-    q_values.sort(key=lambda x: x[1])
-    
-    for rank, (obj_name, q_val) in enumerate(q_values, 1):
-        scores = comprehensive_scores[obj_name]
-        s_val = scores["S"][0] if scores["S"] else 0
-        r_val = scores["R"][0] if scores["R"] else 0
-        vikor_table += f"| {obj_name} | {s_val:.4f} | {r_val:.4f} | {q_val:.4f} | {rank} |\n"
+    # 取各业务对象第1级别的S、R、Q值组成(对象, 3)数组（无评估级别时排序表为空）
+    ranked_objects = obj_names if Q_matrix.shape[1] else []
+    first_level_values = np.column_stack([S_matrix[:, 0], R_matrix[:, 0], Q_matrix[:, 0]]) if ranked_objects else np.empty((0, 3))
+    
+    # 按Q值升序排列（Q值越小越好，稳定排序保证Q值相同时保持原顺序）
+    q_order = np.argsort(first_level_values[:, 2], kind="stable")
+    
+    vikor_table = "".join([
+        "| 业务对象 | S值(群体效用) | R值(个体遗憾) | Q值(妥协解) | 排序 |\n",
+        "|----------|---------------|---------------|------------|------|\n",
+        *("| %s | %.4f | %.4f | %.4f | %d |\n" % (ranked_objects[obj_idx], s_val, r_val, q_val, rank)
+          for rank, (obj_idx, (s_val, r_val, q_val)) in enumerate(
+              zip(q_order.tolist(), first_level_values[q_order].tolist()), 1))
+    ])
     
     # 生成可查询表格清单
     available_tables = """
@@ -2822,7 +3002,7 @@ def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float
     - **权重分配**：{summary.get("weight_distribution", [])}
     - **策略权重**：v = {v}（0=保守策略，1=激进策略，0.5=平衡策略）
     - **原始资源ID**：`{resource_id}`
-    - **VIKOR计算结果资源ID**：`{result_resource_id}`
+    - **VIKOR计算结果资源ID**：{_format_result_resource_id(result)}
 
     ## 📈 妥协排序结果（Q值排序）
     {vikor_table}
@@ -2836,10 +3016,13 @@ def perform_vikor_comprehensive_evaluation(resource_id: str, weights: List[float
     return result
 
 ### 生成VIKOR计算后的下一步建议
+@functools.lru_cache(maxsize=256, typed=True)
 def _generate_vikor_next_actions(num_objects: int, v: float) -> str:
     """
     生成VIKOR计算后的下一步建议
     
+    文本只取决于参数，按参数缓存；typed=True区分v=1与v=1.0，保证文本中v的写法与入参一致。
+    
     Args:
         num_objects: 评估的业务对象数量
         v: 策略权重值
@@ -2886,8 +3069,7 @@ def export_resource_to_csv(resource_id: str) -> Dict[str, Any]:
     """
     try:
         # 处理URI格式的资源ID
-        if resource_id.startswith("data://"):
-            resource_id = resource_id[7:]  # 移除 "data://" 前缀
+        resource_id = resource_id.removeprefix(URI_PREFIX)
         
         # 首先尝试从内存缓存加载
         uri = get_resource_uri(resource_id)
@@ -2898,13 +3080,15 @@ def export_resource_to_csv(resource_id: str) -> Dict[str, Any]:
             df = load_resource_from_persistent_storage(resource_id)
         
         # 智能解析数据结构
-        # 检查是否为隶属度矩阵的嵌套结构
-        if _is_membership_matrix(df):
+        # 检查是否为隶属度矩阵的嵌套结构（mc_资源写入缓存时已完成格式判断）
+        if uri in MEMBERSHIP_RESOURCE_URIS or _is_membership_matrix(df):
             # 将嵌套结构转换为扁平化结构
             df = _flatten_membership_matrix(df)
         
-        # 转换为CSV格式
-        csv_content = df.to_csv(index=False, encoding='utf-8')
+        # 转换为CSV格式（固定换行符，输出与运行平台无关）
+        csv_buffer = io.StringIO()
+        df.to_csv(csv_buffer, index=False, lineterminator='\n')
+        csv_content = csv_buffer.getvalue()
         
         # 生成字段解释
         field_descriptions = _generate_field_descriptions(df, resource_id)
@@ -2918,11 +3102,12 @@ def export_resource_to_csv(resource_id: str) -> Dict[str, Any]:
         # 生成数据统计摘要
         data_summary = _generate_data_summary(df)
         
-        # 生成标准化的TOPSIS表格预览
-        standardized_table = _generate_standardized_topsis_table(df, resource_id)
-        
-        # 如果是TOPSIS结果，生成原始数据格式预览
-        original_data_preview = _generate_topsis_original_data_preview(df, resource_id)
+        # 仅TOPSIS结果资源生成标准化表格预览及原始数据格式预览
+        if _is_topsis_resource_id(resource_id):
+            standardized_table = _generate_standardized_topsis_table(df, resource_id)
+            original_data_preview = _generate_topsis_original_data_preview(df, resource_id)
+        else:
+            standardized_table = original_data_preview = ""
         
         result = {
             "csv_content": csv_content,
@@ -2976,11 +3161,12 @@ def generate_analysis_summary(df: pd.DataFrame, numeric_analysis: Dict, categori
             basic_stats = analysis['basic_stats']
             data_quality = analysis['data_quality']
             
-            findings = f"数值字段 '{col}': "
-            findings += f"范围 [{basic_stats['min']:.2f}, {basic_stats['max']:.2f}], "
-            findings += f"均值 {basic_stats['mean']:.2f}, "
-            findings += f"缺失率 {data_quality['missing_percentage']:.1f}%"
-            key_findings.append(findings)
+            key_findings.append("".join([
+                f"数值字段 '{col}': ",
+                f"范围 [{basic_stats['min']:.2f}, {basic_stats['max']:.2f}], ",
+                f"均值 {basic_stats['mean']:.2f}, ",
+                f"缺失率 {data_quality['missing_percentage']:.1f}%"
+            ]))
     
     # 分类字段发现
     if categorical_analysis:
@@ -2988,10 +3174,11 @@ def generate_analysis_summary(df: pd.DataFrame, numeric_analysis: Dict, categori
             freq_analysis = analysis['frequency_analysis']
             data_quality = analysis['data_quality']
             
-            findings = f"分类字段 '{col}': "
-            findings += f"{data_quality['unique_count']} 个唯一值, "
-            findings += f"缺失率 {data_quality['missing_percentage']:.1f}%"
-            key_findings.append(findings)
+            key_findings.append("".join([
+                f"分类字段 '{col}': ",
+                f"{data_quality['unique_count']} 个唯一值, ",
+                f"缺失率 {data_quality['missing_percentage']:.1f}%"
+            ]))
     
     # 数据质量发现
     quality_stats = data_quality_summary['overall_quality']
@@ -3044,7 +3231,7 @@ def _generate_next_actions(df: pd.DataFrame, resource_id: str) -> List[str]:
     """
     next_actions = []
     
-    if resource_id.startswith("mcr_") and "topsiseval" in resource_id:
+    if _is_topsis_resource_id(resource_id):
         # TOPSIS结果后的建议
         next_actions = [
             "📊 **分析相对接近度排序**：按相对接近度从大到小排序，识别最优方案",
@@ -3094,7 +3281,7 @@ def _generate_resource_info(resource_id: str, df: pd.DataFrame) -> Dict[str, Any
     elif resource_id.startswith("mc_") and "membership" in resource_id:
         resource_type = "隶属度矩阵"
         description = "经过隶属度计算后的结果，包含业务对象在各评价因子和级别下的隶属度"
-    elif resource_id.startswith("mcr_") and "topsiseval" in resource_id:
+    elif _is_topsis_resource_id(resource_id):
         resource_type = "TOPSIS评估结果"
         description = "基于隶属度矩阵的TOPSIS多准则决策分析结果，包含相对接近度等关键指标"
     
@@ -3125,25 +3312,25 @@ def _generate_data_summary(df: pd.DataFrame) -> Dict[str, Any]:
     }
     
     # 分析数值列
-    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    numeric_columns = _get_numeric_columns(df)
     if len(numeric_columns) > 0:
-        summary["numeric_summary"] = {}
-        for col in numeric_columns:
-            summary["numeric_summary"][col] = {
-                "min": float(df[col].min()),
-                "max": float(df[col].max()),
-                "mean": float(df[col].mean()),
-                "std": float(df[col].std())
-            }
+        # 一次agg得到全部数值列的四项统计量，再按列取出
+        stats = df[numeric_columns].agg(['min', 'max', 'mean', 'std'])
+        summary["numeric_summary"] = {
+            col: {stat_name: float(stats.at[stat_name, col]) for stat_name in ('min', 'max', 'mean', 'std')}
+            for col in numeric_columns
+        }
     
     # 分析分类列
-    categorical_columns = df.select_dtypes(include=['object']).columns
+    categorical_columns = df.select_dtypes(include=['object', 'string', 'category']).columns
     if len(categorical_columns) > 0:
         summary["categorical_summary"] = {}
         for col in categorical_columns:
+            # 唯一值只计算一次（含缺失值，与unique_count口径一致）
+            unique_values = df[col].unique()
             summary["categorical_summary"][col] = {
-                "unique_count": len(df[col].unique()),
-                "sample_values": list(df[col].unique()[:5])  # 显示前5个唯一值
+                "unique_count": len(unique_values),
+                "sample_values": list(unique_values[:5])  # 显示前5个唯一值
             }
     
     return summary
@@ -3161,7 +3348,7 @@ def _generate_standardized_topsis_table(df: pd.DataFrame, resource_id: str) -> s
         标准化的表格字符串
     """
     # 检查是否为TOPSIS结果
-    if not (resource_id.startswith("mcr_") and "topsiseval" in resource_id):
+    if not _is_topsis_resource_id(resource_id):
         return ""
     
     # 检查数据框是否包含必要的列
@@ -3172,12 +3359,18 @@ def _generate_standardized_topsis_table(df: pd.DataFrame, resource_id: str) -> s
     # 按业务对象和评估级别重新组织数据
     try:
         # 创建透视表：业务对象为行，评估级别为列，相对接近度为值
-        pivot_df = df.pivot_table(
-            index='业务对象', 
-            columns='评估级别', 
-            values='相对接近度', 
-            aggfunc='first'
-        ).reset_index()
+        # (业务对象, 评估级别)无重复时直接重排（set_index + unstack），无需分组聚合；
+        # 与pivot_table一致：忽略缺失的键，去掉全部为空的行与列
+        keyed_values = df.dropna(subset=['业务对象', '评估级别']).set_index(['业务对象', '评估级别'])['相对接近度']
+        if keyed_values.index.is_unique:
+            pivot_df = keyed_values.unstack().dropna(how='all').dropna(axis=1, how='all').reset_index()
+        else:
+            pivot_df = df.pivot_table(
+                index='业务对象', 
+                columns='评估级别', 
+                values='相对接近度', 
+                aggfunc='first'
+            ).reset_index()
         
         # 确保列名按级别顺序排列
         level_columns = [col for col in pivot_df.columns if col.startswith('e')]
@@ -3200,17 +3393,12 @@ def _generate_standardized_topsis_table(df: pd.DataFrame, resource_id: str) -> s
         headers = list(pivot_df.columns)
         table_lines.append("\t".join(headers))
         
-        # 数据行
-        for _, row in pivot_df.iterrows():
-            row_data = []
-            for col in headers:
-                value = row[col]
-                if isinstance(value, (int, float)):
-                    # 数值格式化：保留3位小数
-                    row_data.append(f"{value:.3f}")
-                else:
-                    row_data.append(str(value))
-            table_lines.append("\t".join(row_data))
+        # 数据行（整表一次转为数组后逐行拼接，数值保留3位小数）
+        for row_values in pivot_df.to_numpy():
+            table_lines.append("\t".join([
+                f"{value:.3f}" if isinstance(value, (int, float)) else str(value)
+                for value in row_values
+            ]))
         
         return "\n".join(table_lines)
         
@@ -3218,6 +3406,9 @@ def _generate_standardized_topsis_table(df: pd.DataFrame, resource_id: str) -> s
         print(f"生成标准化表格时出错: {e}")
         return ""
 
+### 扁平化隶属度矩阵格式的必要列
+MEMBERSHIP_MATRIX_COLUMNS = frozenset(['业务对象', '评价因子', '评估级别', '隶属度'])
+
 ### 检查隶属度矩阵格式函数
 def _is_membership_matrix(df: pd.DataFrame) -> bool:
     """
@@ -3232,13 +3423,16 @@ def _is_membership_matrix(df: pd.DataFrame) -> bool:
     if df.empty:
         return False
     
-    # 检查扁平化格式（包含必要的列）
-    required_columns = ['业务对象', '评价因子', '评估级别', '隶属度']
-    if all(col in df.columns for col in required_columns):
+    # 检查扁平化格式（包含必要的列，集合子集判断）
+    if MEMBERSHIP_MATRIX_COLUMNS.issubset(df.columns):
         return True
     
-    # 检查嵌套字典结构（原始格式）
-    first_row = df.iloc[0]
+    # 检查嵌套字典结构（原始格式），字典只可能出现在object类型的列中，无此类列时直接判定为否
+    object_positions = np.flatnonzero((df.dtypes == object).to_numpy())
+    if not len(object_positions):
+        return False
+    
+    first_row = df.iloc[0, object_positions]
     for value in first_row:
         if isinstance(value, dict):
             # 检查字典键是否包含"级别"字样
@@ -3258,39 +3452,75 @@ def _flatten_membership_matrix(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         扁平化后的DataFrame
     """
-    flattened_results = []
-    
     # 获取原始数据的业务对象标识符（如果有的话）
     # 假设原始数据的第一列是业务对象标识符
     object_identifier = df.columns[0] if len(df.columns) > 0 else "业务对象"
     
-    for row_idx, row in df.iterrows():
-        # 获取业务对象标识符（如果存在）
-        object_id = row[object_identifier] if object_identifier in row else f"对象{row_idx + 1}"
-        
+    # 按列取出Python列表后逐行拼接，避免iterrows为每一行构造Series；扁平化结果按列收集
+    object_ids, factor_names, level_names, membership_values = [], [], [], []
+    field_names = [col for col in df.columns if col != object_identifier]
+    id_values = df[object_identifier].tolist() if len(df.columns) > 0 else []
+    field_columns = [df[field_name].tolist() for field_name in field_names]
+    
+    for object_id, *row_values in zip(id_values, *field_columns):
         # 遍历每个字段的隶属度字典
-        for field_name, level_data in row.items():
-            # 跳过业务对象标识符列
-            if field_name == object_identifier:
-                continue
-            
+        for field_name, level_data in zip(field_names, row_values):
             # 检查是否为嵌套字典结构
             if isinstance(level_data, dict):
                 for level_name, membership_value in level_data.items():
-                    flattened_results.append({
-                        object_identifier: object_id,
-                        "评价因子": field_name,
-                        "级别": level_name,
-                        "隶属度": membership_value
-                    })
+                    object_ids.append(object_id)
+                    factor_names.append(field_name)
+                    level_names.append(level_name)
+                    membership_values.append(membership_value)
     
     # 创建扁平化的DataFrame
-    if flattened_results:
-        return pd.DataFrame(flattened_results)
+    if object_ids:
+        return pd.DataFrame({
+            object_identifier: object_ids,
+            "评价因子": factor_names,
+            "级别": level_names,
+            "隶属度": membership_values
+        })
     else:
         # 如果没有找到嵌套结构，返回原始DataFrame
         return df
 
+### 获取隶属度资源的规范化特征值矩阵（带备忘）
+def _get_normalized_matrices(uri: str, membership_df: pd.DataFrame) -> Union[Dict[str, np.ndarray], "NormalizedTensor"]:
+    """
+    检查隶属度矩阵格式并转换为规范化特征值矩阵，同一DataFrame对象的结果在NORMALIZED_MATRIX_MEMO中复用
+    
+    各业务对象矩阵形状一致时以NormalizedTensor形式备忘，TOPSIS、VIKOR重复评估同一资源时不再重新堆叠矩阵。
+    
+    Args:
+        uri: 资源URI
+        membership_df: 隶属度矩阵DataFrame
+        
+    Returns:
+        NormalizedTensor，或形状不一致时的规范化特征值矩阵字典{"T1": 矩阵, "T2": 矩阵, ...}（调用方不得原地修改）
+        
+    Raises:
+        ValueError: 数据不是隶属度矩阵格式
+    """
+    memo = NORMALIZED_MATRIX_MEMO.get(uri)
+    if memo is not None and memo[0]() is membership_df:
+        return memo[1]
+    
+    # mc_资源写入缓存时已完成格式判断，其余资源在此检查
+    if uri not in MEMBERSHIP_RESOURCE_URIS and not _is_membership_matrix(membership_df):
+        raise ValueError("数据格式错误：需要隶属度矩阵格式的数据")
+    
+    normalized_matrices = _convert_membership_to_normalized_matrix(membership_df)
+    if normalized_matrices and len({matrix.shape for matrix in normalized_matrices.values()}) == 1:
+        from modules.algorithm_layer.membership_functions import NormalizedTensor
+        normalized_matrices = NormalizedTensor.from_dict(normalized_matrices)
+    
+    NORMALIZED_MATRIX_MEMO.pop(uri, None)
+    if len(NORMALIZED_MATRIX_MEMO) >= NORMALIZED_MATRIX_MEMO_MAX_SIZE:
+        NORMALIZED_MATRIX_MEMO.pop(next(iter(NORMALIZED_MATRIX_MEMO)))
+    NORMALIZED_MATRIX_MEMO[uri] = (weakref.ref(membership_df), normalized_matrices)
+    return normalized_matrices
+
 ### 转换隶属度矩阵为规范化特征值矩阵函数
 def _convert_membership_to_normalized_matrix(membership_df: pd.DataFrame) -> Dict[str, np.ndarray]:
     """
@@ -3302,31 +3532,43 @@ def _convert_membership_to_normalized_matrix(membership_df: pd.DataFrame) -> Dic
     Returns:
         规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
     """
-    # 按业务对象分组
-    grouped = membership_df.groupby('业务对象')
+    # 一次稳定排序后由相邻行键值变化点得到各(业务对象, 评价因子)的条数；各业务对象的评价因子数一致、
+    # 各评价因子的级别数一致时，整列隶属度可直接重排为(业务对象, 评价因子, 评估级别)张量，无需分组
+    key_columns = ['业务对象', '评价因子']
+    sorted_df = membership_df.dropna(subset=key_columns).sort_values(key_columns + ['评估级别'], kind='stable')
+    if not len(sorted_df):
+        return {}
+    
+    obj_keys = sorted_df['业务对象'].to_numpy()
+    factor_keys = sorted_df['评价因子'].to_numpy()
+    obj_changed = np.empty(len(sorted_df), dtype=bool)
+    obj_changed[0] = True
+    obj_changed[1:] = obj_keys[1:] != obj_keys[:-1]
+    pair_changed = obj_changed.copy()
+    pair_changed[1:] |= factor_keys[1:] != factor_keys[:-1]
+    obj_names = obj_keys[obj_changed].tolist()
+    
+    pair_starts = np.flatnonzero(pair_changed)
+    obj_pair_starts = np.flatnonzero(obj_changed[pair_changed])
+    pair_sizes = np.diff(np.append(pair_starts, len(sorted_df)))
+    factor_counts = np.diff(np.append(obj_pair_starts, len(pair_starts)))
+    if (pair_sizes == pair_sizes[0]).all() and (factor_counts == factor_counts[0]).all():
+        membership_tensor = sorted_df['隶属度'].to_numpy().reshape(
+            len(factor_counts), factor_counts[0], pair_sizes[0]
+        )
+        return dict(zip(obj_names, membership_tensor))
     
-    normalized_matrices = {}
+    # 各组大小不一致时，按同一排序结果的键值变化点切分：每个(业务对象, 评价因子)的隶属度为一行，
+    # 每个业务对象的各行组成矩阵
+    memberships = sorted_df['隶属度'].tolist()
+    pair_bounds = np.append(pair_starts, len(sorted_df)).tolist()
+    rows = [memberships[start:end] for start, end in zip(pair_bounds[:-1], pair_bounds[1:])]
+    obj_bounds = np.append(obj_pair_starts, len(rows)).tolist()
     
-    for obj_name, group in grouped:
-        # 按评价因子分组
-        factor_groups = group.groupby('评价因子')
-        
-        matrix = []
-        factor_names = []
-        
-        for factor_name, factor_group in factor_groups:
-            # 按级别排序
-            factor_group = factor_group.sort_values('评估级别')
-            
-            # 提取隶属度值作为一行
-            row = factor_group['隶属度'].tolist()
-            matrix.append(row)
-            factor_names.append(factor_name)
-        
-        if matrix:
-            normalized_matrices[obj_name] = np.array(matrix)
-    
-    return normalized_matrices
+    return {
+        obj_name: np.array(rows[start:end])
+        for obj_name, start, end in zip(obj_names, obj_bounds[:-1], obj_bounds[1:])
+    }
 
 
 # =========================================================================================
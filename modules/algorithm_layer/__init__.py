@@ -4,13 +4,14 @@
 包含隶属度函数、多准则决策算法、语义映射算法和等级综合评定算法
 """
 
-from .membership_functions import LowerBoundMembershipFunctions
+from .membership_functions import LowerBoundMembershipFunctions, NormalizedTensor
 from .topsis_comprehensive_evaluation import TOPSISComprehensiveEvaluation
 from .vikor_comprehensive_evaluation import VIKORComprehensiveEvaluation
 from .grade_comprehensive_assessment import GradeComprehensiveAssessment
 
 __all__ = [
     "LowerBoundMembershipFunctions",
+    "NormalizedTensor",
     "TOPSISComprehensiveEvaluation", 
     "VIKORComprehensiveEvaluation",
     "GradeComprehensiveAssessment"
@@ -37,17 +37,20 @@ class GradeComprehensiveAssessment:
         Returns:
             级别特征值字典，格式为{"T1": v1, "T2": v2, ...}
         """
-        level_characteristic_values = {}
+        obj_names = list(membership_scores)
+        if not obj_names:
+            return {}
         
-        for obj_name, u_vector in membership_scores.items():
-            # 计算级别特征值 v_j = sum_{k=1}^{h} k * u_{jk}
-            v_value = 0.0
-            for k, u_jk in enumerate(u_vector, start=1):
-                v_value += k * u_jk
-            
-            level_characteristic_values[obj_name] = v_value
+        # 所有业务对象的综合隶属度向量堆叠为(对象, 等级)矩阵
+        u_matrix = np.array([membership_scores[obj_name] for obj_name in obj_names], dtype=np.float64)
+        
+        # 计算级别特征值 v_j = sum_{k=1}^{h} k * u_{jk}
+        # 按等级顺序逐列累加（每次覆盖全部对象），与逐对象从k=1开始累加的结果一致
+        v_values = np.zeros(len(obj_names))
+        for k in range(1, u_matrix.shape[1] + 1):
+            v_values += k * u_matrix[:, k - 1]
         
-        return level_characteristic_values
+        return dict(zip(obj_names, v_values.tolist()))
     
     @staticmethod
     def perform_binary_semantic_assessment(level_characteristic_values: Dict[str, float], 
@@ -62,21 +65,19 @@ class GradeComprehensiveAssessment:
         Returns:
             二元语义评定结果字典，格式为{"T1": (k, alpha), "T2": (k, alpha), ...}
         """
-        binary_semantic_results = {}
+        obj_names = list(level_characteristic_values)
+        v_values = np.array([level_characteristic_values[obj_name] for obj_name in obj_names], dtype=np.float64)
+        if not np.isfinite(v_values).all():
+            raise ValueError("级别特征值包含缺失值或无穷大，无法进行二元语义评定")
         
-        for obj_name, v_value in level_characteristic_values.items():
-            # 计算风险等级 k = Round(v_j)
-            k = round(v_value)
-            
-            # 确保k在有效范围内 [1, num_levels]
-            k = max(1, min(k, num_levels))
-            
-            # 计算符号偏移值 alpha_{jk} = v_j - k
-            alpha = v_value - k
-            
-            binary_semantic_results[obj_name] = (k, alpha)
+        # 计算风险等级 k = Round(v_j)（np.rint与round一致，均为四舍六入五成双）
+        # 并确保k在有效范围内 [1, num_levels]
+        k_values = np.maximum(np.minimum(np.rint(v_values), num_levels), 1)
         
-        return binary_semantic_results
+        # 计算符号偏移值 alpha_{jk} = v_j - k
+        alpha_values = v_values - k_values
+        
+        return dict(zip(obj_names, zip(k_values.astype(np.int64).tolist(), alpha_values.tolist())))
     
     @staticmethod
     def generate_comprehensive_assessment_report(membership_scores: Dict[str, List[float]],
@@ -113,21 +114,14 @@ class GradeComprehensiveAssessment:
         report_lines.append("| 业务对象 | 综合隶属度向量 | 级别特征值 | 二元语义 | 最终等级 |")
         report_lines.append("|---------|---------------|-----------|----------|----------|")
         
-        for obj_name in membership_scores.keys():
-            u_vector = membership_scores[obj_name]
-            v_value = level_characteristic_values[obj_name]
+        # 每个业务对象一行：综合隶属度向量、级别特征值、二元语义(k, alpha)与最终等级（k级）
+        format_membership = "{:.3f}".format
+        for obj_name, u_vector in membership_scores.items():
             k, alpha = binary_semantic_results[obj_name]
-            
-            # 格式化综合隶属度向量
-            u_formatted = ", ".join([f"{u:.3f}" for u in u_vector])
-            
-            # 格式化二元语义
-            binary_semantic = f"({k}, {alpha:+.3f})"
-            
-            # 最终等级
-            final_grade = f"{k}级"
-            
-            report_lines.append(f"| {obj_name} | ({u_formatted}) | {v_value:.3f} | {binary_semantic} | {final_grade} |")
+            report_lines.append(
+                f"| {obj_name} | ({', '.join(map(format_membership, u_vector))}) "
+                f"| {level_characteristic_values[obj_name]:.3f} | ({k}, {alpha:+.3f}) | {k}级 |"
+            )
         
         report_lines.append("")
         
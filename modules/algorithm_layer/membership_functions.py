@@ -21,7 +21,66 @@
 """
 
 import numpy as np
-from typing import Union, List, Dict
+from dataclasses import dataclass, field
+from typing import Union, List, Dict, Optional
+
+
+@dataclass(slots=True)
+class NormalizedTensor:
+    """
+    规范化特征值矩阵的张量形式 - 全部评估对象的矩阵存放在同一个数组中
+    
+    TOPSIS、VIKOR可直接接收该对象代替{"T1": 矩阵, ...}字典，省去每次计算前的堆叠与转置；
+    同一张量多次评估时，按(对象, 级别, 因子)排列的连续副本只生成一次（调用方不得原地修改）。
+    
+    Attributes:
+        names: 评估对象名称列表
+        data: 形状为(对象数, 因子数, 级别数)的隶属度张量，data[i]为第i个评估对象的规范化特征值矩阵
+    """
+    names: List[str]
+    data: np.ndarray
+    _level_major: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def from_dict(cls, normalized_matrices: Dict[str, np.ndarray]) -> "NormalizedTensor":
+        """
+        由规范化特征值矩阵字典构建张量（各矩阵形状必须一致）
+        
+        Args:
+            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
+            
+        Returns:
+            规范化特征值张量
+        """
+        names = list(normalized_matrices)
+        return cls(names, np.stack([normalized_matrices[name] for name in names]))
+    
+    @property
+    def num_factors(self) -> int:
+        """评价因子数量"""
+        return self.data.shape[1]
+    
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """
+        转换为规范化特征值矩阵字典（各矩阵为张量的视图）
+        
+        Returns:
+            规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
+        """
+        return dict(zip(self.names, self.data))
+    
+    def level_major(self) -> np.ndarray:
+        """
+        获取按(对象, 级别, 因子)排列、内存连续的float64张量
+        
+        因子轴放在最后且内存连续，按因子求和与逐级别对一维向量求和的结果一致
+        
+        Returns:
+            形状为(对象数, 级别数, 因子数)的隶属度张量
+        """
+        if self._level_major is None:
+            self._level_major = np.ascontiguousarray(self.data.transpose(0, 2, 1), dtype=np.float64)
+        return self._level_major
 
 
 class LowerBoundMembershipFunctions:
@@ -65,12 +124,11 @@ class LowerBoundMembershipFunctions:
                 else:
                     return 0.0
             else:
-                result = np.zeros_like(x)
-                mask1 = x >= a_current
-                mask2 = (x >= a_next) & (x < a_current)
-                result[mask1] = 1.0
-                result[mask2] = (x[mask2] - a_next) / (a_current - a_next)
-                return result
+                x = np.asarray(x)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result = np.select([(x >= a_next) & (x < a_current), x >= a_current],
+                                       [(x - a_next) / (a_current - a_next), 1.0], 0.0)
+                return result.astype(x.dtype, copy=False)
         
         elif level_index == total_levels:
             # 公式(4-13): 最后级别
@@ -89,17 +147,20 @@ class LowerBoundMembershipFunctions:
                     else:
                         return x / a_current if a_current > 0 else 0.0
             else:
-                result = np.zeros_like(x)
-                mask1 = x >= a_prev
-                mask2 = (x >= a_current) & (x < a_prev)
-                mask3 = x < a_current
-                
-                result[mask1] = np.where(x[mask1] > 0, a_prev / x[mask1], 0.0)
-                result[mask2] = 1.0
-                # 修正：当x非常小（接近0）时，级别4隶属度应该为1.0
-                result[mask3] = np.where(x[mask3] <= 0.0, 1.0, 
-                                        np.where(a_current > 0, x[mask3] / a_current, 0.0))
-                return result
+                # 条件按后者优先排列（级别参数非单调时各区间可能重叠），结果只分配一次
+                x = np.asarray(x)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result = np.select(
+                        [x < a_current, (x >= a_current) & (x < a_prev), x >= a_prev],
+                        [
+                            # 修正：当x非常小（接近0）时，级别4隶属度应该为1.0
+                            np.where(x <= 0.0, 1.0, np.where(a_current > 0, x / a_current, 0.0)),
+                            1.0,
+                            np.where(x > 0, a_prev / x, 0.0)
+                        ],
+                        0.0
+                    )
+                return result.astype(x.dtype, copy=False)
         
         else:
             # 公式(4-12): 中间级别
@@ -116,19 +177,80 @@ class LowerBoundMembershipFunctions:
                 else:
                     return 0.0
             else:
-                result = np.zeros_like(x)
-                mask1 = x >= a_prev
-                mask2 = (x >= a_current) & (x < a_prev)
-                mask3 = (x >= a_next) & (x < a_current)
+                # 条件按后者优先排列（级别参数非单调时各区间可能重叠），结果只分配一次
+                x = np.asarray(x)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result = np.select(
+                        [(x >= a_next) & (x < a_current), (x >= a_current) & (x < a_prev), x >= a_prev],
+                        [(x - a_next) / (a_current - a_next), 1.0, np.where(x > 0, a_prev / x, 0.0)],
+                        0.0
+                    )
+                return result.astype(x.dtype, copy=False)
+    
+    @staticmethod
+    def lower_bound_membership_matrix(x: np.ndarray, level_params: List[float],
+                                      dtype: np.dtype = np.float64) -> np.ndarray:
+        """
+        向量化计算一组输入值在全部级别上的下界型隶属度（公式4-11到4-13）
+        
+        与逐值调用lower_bound_level_membership的结果一致，但所有分支判断均以数组运算完成
+        
+        Args:
+            x: 输入值数组（长度为N）
+            level_params: 级别参数列表，按顺序排列的边界值[a_ij1, a_ij2, ..., a_ijh]
+            dtype: 计算与结果的浮点类型，默认为float64；传入float32可减半内存占用，但结果不再与逐值计算一致
+            
+        Returns:
+            形状为(N, h)的隶属度矩阵，第j列对应级别j+1
+        """
+        x = np.asarray(x, dtype=dtype)
+        a = np.asarray(level_params, dtype=dtype)
+        total_levels = len(a)
+        result = np.empty((len(x), total_levels), dtype=dtype)
+        
+        # 各分支的表达式会对全部元素求值，除零等无效结果随后由条件选择丢弃
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # x >= a_prev 时的隶属度 a_prev / x（x <= 0 时为0）
+            def _above_prev(a_prev):
+                return np.where(x > 0, a_prev / x, 0.0)
+            
+            for level_index in range(1, total_levels + 1):
+                a_current = a[level_index - 1]
+                
+                if level_index == 1:
+                    # 公式(4-11): 第一级别
+                    a_next = a[1] if total_levels > 1 else 0.0
+                    conditions = [x >= a_current, (x >= a_next) & (x < a_current)]
+                    choices = [1.0, (x - a_next) / (a_current - a_next)]
+                    default = 0.0
+                
+                elif level_index == total_levels:
+                    # 公式(4-13): 最后级别（x <= 0 时隶属度为1.0，其余按 x / a_current 计算）
+                    a_prev = a[level_index - 2]
+                    conditions = [x >= a_prev, (x >= a_current) & (x < a_prev)]
+                    choices = [_above_prev(a_prev), 1.0]
+                    default = np.where(x <= 0.0, 1.0, x / a_current if a_current > 0 else 0.0)
                 
-                result[mask1] = np.where(x[mask1] > 0, a_prev / x[mask1], 0.0)
-                result[mask2] = 1.0
-                result[mask3] = (x[mask3] - a_next) / (a_current - a_next)
-                return result
+                else:
+                    # 公式(4-12): 中间级别
+                    a_prev = a[level_index - 2]
+                    a_next = a[level_index]
+                    conditions = [
+                        x >= a_prev,
+                        (x >= a_current) & (x < a_prev),
+                        (x >= a_next) & (x < a_current)
+                    ]
+                    choices = [_above_prev(a_prev), 1.0, (x - a_next) / (a_current - a_next)]
+                    default = 0.0
+                
+                result[:, level_index - 1] = np.select(conditions, choices, default)
+        
+        return result
     
     @staticmethod
     def calculate_normalized_matrix(factors_data: Dict[str, List[float]], 
-                                   factors_params: Dict[str, List[float]]) -> Dict[str, np.ndarray]:
+                                   factors_params: Dict[str, List[float]],
+                                   dtype: np.dtype = np.float64) -> Dict[str, np.ndarray]:
         """
         计算规范化特征值级别矩阵
         
@@ -137,39 +259,29 @@ class LowerBoundMembershipFunctions:
         Args:
             factors_data: 因子数据字典，格式为{"f1": [值1, 值2, ...], "f2": [...]}
             factors_params: 因子参数字典，格式为{"f1": [a1, a2, a3, a4], "f2": [...]}
+            dtype: 隶属度的浮点类型，默认为float64，可选float32以减半内存占用
             
         Returns:
             规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
         """
-        normalized_matrices = {}
-        
         # 获取评估对象数量
         num_objects = len(list(factors_data.values())[0])
+        if num_objects == 0:
+            return {}
         
-        for obj_idx in range(num_objects):
-            obj_name = f"T{obj_idx + 1}"
-            matrix = []
+        # 每个因子一次性计算全部评估对象在各级别上的隶属度(对象, 级别)，再沿因子维堆叠为(对象, 因子, 级别)
+        factor_blocks = []
+        for factor_name, factor_data in factors_data.items():
+            if factor_name not in factors_params:
+                raise ValueError(f"因子{factor_name}的参数未定义")
             
-            for factor_name, factor_data in factors_data.items():
-                if factor_name not in factors_params:
-                    raise ValueError(f"因子{factor_name}的参数未定义")
-                
-                x_value = factor_data[obj_idx]
-                level_params = factors_params[factor_name]
-                total_levels = len(level_params)
-                
-                row = []
-                for level in range(1, total_levels + 1):
-                    membership_value = LowerBoundMembershipFunctions.lower_bound_level_membership(
-                        x_value, level_params, level, total_levels
-                    )
-                    row.append(membership_value)
-                
-                matrix.append(row)
-            
-            normalized_matrices[obj_name] = np.array(matrix)
+            factor_blocks.append(LowerBoundMembershipFunctions.lower_bound_membership_matrix(
+                factor_data[:num_objects], factors_params[factor_name], dtype
+            ))
+        
+        membership_tensor = np.stack(factor_blocks, axis=1)
         
-        return normalized_matrices
+        return {f"T{obj_idx + 1}": membership_tensor[obj_idx] for obj_idx in range(num_objects)}
     
     @staticmethod
     def get_predefined_factors_params() -> Dict[str, List[float]]:
@@ -229,35 +341,20 @@ def calculate_topsis_comprehensive_membership(normalized_matrices: Dict[str, np.
     if len(weights) != num_factors:
         raise ValueError("权重数量必须等于因子数量")
     
-    # 对每个评估对象计算TOPSIS综合隶属度
-    for obj_name, matrix in normalized_matrices.items():
-        # 初始化结果存储
-        d_positive = []
-        d_negative = []
-        
-        # 对每个级别计算距离
-        for level_idx in range(num_levels):
-            # 获取当前级别的所有因子隶属度值
-            level_memberships = matrix[:, level_idx]
-            
-            # 定义最优解和最劣解（基于参考内容）
-            # 最优解：所有因子隶属度都为1（最大业务风险）
-            # 最劣解：所有因子隶属度都为0（最小业务风险）
-            ideal_positive = np.ones(num_factors)
-            ideal_negative = np.zeros(num_factors)
-            
-            # 计算与最优解的欧氏距离D+
-            distance_positive = np.sqrt(np.sum(weights * (level_memberships - ideal_positive) ** 2))
-            
-            # 计算与最劣解的欧氏距离D-
-            distance_negative = np.sqrt(np.sum(weights * (level_memberships - ideal_negative) ** 2))
-            
-            d_positive.append(distance_positive)
-            d_negative.append(distance_negative)
-        
+    # 将所有评估对象的矩阵堆叠为(对象, 级别, 因子)张量，一次计算全部对象、全部级别的距离
+    # （因子轴放在最后且内存连续，按因子求和与逐级别对一维向量求和的结果一致）
+    memberships = np.ascontiguousarray(np.stack(list(normalized_matrices.values())).transpose(0, 2, 1))
+    
+    # 最优解：所有因子隶属度都为1（最大业务风险）；最劣解：所有因子隶属度都为0（最小业务风险）
+    # D+ = sqrt(sum(w_i * (x_i - 1)^2))，D- = sqrt(sum(w_i * x_i^2))
+    weights_array = np.asarray(weights)
+    distance_positive = np.sqrt(np.sum(weights_array * (memberships - 1.0) ** 2, axis=-1))
+    distance_negative = np.sqrt(np.sum(weights_array * memberships ** 2, axis=-1))
+    
+    for obj_name, d_positive, d_negative in zip(normalized_matrices, distance_positive, distance_negative):
         comprehensive_membership[obj_name] = {
-            "D+": d_positive,
-            "D-": d_negative
+            "D+": list(d_positive),
+            "D-": list(d_negative)
         }
     
     return comprehensive_membership
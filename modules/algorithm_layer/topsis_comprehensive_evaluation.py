@@ -19,31 +19,34 @@ TOPSIS综合评估模块
 """
 
 import numpy as np
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple
+
+from modules.algorithm_layer.membership_functions import NormalizedTensor
 
 
 class TOPSISComprehensiveEvaluation:
     """TOPSIS综合评估类 - 专注于多因子综合评估"""
     
     @staticmethod
-    def calculate_comprehensive_membership(normalized_matrices: Dict[str, np.ndarray], 
-                                         weights: List[float] = None) -> Dict[str, Dict[str, List[float]]]:
+    def calculate_distance_matrices(normalized_matrices: Union[Dict[str, np.ndarray], NormalizedTensor], 
+                                    weights: List[float] = None,
+                                    squared: bool = False) -> Tuple[List[str], np.ndarray, np.ndarray]:
         """
-        使用TOPSIS方法计算综合隶属度
+        使用TOPSIS方法计算各评估对象与最优解、最劣解的距离矩阵（数组形式）
         
         Args:
-            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
+            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}，或NormalizedTensor
             weights: 指标权重列表，默认为等权重
+            squared: 是否返回加权欧氏距离的平方（不开方），默认为False
             
         Returns:
-            综合隶属度字典，格式为{"T1": {"D+": [d1+, d2+, ...], "D-": [d1-, d2-, ...]}, ...}
+            (评估对象名称列表, D+距离矩阵, D-距离矩阵)，两个距离矩阵形状均为(对象数, 级别数)，行顺序与名称列表一致
         """
-        comprehensive_membership = {}
-        
-        # 获取评估对象数量和级别数
-        num_objects = len(normalized_matrices)
-        sample_matrix = next(iter(normalized_matrices.values()))
-        num_factors, num_levels = sample_matrix.shape
+        # 获取因子数量
+        if isinstance(normalized_matrices, NormalizedTensor):
+            num_factors = normalized_matrices.num_factors
+        else:
+            num_factors = next(iter(normalized_matrices.values())).shape[0]
         
         # 默认权重为等权重
         if weights is None:
@@ -56,40 +59,131 @@ class TOPSISComprehensiveEvaluation:
         # 将权重转换为numpy数组便于计算
         weights_array = np.array(weights)
         
-        # 对每个评估对象计算TOPSIS综合隶属度
-        for obj_name, matrix in normalized_matrices.items():
-            # 初始化结果存储
-            d_positive = []
-            d_negative = []
+        # 等权重（含默认权重）时 sum(w * x_i^2) = w * sum(x_i^2)，
+        # 可在按因子求和后再乘以标量权重，省去对整个张量的一次加权
+        uniform_weight = weights_array[0] if np.all(weights_array == weights_array[0]) else None
+        
+        # 将所有评估对象的矩阵堆叠为(对象, 级别, 因子)张量，一次计算全部对象、全部级别的距离
+        if not isinstance(normalized_matrices, NormalizedTensor):
+            normalized_matrices = NormalizedTensor.from_dict(normalized_matrices)
+        obj_names = list(normalized_matrices.names)
+        memberships = normalized_matrices.level_major()
+        
+        # 定义最优解和最劣解（基于论文描述）
+        # 最优解：所有因子隶属度都为1（最大业务风险）
+        # 最劣解：所有因子隶属度都为0（最小业务风险）
+        
+        # 计算与最优解的欧氏距离D+（按照论文公式）
+        # D+ = sqrt(sum(w_i * (x_i - 1)^2))
+        # 平方、加权均在同一个临时数组上原地完成，避免每一步都分配新的中间数组
+        weighted_sq = memberships - 1.0
+        np.square(weighted_sq, out=weighted_sq)
+        if uniform_weight is None:
+            weighted_sq *= weights_array
+        distance_positive = np.sum(weighted_sq, axis=-1)
+        if uniform_weight is not None:
+            distance_positive *= uniform_weight
+        if not squared:
+            np.sqrt(distance_positive, out=distance_positive)
+        
+        # 计算与最劣解的欧氏距离D-（按照论文公式）
+        # D- = sqrt(sum(w_i * x_i^2))（复用同一临时数组）
+        np.square(memberships, out=weighted_sq)
+        if uniform_weight is None:
+            weighted_sq *= weights_array
+        distance_negative = np.sum(weighted_sq, axis=-1)
+        if uniform_weight is not None:
+            distance_negative *= uniform_weight
+        if not squared:
+            np.sqrt(distance_negative, out=distance_negative)
+        
+        return obj_names, distance_positive, distance_negative
+    
+    @staticmethod
+    def calculate_comprehensive_membership(normalized_matrices: Dict[str, np.ndarray], 
+                                         weights: List[float] = None,
+                                         ranking_only: bool = False) -> Dict[str, Dict[str, List[float]]]:
+        """
+        使用TOPSIS方法计算综合隶属度
+        
+        ranking_only为True时D+、D-为距离的平方（省去开方）。记r = sqrt(D-^2 / D+^2)，由平方距离得到的
+        D-^2 / (D+^2 + D-^2) = r^2 / (1 + r^2)与相对接近度 r / (1 + r)同为r的严格增函数，
+        因此将结果传入get_comprehensive_scores后，同一级别下各对象的排序不变，但数值不是相对接近度，
+        不能用于计算综合隶属度。
+        
+        Args:
+            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
+            weights: 指标权重列表，默认为等权重
+            ranking_only: 是否只用于排序（返回平方距离），默认为False
             
-            # 对每个级别计算距离
-            for level_idx in range(num_levels):
-                # 获取当前级别的所有因子隶属度值
-                level_memberships = matrix[:, level_idx]
-                
-                # 定义最优解和最劣解（基于论文描述）
-                # 最优解：所有因子隶属度都为1（最大业务风险）
-                # 最劣解：所有因子隶属度都为0（最小业务风险）
-                ideal_positive = np.ones(num_factors)
-                ideal_negative = np.zeros(num_factors)
-                
-                # 计算与最优解的欧氏距离D+（按照论文公式）
-                # D+ = sqrt(sum(w_i * (x_i - 1)^2))
-                distance_positive = np.sqrt(np.sum(weights_array * (level_memberships - ideal_positive) ** 2))
-                
-                # 计算与最劣解的欧氏距离D-（按照论文公式）
-                # D- = sqrt(sum(w_i * x_i^2))
-                distance_negative = np.sqrt(np.sum(weights_array * level_memberships ** 2))
-                
-                d_positive.append(distance_positive)
-                d_negative.append(distance_negative)
+        Returns:
+            综合隶属度字典，格式为{"T1": {"D+": [d1+, d2+, ...], "D-": [d1-, d2-, ...]}, ...}
+        """
+        obj_names, distance_positive, distance_negative = TOPSISComprehensiveEvaluation.calculate_distance_matrices(
+            normalized_matrices, weights, squared=ranking_only
+        )
+        
+        # 仅在返回时按对象拆分，tolist()批量转为Python原生float，便于工具返回值直接走JSON序列化快路径
+        return {
+            obj_name: {"D+": d_positive, "D-": d_negative}
+            for obj_name, d_positive, d_negative in zip(obj_names, distance_positive.tolist(), distance_negative.tolist())
+        }
+    
+    @staticmethod
+    def calculate_closeness_matrix(distance_positive: np.ndarray, distance_negative: np.ndarray) -> np.ndarray:
+        """
+        根据距离矩阵计算相对接近度矩阵（论文公式4-30）
+        
+        Args:
+            distance_positive: D+距离矩阵，形状为(对象数, 级别数)
+            distance_negative: D-距离矩阵，形状为(对象数, 级别数)
+            
+        Returns:
+            相对接近度矩阵，D+与D-之和为0的位置取0
+        """
+        # V_i^N = D_i^- / (D_i^+ + D_i^-)
+        distance_sum = distance_positive + distance_negative
+        return np.divide(distance_negative, distance_sum,
+                         out=np.zeros_like(distance_negative), where=distance_sum != 0)
+    
+    @staticmethod
+    def calculate_membership_score_matrix(closeness_matrix: np.ndarray) -> np.ndarray:
+        """
+        根据相对接近度矩阵按行归一化得到综合隶属度矩阵（论文公式4-31）
+        
+        Args:
+            closeness_matrix: 相对接近度矩阵，形状为(对象数, 级别数)
+            
+        Returns:
+            综合隶属度矩阵，相对接近度之和不大于0的行取0
+        """
+        # u_{ij}^N = V_{ij}^N / sum(V_{ij}^N for all levels)
+        total_scores = np.sum(closeness_matrix, axis=1, keepdims=True)
+        return np.divide(closeness_matrix, total_scores,
+                         out=np.zeros_like(closeness_matrix), where=total_scores > 0)
+    
+    @staticmethod
+    def calculate_evaluation_matrices(normalized_matrices: Union[Dict[str, np.ndarray], NormalizedTensor], 
+                                      weights: List[float] = None) -> Tuple[List[str], np.ndarray, np.ndarray,
+                                                                            np.ndarray, np.ndarray]:
+        """
+        一次完成TOPSIS距离、相对接近度与综合隶属度计算（数组形式）
+        
+        Args:
+            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}，或NormalizedTensor
+            weights: 指标权重列表，默认为等权重
             
-            comprehensive_membership[obj_name] = {
-                "D+": d_positive,
-                "D-": d_negative
-            }
+        Returns:
+            (评估对象名称列表, D+距离矩阵, D-距离矩阵, 相对接近度矩阵, 综合隶属度矩阵)，
+            各矩阵形状均为(对象数, 级别数)，行顺序与名称列表一致
+        """
+        obj_names, distance_positive, distance_negative = TOPSISComprehensiveEvaluation.calculate_distance_matrices(
+            normalized_matrices, weights
+        )
+        closeness_matrix = TOPSISComprehensiveEvaluation.calculate_closeness_matrix(distance_positive, distance_negative)
+        membership_matrix = TOPSISComprehensiveEvaluation.calculate_membership_score_matrix(closeness_matrix)
         
-        return comprehensive_membership
+        return obj_names, distance_positive, distance_negative, closeness_matrix, membership_matrix
     
     @staticmethod
     def get_comprehensive_scores(comprehensive_membership: Dict[str, Dict[str, List[float]]]) -> Dict[str, List[float]]:
@@ -104,20 +198,14 @@ class TOPSISComprehensiveEvaluation:
         Returns:
             综合得分字典，格式为{"T1": [v1, v2, ...], ...}
         """
-        comprehensive_scores = {}
+        obj_names = list(comprehensive_membership)
+        d_positive = np.array([comprehensive_membership[obj_name]["D+"] for obj_name in obj_names], dtype=np.float64)
+        d_negative = np.array([comprehensive_membership[obj_name]["D-"] for obj_name in obj_names], dtype=np.float64)
         
-        for obj_name, distances in comprehensive_membership.items():
-            d_positive = np.array(distances["D+"])
-            d_negative = np.array(distances["D-"])
-            
-            # 计算相对接近度（按照论文公式4-30）
-            # V_i^N = D_i^- / (D_i^+ + D_i^-)
-            scores = np.divide(d_negative, (d_positive + d_negative), 
-                             out=np.zeros_like(d_negative), where=(d_positive + d_negative)!=0)
-            
-            comprehensive_scores[obj_name] = scores.tolist()
+        # 计算相对接近度（按照论文公式4-30），所有对象、所有级别一次计算
+        scores = TOPSISComprehensiveEvaluation.calculate_closeness_matrix(d_positive, d_negative)
         
-        return comprehensive_scores
+        return dict(zip(obj_names, scores.tolist()))
     
     @staticmethod
     def calculate_comprehensive_membership_scores(comprehensive_scores: Dict[str, List[float]]) -> Dict[str, List[float]]:
@@ -132,22 +220,13 @@ class TOPSISComprehensiveEvaluation:
         Returns:
             综合隶属度字典，格式为{"T1": [u1, u2, u3, u4], ...}
         """
-        comprehensive_membership_scores = {}
+        obj_names = list(comprehensive_scores)
+        scores_array = np.array([comprehensive_scores[obj_name] for obj_name in obj_names], dtype=np.float64)
         
-        for obj_name, scores in comprehensive_scores.items():
-            scores_array = np.array(scores)
-            
-            # 计算综合隶属度（按照论文公式4-31）
-            # u_{ij}^N = V_{ij}^N / sum(V_{ij}^N for all levels)
-            total_score = np.sum(scores_array)
-            if total_score > 0:
-                membership_scores = scores_array / total_score
-            else:
-                membership_scores = np.zeros_like(scores_array)
-            
-            comprehensive_membership_scores[obj_name] = membership_scores.tolist()
+        # 计算综合隶属度（按照论文公式4-31），各对象按行归一化
+        membership_scores = TOPSISComprehensiveEvaluation.calculate_membership_score_matrix(scores_array)
         
-        return comprehensive_membership_scores
+        return dict(zip(obj_names, membership_scores.tolist()))
 
 
 def calculate_topsis_with_paper_data():
@@ -175,23 +254,19 @@ def calculate_topsis_with_paper_data():
         'T7': [0.508, 0.335, 0.216, 0.109]
     }
     
-    # 计算相对接近度 (V值)
-    paper_v_values = {}
-    for obj_name in paper_d_plus.keys():
-        v_values = []
-        for i in range(4):  # 4个等级
-            d_plus = paper_d_plus[obj_name][i]
-            d_minus = paper_d_minus[obj_name][i]
-            v = d_minus / (d_plus + d_minus) if (d_plus + d_minus) > 0 else 0.0
-            v_values.append(v)
-        paper_v_values[obj_name] = v_values
+    # 将两张表堆叠为(对象, 级别)数组，一次计算全部对象的相对接近度 (V值) 与综合隶属度 (u值)
+    obj_names = list(paper_d_plus)
+    d_plus_matrix = np.array([paper_d_plus[obj_name] for obj_name in obj_names], dtype=np.float64)
+    d_minus_matrix = np.array([paper_d_minus[obj_name] for obj_name in obj_names], dtype=np.float64)
+    
+    v_matrix = TOPSISComprehensiveEvaluation.calculate_closeness_matrix(d_plus_matrix, d_minus_matrix)
+    
+    # 各对象V值之和沿用内置sum()（其浮点补偿求和与np.sum结果可能相差末位），再按行归一化
+    total_v = np.array([sum(v_values) for v_values in v_matrix.tolist()])
+    u_matrix = v_matrix / total_v[:, np.newaxis]
     
-    # 计算综合隶属度 (u值)
-    paper_u_values = {}
-    for obj_name, v_values in paper_v_values.items():
-        total_v = sum(v_values)
-        u_values = [v / total_v for v in v_values]
-        paper_u_values[obj_name] = u_values
+    paper_v_values = dict(zip(obj_names, v_matrix.tolist()))
+    paper_u_values = dict(zip(obj_names, u_matrix.tolist()))
     
     return paper_d_plus, paper_d_minus, paper_v_values, paper_u_values
 
@@ -20,33 +20,34 @@ VIKOR综合评估模块
 """
 
 import numpy as np
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple
+
+from modules.algorithm_layer.membership_functions import NormalizedTensor
 
 
 class VIKORComprehensiveEvaluation:
     """VIKOR综合评估类 - 专注于多因子综合评估"""
     
     @staticmethod
-    def calculate_comprehensive_scores(normalized_matrices: Dict[str, np.ndarray], 
-                                     weights: List[float] = None,
-                                     v: float = 0.5) -> Dict[str, Dict[str, Union[List[float], float]]]:
+    def calculate_score_matrices(normalized_matrices: Union[Dict[str, np.ndarray], NormalizedTensor], 
+                                 weights: List[float] = None,
+                                 v: float = 0.5) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
         """
-        使用VIKOR方法计算综合得分
+        使用VIKOR方法计算各评估对象的S、R、Q值矩阵（数组形式）
         
         Args:
-            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
+            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}，或NormalizedTensor
             weights: 指标权重列表，默认为等权重
             v: 策略权重，0≤v≤1，v=0表示以个体最大遗憾为基础，v=1表示以群体多数为基础
             
         Returns:
-            综合得分字典，格式为{"T1": {"S": [s1, s2, ...], "R": [r1, r2, ...], "Q": [q1, q2, ...]}, ...}
+            (评估对象名称列表, S值矩阵, R值矩阵, Q值矩阵)，三个矩阵形状均为(对象数, 级别数)，行顺序与名称列表一致
         """
-        comprehensive_scores = {}
-        
-        # 获取评估对象数量和级别数
-        num_objects = len(normalized_matrices)
-        sample_matrix = next(iter(normalized_matrices.values()))
-        num_factors, num_levels = sample_matrix.shape
+        # 获取因子数量
+        if isinstance(normalized_matrices, NormalizedTensor):
+            num_factors = normalized_matrices.num_factors
+        else:
+            num_factors = next(iter(normalized_matrices.values())).shape[0]
         
         # 默认权重为等权重
         if weights is None:
@@ -59,58 +60,59 @@ class VIKORComprehensiveEvaluation:
         # 将权重转换为numpy数组便于计算
         weights_array = np.array(weights)
         
-        # 对每个评估对象计算VIKOR综合得分
-        for obj_name, matrix in normalized_matrices.items():
-            # 初始化结果存储
-            S_values = []
-            R_values = []
-            
-            # 对每个级别计算S值和R值
-            for level_idx in range(num_levels):
-                # 获取当前级别的所有因子隶属度值
-                level_memberships = matrix[:, level_idx]
-                
-                # 计算S值（权重策略标准）
-                S = np.sum(weights_array * (1 - level_memberships))
-                S_values.append(S)
-                
-                # 计算R值（个体遗憾标准）
-                R = np.max(weights_array * (1 - level_memberships))
-                R_values.append(R)
-            
-            # 计算Q值
-            S_array = np.array(S_values)
-            R_array = np.array(R_values)
-            
-            # 计算S*和S-（S值的最优解和最劣解）
-            S_star = np.min(S_array)
-            S_minus = np.max(S_array)
-            
-            # 计算R*和R-（R值的最优解和最劣解）
-            R_star = np.min(R_array)
-            R_minus = np.max(R_array)
-            
-            # 避免除零错误
-            S_diff = S_minus - S_star
-            R_diff = R_minus - R_star
-            
-            # 计算Q值
-            if S_diff == 0 and R_diff == 0:
-                Q_values = np.zeros_like(S_array)
-            elif S_diff == 0:
-                Q_values = v * np.zeros_like(S_array) + (1 - v) * (R_array - R_star) / R_diff
-            elif R_diff == 0:
-                Q_values = v * (S_array - S_star) / S_diff + (1 - v) * np.zeros_like(R_array)
-            else:
-                Q_values = v * (S_array - S_star) / S_diff + (1 - v) * (R_array - R_star) / R_diff
+        # 将所有评估对象的矩阵堆叠为(对象, 级别, 因子)张量，一次计算全部对象、全部级别
+        if not isinstance(normalized_matrices, NormalizedTensor):
+            normalized_matrices = NormalizedTensor.from_dict(normalized_matrices)
+        obj_names = list(normalized_matrices.names)
+        memberships = normalized_matrices.level_major()
+        weighted_regrets = weights_array * (1 - memberships)
+        
+        # 计算S值（权重策略标准）与R值（个体遗憾标准）
+        S_matrix = np.sum(weighted_regrets, axis=-1)
+        R_matrix = np.max(weighted_regrets, axis=-1)
+        
+        # 计算各对象的S*、S-（S值的最优解和最劣解）与R*、R-（R值的最优解和最劣解）
+        S_star = np.min(S_matrix, axis=1, keepdims=True)
+        S_diff = np.max(S_matrix, axis=1, keepdims=True) - S_star
+        R_star = np.min(R_matrix, axis=1, keepdims=True)
+        R_diff = np.max(R_matrix, axis=1, keepdims=True) - R_star
+        
+        # 计算Q值，差值为0的对象对应项取0以避免除零错误
+        S_term = np.divide(v * (S_matrix - S_star), S_diff,
+                           out=v * np.zeros_like(S_matrix), where=S_diff != 0)
+        R_term = np.divide((1 - v) * (R_matrix - R_star), R_diff,
+                           out=(1 - v) * np.zeros_like(R_matrix), where=R_diff != 0)
+        Q_matrix = S_term + R_term
+        Q_matrix[((S_diff == 0) & (R_diff == 0)).ravel()] = 0.0
+        
+        return obj_names, S_matrix, R_matrix, Q_matrix
+    
+    @staticmethod
+    def calculate_comprehensive_scores(normalized_matrices: Dict[str, np.ndarray], 
+                                     weights: List[float] = None,
+                                     v: float = 0.5) -> Dict[str, Dict[str, Union[List[float], float]]]:
+        """
+        使用VIKOR方法计算综合得分
+        
+        Args:
+            normalized_matrices: 规范化特征值矩阵字典，格式为{"T1": 矩阵, "T2": 矩阵, ...}
+            weights: 指标权重列表，默认为等权重
+            v: 策略权重，0≤v≤1，v=0表示以个体最大遗憾为基础，v=1表示以群体多数为基础
             
-            comprehensive_scores[obj_name] = {
-                "S": S_values,
-                "R": R_values,
-                "Q": Q_values.tolist()
-            }
+        Returns:
+            综合得分字典，格式为{"T1": {"S": [s1, s2, ...], "R": [r1, r2, ...], "Q": [q1, q2, ...]}, ...}
+        """
+        obj_names, S_matrix, R_matrix, Q_matrix = VIKORComprehensiveEvaluation.calculate_score_matrices(
+            normalized_matrices, weights, v
+        )
         
-        return comprehensive_scores
+        # 仅在返回时按对象拆分，tolist()批量转为Python原生float，便于JSON序列化
+        return {
+            obj_name: {"S": S_values, "R": R_values, "Q": Q_values}
+            for obj_name, S_values, R_values, Q_values in zip(
+                obj_names, S_matrix.tolist(), R_matrix.tolist(), Q_matrix.tolist()
+            )
+        }
 
 
 def test_vikor_comprehensive_evaluation():
@@ -4,103 +4,176 @@
 负责数值型和分类型字段的统计分析
 """
 
+import re
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
-from scipy import stats
+from typing import Dict, Any, List, Optional, Tuple
 
 
-def analyze_numeric_fields(df: pd.DataFrame) -> Dict[str, Any]:
+# 常见极大型指标关键词
+MAX_POLARITY_INDICATORS = ('growth', 'rate', 'profit', 'efficiency', 'score', 'performance', 'quality',
+                           '周转率', '库领量', '销售额', '收益率', '满意度')
+# 常见极小型指标关键词
+MIN_POLARITY_INDICATORS = ('cost', 'loss', 'error', 'defect', 'time', 'delay', 'risk', '库存', '单价',
+                           '成本', '损耗', '等待时间')
+# 关键词预编译为正则交替式，字段名只需单次扫描即可判断是否包含任一关键词
+_MAX_POLARITY_PATTERN = re.compile('|'.join(map(re.escape, MAX_POLARITY_INDICATORS)))
+_MIN_POLARITY_PATTERN = re.compile('|'.join(map(re.escape, MIN_POLARITY_INDICATORS)))
+# 分类型字段的dtype（select_dtypes的include参数）
+CATEGORICAL_DTYPES = ('object', 'category')
+# 数值字段统计的分位点（对应p25/p50/p75/p90/p95）
+PERCENTILE_LEVELS = (0.25, 0.50, 0.75, 0.90, 0.95)
+
+
+def _skewness_kurtosis(values: np.ndarray) -> Tuple[float, float]:
+    """
+    计算偏度与峰度（总体矩估计，与scipy.stats.skew、scipy.stats.kurtosis的默认参数bias=True、fisher=True一致）
+    
+    两者共用同一次均值与二阶中心矩计算，省去scipy逐次调用时的参数校验开销
+    
+    Args:
+        values: 不含缺失值的一维数值数组
+        
+    Returns:
+        (偏度, 峰度)，方差为0时均为nan
+    """
+    deviations = values - values.mean()
+    m2 = np.mean(deviations ** 2)
+    if m2 == 0:
+        return float('nan'), float('nan')
+    m3 = np.mean(deviations ** 3)
+    m4 = np.mean(deviations ** 4)
+    
+    return float(m3 / m2 ** 1.5), float(m4 / m2 ** 2 - 3)
+
+
+def analyze_numeric_fields(df: pd.DataFrame, numeric_columns: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     分析数值型字段的统计特征
     
     Args:
         df: 包含数值型字段的DataFrame
+        numeric_columns: 调用方已识别的数值型字段列表（可选，默认按dtype自动识别）
         
     Returns:
         数值字段分析结果
     """
-    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    if numeric_columns is None:
+        numeric_columns = df.select_dtypes(include=[np.number]).columns
     results = {}
+    n_rows = len(df)
     
     for col in numeric_columns:
-        series = df[col].dropna()
+        # 只有含缺失值的列才需要dropna生成副本，无缺失值时直接使用原列
+        series = df[col]
+        if series.hasnans:
+            series = series.dropna()
         if len(series) == 0:
             continue
             
+        # 直接对去除缺失值后的数组调用np.quantile（与Series.quantile的线性插值一致），
+        # 一次计算全部分位数，并通过tolist()批量转换为Python原生float
+        p25, p50, p75, p90, p95 = np.quantile(series.to_numpy(), PERCENTILE_LEVELS).tolist()
+        
+        min_val = series.min()
+        max_val = series.max()
+        skewness, kurtosis = _skewness_kurtosis(series.to_numpy())
+        
         results[col] = {
             'basic_stats': {
-                'min': float(series.min()),
-                'max': float(series.max()),
+                'min': float(min_val),
+                'max': float(max_val),
                 'mean': float(series.mean()),
                 'median': float(series.median()),
                 'std': float(series.std()),
                 'variance': float(series.var()),
-                'range': float(series.max() - series.min())
+                'range': float(max_val - min_val)
             },
             'percentiles': {
-                'p25': float(series.quantile(0.25)),
-                'p50': float(series.quantile(0.50)),
-                'p75': float(series.quantile(0.75)),
-                'p90': float(series.quantile(0.90)),
-                'p95': float(series.quantile(0.95))
+                'p25': p25,
+                'p50': p50,
+                'p75': p75,
+                'p90': p90,
+                'p95': p95
             },
             'distribution': {
-                'skewness': float(stats.skew(series)),
-                'kurtosis': float(stats.kurtosis(series)),
-                'iqr': float(series.quantile(0.75) - series.quantile(0.25))
+                'skewness': skewness,
+                'kurtosis': kurtosis,
+                'iqr': p75 - p25
             },
             'data_quality': {
-                'missing_count': int(df[col].isna().sum()),
-                'missing_percentage': float(df[col].isna().sum() / len(df) * 100),
-                'unique_count': int(df[col].nunique())
+                # series为去除缺失值后的列，缺失数量直接由长度差得到，无需再生成缺失值掩码
+                'missing_count': n_rows - len(series),
+                'missing_percentage': float((n_rows - len(series)) / n_rows * 100),
+                'unique_count': int(series.nunique())
             }
         }
     
     return results
 
 
-def analyze_categorical_fields(df: pd.DataFrame) -> Dict[str, Any]:
+def analyze_categorical_fields(df: pd.DataFrame, categorical_columns: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     分析分类型字段的统计特征
     
     Args:
         df: 包含分类型字段的DataFrame
+        categorical_columns: 调用方已识别的分类型字段列表（可选，默认按dtype自动识别）
         
     Returns:
         分类字段分析结果
     """
-    categorical_columns = df.select_dtypes(include=['object', 'category']).columns
+    if categorical_columns is None:
+        categorical_columns = df.select_dtypes(include=list(CATEGORICAL_DTYPES)).columns
     results = {}
+    n_rows = len(df)
     
     for col in categorical_columns:
-        series = df[col].dropna()
+        # 只有含缺失值的列才需要dropna生成副本，无缺失值时直接使用原列
+        series = df[col]
+        if series.hasnans:
+            series = series.dropna()
         if len(series) == 0:
             continue
             
-        value_counts = series.value_counts()
-        top_categories = value_counts.head(5).to_dict()
+        # 只做一次因子化，由编码计数同时得到频数、类别数与熵值，避免value_counts与nunique重复哈希
+        # （category类型按类别顺序编码，与value_counts对频数相同类别的排列顺序一致）
+        codes, uniques = pd.factorize(series, sort=isinstance(series.dtype, pd.CategoricalDtype))
+        counts = np.bincount(codes)
+        n_categories = int(counts.size)
         
-        # 计算熵值（多样性评估）
-        probabilities = value_counts / len(series)
-        entropy = -np.sum(probabilities * np.log2(probabilities))
+        # 只选出频数最高的前5个类别再排序，无需对全部类别排序（高基数列如ID、URL列时差异明显）；
+        # 排序键按频数降序、编码升序组合为唯一整数，使频数相同时的先后次序与value_counts一致
+        sort_keys = np.arange(n_categories, dtype=np.int64) - counts.astype(np.int64) * n_categories
+        top_k = min(5, n_categories)
+        top_order = np.argpartition(sort_keys, top_k - 1)[:top_k]
+        top_order = top_order[np.argsort(sort_keys[top_order])]
+        top_counts = counts[top_order].tolist()
+        top_categories = dict(zip(uniques.take(top_order).tolist(), top_counts))
+        
+        # 计算熵值（多样性评估），p·log2(p)就地写入对数数组，不再额外分配乘积数组
+        probabilities = counts / len(series)
+        entropy_terms = np.log2(probabilities)
+        np.multiply(probabilities, entropy_terms, out=entropy_terms)
+        entropy = -np.sum(entropy_terms)
         
         results[col] = {
             'frequency_analysis': {
                 'top_categories': top_categories,
-                'total_categories': int(len(value_counts)),
-                'most_frequent': value_counts.index[0] if len(value_counts) > 0 else None,
-                'most_frequent_count': int(value_counts.iloc[0]) if len(value_counts) > 0 else 0
+                'total_categories': n_categories,
+                'most_frequent': uniques[top_order[0]],
+                'most_frequent_count': top_counts[0]
             },
             'diversity': {
                 'entropy': float(entropy),
-                'max_entropy': float(np.log2(len(value_counts))) if len(value_counts) > 0 else 0,
-                'normalized_entropy': float(entropy / np.log2(len(value_counts))) if len(value_counts) > 1 else 0
+                'max_entropy': float(np.log2(n_categories)),
+                'normalized_entropy': float(entropy / np.log2(n_categories)) if n_categories > 1 else 0
             },
             'data_quality': {
-                'missing_count': int(df[col].isna().sum()),
-                'missing_percentage': float(df[col].isna().sum() / len(df) * 100),
-                'unique_count': int(df[col].nunique())
+                # series为去除缺失值后的列，缺失数量直接由长度差得到，无需再生成缺失值掩码
+                'missing_count': n_rows - len(series),
+                'missing_percentage': float((n_rows - len(series)) / n_rows * 100),
+                'unique_count': n_categories
             }
         }
     
@@ -120,22 +193,14 @@ def auto_detect_polarity(df: pd.DataFrame, numeric_analysis: Dict) -> Dict[str,
     """
     polarity_results = {}
     
+    # 极性判断只依赖字段名称和numeric_analysis中已算好的统计量，无需再访问df的列数据
     for col, analysis in numeric_analysis.items():
-        series = df[col].dropna()
-        
         # 基于字段名称和统计特征进行极性判断
         col_lower = col.lower()
         
-        # 常见极大型指标关键词
-        max_indicators = ['growth', 'rate', 'profit', 'efficiency', 'score', 'performance', 'quality', 
-                         '周转率', '库领量', '销售额', '收益率', '满意度']
-        # 常见极小型指标关键词  
-        min_indicators = ['cost', 'loss', 'error', 'defect', 'time', 'delay', 'risk', '库存', '单价', 
-                         '成本', '损耗', '等待时间']
-        
         # 基于名称的关键词匹配
-        is_max_indicator = any(indicator in col_lower for indicator in max_indicators)
-        is_min_indicator = any(indicator in col_lower for indicator in min_indicators)
+        is_max_indicator = _MAX_POLARITY_PATTERN.search(col_lower) is not None
+        is_min_indicator = _MIN_POLARITY_PATTERN.search(col_lower) is not None
         
         # 基于统计特征的判断
         mean_val = analysis['basic_stats']['mean']
@@ -161,28 +226,30 @@ def auto_detect_polarity(df: pd.DataFrame, numeric_analysis: Dict) -> Dict[str,
             polarity = 'unknown'
             a = b = c = None
         
-        # 构建隶属度规则描述
+        # 构建隶属度规则描述与调整策略（参数的两位小数文本只格式化一次，两处共用）
         membership_rules = ""
-        if polarity == 'max' and a is not None:
+        adjustment_strategy = ""
+        if polarity == 'max':
+            a_text, b_text, c_text = f"{a:.2f}", f"{b:.2f}", f"{c:.2f}"
             membership_rules = f"""
 ## 对于越大越好的字段（{col}）：
-- a < b < c （如{col}：{a:.2f}→{b:.2f}→{c:.2f}）
+- a < b < c （如{col}：{a_text}→{b_text}→{c_text}）
 - 当实际值 ≤ a时：隶属度=0%
 - 当实际值 ≥ c时：隶属度=100%
 """
-        elif polarity == 'min' and a is not None:
+            if a != 0:
+                adjustment_strategy = f"极性调整方法：通过取倒数的方法将越大越好的字段转换为越小越好，如{col}值{a_text}转换为1/{a_text}≈{1 / a:.4f}"
+            else:
+                # 最小值为0时示例改为实际调整公式（取倒数前加1e-10避免除零）
+                adjustment_strategy = f"极性调整方法：通过取倒数的方法将越大越好的字段转换为越小越好，如{col}值{a_text}转换为1/({a_text}+1e-10)"
+        elif polarity == 'min':
+            a_text, b_text, c_text = f"{a:.2f}", f"{b:.2f}", f"{c:.2f}"
             membership_rules = f"""
 ## 对于越小越好的字段（{col}）：
-- a > b > c （如{col}：{a:.2f}→{b:.2f}→{c:.2f}）
+- a > b > c （如{col}：{a_text}→{b_text}→{c_text}）
 - 当实际值 ≥ a时：隶属度=0%
 - 当实际值 ≤ c时：隶属度=100%
 """
-        
-        # 构建调整策略
-        adjustment_strategy = ""
-        if polarity == 'max':
-            adjustment_strategy = f"极性调整方法：通过取倒数的方法将越大越好的字段转换为越小越好，如{col}值{a:.2f}转换为1/{a:.2f}≈{1/a:.4f}"
-        elif polarity == 'min':
             adjustment_strategy = "无需调整，已为越小越好类型"
         
         polarity_results[col] = {
@@ -213,13 +280,27 @@ def apply_polarity_adjustment(df: pd.DataFrame, polarity_results: Dict[str, Any]
     Returns:
         调整后的DataFrame
     """
-    adjusted_df = df.copy()
+    max_columns = [col for col, result in polarity_results.items()
+                   if result['suggested_polarity'] == 'max' and result['detection_successful']]
+    
+    if not max_columns:
+        return df.copy(deep=False)
+    
+    # 对越大越好的字段一次性批量取倒数（避免除零），只为这些列分配新缓冲区
+    values = df[max_columns].to_numpy(dtype=np.float64, copy=True)
+    np.add(values, 1e-10, out=values)
+    np.reciprocal(values, out=values)
+    adjusted_columns = dict(zip(max_columns, values.T))
+    
+    # 其余字段直接复用原始列数据，不做整表复制
+    adjusted_df = pd.DataFrame(
+        {col: adjusted_columns[col] if col in adjusted_columns else df[col] for col in df.columns},
+        index=df.index,
+        copy=False
+    )
     
-    for col, result in polarity_results.items():
-        if result['suggested_polarity'] == 'max' and result['detection_successful']:
-            # 对越大越好的字段取倒数（避免除零）
-            adjusted_df[col] = 1 / (df[col] + 1e-10)
-            print(f"✅ 已对字段 '{col}' 应用极性调整（取倒数）")
+    for col in max_columns:
+        print(f"✅ 已对字段 '{col}' 应用极性调整（取倒数）")
     
     return adjusted_df
 
@@ -241,21 +322,20 @@ def generate_polarity_report(polarity_results: Dict[str, Any]) -> str:
     
     if successful_detections:
         report_lines.append("## 成功检测的字段极性\n")
-        for col in successful_detections:
-            result = polarity_results[col]
-            report_lines.append(f"### 字段: {col}")
-            report_lines.append(f"- **极性类型**: {'越大越好 (max)' if result['suggested_polarity'] == 'max' else '越小越好 (min)'}")
-            report_lines.append(f"- **置信度**: {result['confidence']}")
-            report_lines.append(f"- **调整策略**: {result['adjustment_strategy']}")
-            if result['membership_rules']:
-                report_lines.append(result['membership_rules'])
-            report_lines.append("")
+        # 每个字段的报告段落用一个f-string整体构建（末尾换行对应段落间的空行）
+        report_lines.extend(
+            f"### 字段: {col}\n"
+            f"- **极性类型**: {'越大越好 (max)' if result['suggested_polarity'] == 'max' else '越小越好 (min)'}\n"
+            f"- **置信度**: {result['confidence']}\n"
+            f"- **调整策略**: {result['adjustment_strategy']}\n"
+            + (f"{result['membership_rules']}\n" if result['membership_rules'] else "")
+            for col, result in polarity_results.items() if result['detection_successful']
+        )
     
     if failed_detections:
         report_lines.append("## 无法评估极性的字段\n")
         report_lines.append("以下字段无法从名称判断极性，建议修改表头以明确字段含义：")
-        for col in failed_detections:
-            report_lines.append(f"- {col}")
+        report_lines.extend(f"- {col}" for col in failed_detections)
         report_lines.append("\n**建议**: 修改表头名称，包含明确的极性指示词（如'成本'、'收益'、'效率'等）")
     
     return '\n'.join(report_lines)
\ No newline at end of file
@@ -6,8 +6,91 @@
 
 import pandas as pd
 from typing import Dict, Any, Union
+import importlib.util
 import io
+import os
+import re
 import base64
+import binascii
+
+
+# 可选的高性能CSV解析引擎（未安装pyarrow时回退到pandas默认的C引擎）
+CSV_PARSE_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+# 可选的高性能Excel解析引擎（未安装python-calamine时由pandas按文件格式自动选择，如openpyxl）
+EXCEL_PARSE_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+# 按文件路径处理的内容最大长度，更长的内容直接视为Base64编码，跳过文件系统检查
+MAX_FILE_PATH_LENGTH = 4096
+
+
+# Base64编码内容允许的字符（含换行等空白字符），不符合的内容按文件路径处理
+BASE64_CONTENT_PATTERN = re.compile(r'[A-Za-z0-9+/=\s]+')
+# 流式解码时每次读取的Base64字符数（4的倍数）
+BASE64_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class _Base64DecodingReader(io.RawIOBase):
+    """
+    按块解码Base64字符串的只读流，读取方每次只取得一小段解码结果，不生成完整的解码副本
+    """
+    
+    def __init__(self, content: str, chunk_size: int = BASE64_STREAM_CHUNK_SIZE):
+        self._content = content
+        self._chunk_size = chunk_size
+        self._position = 0
+        # 上一块中不足4个字符、需与下一块拼接解码的剩余部分
+        self._remainder = ''
+        self._decoded = b''
+        self._decoded_offset = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        while self._decoded_offset >= len(self._decoded):
+            if self._position >= len(self._content) and not self._remainder:
+                return 0
+            
+            chunk = self._remainder + ''.join(self._content[self._position:self._position + self._chunk_size].split())
+            self._position += self._chunk_size
+            if self._position < len(self._content):
+                usable_length = len(chunk) - len(chunk) % 4
+                chunk, self._remainder = chunk[:usable_length], chunk[usable_length:]
+            else:
+                self._remainder = ''
+            self._decoded = base64.b64decode(chunk)
+            self._decoded_offset = 0
+        
+        size = min(len(buffer), len(self._decoded) - self._decoded_offset)
+        buffer[:size] = self._decoded[self._decoded_offset:self._decoded_offset + size]
+        self._decoded_offset += size
+        return size
+
+
+def _resolve_file_source(file_content: str, streaming: bool = False) -> Union[str, io.BufferedIOBase]:
+    """
+    确定文件内容来源：已存在的文件路径直接由pandas从磁盘读取，其余内容按Base64编码解码
+    
+    Args:
+        file_content: Base64编码的文件内容或文件路径
+        streaming: 是否按块流式解码（适用于顺序读取的CSV；Excel需要随机访问，须完整解码）
+        
+    Returns:
+        解码后内容的只读流；不是Base64编码内容时原样返回，按文件路径读取
+    """
+    if len(file_content) <= MAX_FILE_PATH_LENGTH and os.path.isfile(file_content):
+        return file_content
+    
+    # 含'.'等非Base64字符的路径字符串不会被误解码
+    if not BASE64_CONTENT_PATTERN.fullmatch(file_content):
+        return file_content
+    
+    if streaming:
+        return io.BufferedReader(_Base64DecodingReader(file_content))
+    
+    try:
+        return io.BytesIO(base64.b64decode(file_content))
+    except binascii.Error:
+        return file_content
 
 
 def parse_csv_file(file_content: str) -> Dict[str, Any]:
@@ -21,13 +104,7 @@ def parse_csv_file(file_content: str) -> Dict[str, Any]:
         包含解析结果和基本信息的字典
     """
     try:
-        # 尝试解码Base64内容
-        try:
-            decoded_content = base64.b64decode(file_content)
-            df = pd.read_csv(io.BytesIO(decoded_content))
-        except:
-            # 如果不是Base64，尝试直接读取文件路径
-            df = pd.read_csv(file_content)
+        df = pd.read_csv(_resolve_file_source(file_content, streaming=True), engine=CSV_PARSE_ENGINE)
         
         return {
             'success': True,
@@ -56,13 +133,7 @@ def parse_excel_file(file_content: str, sheet_name: str = None) -> Dict[str, Any
         包含解析结果和基本信息的字典
     """
     try:
-        # 尝试解码Base64内容
-        try:
-            decoded_content = base64.b64decode(file_content)
-            df = pd.read_excel(io.BytesIO(decoded_content), sheet_name=sheet_name)
-        except:
-            # 如果不是Base64，尝试直接读取文件路径
-            df = pd.read_excel(file_content, sheet_name=sheet_name)
+        df = pd.read_excel(_resolve_file_source(file_content), sheet_name=sheet_name, engine=EXCEL_PARSE_ENGINE)
         
         # 如果返回的是字典（多个工作表），取第一个
         if isinstance(df, dict):
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+字段分析模块测试脚本
+测试analyze_numeric_fields、analyze_categorical_fields的统计结果与pandas、scipy.stats的逐项计算结果一致
+"""
+
+import sys
+import os
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from modules.data_layer.field_analyzer import analyze_numeric_fields, analyze_categorical_fields
+
+
+def make_numeric_dataframe(num_rows, seed=0):
+    """生成包含浮点、整数、常数与缺失值列的测试数据"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "float_col": rng.normal(size=num_rows) * 1000,
+        "int_col": rng.integers(-50, 50, num_rows),
+        "skewed_col": rng.exponential(size=num_rows),
+        "const_col": np.full(num_rows, 3.0),
+        "small_int_col": rng.integers(0, 9, num_rows).astype(np.uint8)
+    })
+    df.loc[rng.integers(0, num_rows, num_rows // 5), "float_col"] = np.nan
+    return df
+
+
+def assert_close_float(actual, expected, label):
+    """比较浮点结果，允许末位浮点误差（均为nan时视为一致）"""
+    assert isinstance(actual, float), f"{label}应为Python float"
+    assert np.isclose(actual, expected, rtol=1e-12, atol=1e-15, equal_nan=True), f"{label}: {actual} != {expected}"
+
+
+def test_numeric_distribution_matches_scipy():
+    """测试偏度、峰度与scipy.stats默认参数（bias=True、fisher=True）结果一致，分位数与Series.quantile一致"""
+    print("📊 测试数值字段分布统计...")
+
+    # 多组随机数据（含极少行数与较多行数）
+    for seed, num_rows in enumerate([3, 57, 20000] + [int(n) for n in np.random.default_rng(0).integers(10, 3000, 60)]):
+        df = make_numeric_dataframe(num_rows, seed=seed)
+        results = analyze_numeric_fields(df)
+
+        for col in df.columns:
+            series = df[col].dropna()
+            distribution = results[col]["distribution"]
+            percentiles = results[col]["percentiles"]
+
+            # 常数列在scipy中会给出精度损失警告（结果为nan），此处只比较数值；
+            # 求和与幂运算的顺序可能不同，允许末位浮点误差
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                expected_skewness = stats.skew(series)
+                expected_kurtosis = stats.kurtosis(series)
+            assert_close_float(distribution["skewness"], expected_skewness, f"{col}偏度")
+            assert_close_float(distribution["kurtosis"], expected_kurtosis, f"{col}峰度")
+
+            for key, q in (("p25", 0.25), ("p50", 0.50), ("p75", 0.75), ("p90", 0.90), ("p95", 0.95)):
+                assert_close_float(percentiles[key], series.quantile(q), f"{col} {key}")
+            assert_close_float(distribution["iqr"], series.quantile(0.75) - series.quantile(0.25), f"{col} IQR")
+
+            assert results[col]["data_quality"]["missing_count"] == int(df[col].isna().sum())
+    print(f"   {seed + 1}组数据、每组{len(df.columns)}个字段结果一致")
+    print("   ✅ 偏度、峰度与分位数均一致")
+
+
+def make_categorical_dataframe(num_rows, num_categories, seed=0):
+    """生成包含object、字符串、混合类型与category列（含缺失值和频数并列）的测试数据"""
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"v{idx}" for idx in range(num_categories)]
+    df = pd.DataFrame({
+        "object_col": pd.Series(rng.choice(vocabulary, num_rows), dtype=object),
+        "str_col": rng.choice(vocabulary + [None], num_rows),
+        "mixed_col": pd.Series([[1, "a", 2.5, None][idx] for idx in rng.integers(0, 4, num_rows)], dtype=object),
+        "category_col": pd.Categorical(rng.choice(vocabulary, num_rows), categories=vocabulary[::-1]),
+        # 各类别频数相同，前5类别完全由并列时的先后次序决定
+        "tie_col": pd.Series(rng.permutation(np.resize(vocabulary, num_rows)), dtype=object)
+    })
+    return df
+
+
+def reference_categorical_stats(series):
+    """基于value_counts、nunique计算分类字段统计（因子化之前的计算方式）"""
+    value_counts = series.value_counts()
+    # category列只统计实际出现的类别
+    value_counts = value_counts[value_counts > 0]
+    probabilities = value_counts / len(series)
+    return {
+        "top_categories": value_counts.head(5).to_dict(),
+        "total_categories": int(len(value_counts)),
+        "most_frequent": value_counts.index[0],
+        "most_frequent_count": int(value_counts.iloc[0]),
+        "entropy": float(-np.sum(probabilities * np.log2(probabilities))),
+        "unique_count": int(series.nunique())
+    }
+
+
+def test_categorical_frequency_matches_value_counts():
+    """测试因子化计数得到的前5类别（含频数并列时的顺序）、类别数与熵值和value_counts一致"""
+    print("\n📈 测试分类字段频数统计...")
+
+    cases = [(1, 1), (12, 3), (40, 30), (3000, 8), (5000, 2000)]
+    for seed, (num_rows, num_categories) in enumerate(cases):
+        df = make_categorical_dataframe(num_rows, num_categories, seed=seed)
+        results = analyze_categorical_fields(df)
+
+        for col in df.columns:
+            series = df[col].dropna()
+            if len(series) == 0:
+                # 全部缺失的字段不参与统计
+                assert col not in results
+                continue
+            expected = reference_categorical_stats(series)
+            frequency = results[col]["frequency_analysis"]
+
+            # 字典比较同时检查键的顺序（频数相同的类别按value_counts的先后次序排列）
+            assert list(frequency["top_categories"].items()) == list(expected["top_categories"].items()), col
+            assert frequency["total_categories"] == expected["total_categories"]
+            assert frequency["most_frequent"] == expected["most_frequent"]
+            assert frequency["most_frequent_count"] == expected["most_frequent_count"]
+            assert results[col]["data_quality"]["unique_count"] == expected["unique_count"]
+            # 熵值的求和顺序与value_counts不同，允许末位浮点误差
+            assert np.isclose(results[col]["diversity"]["entropy"], expected["entropy"], rtol=1e-12, atol=1e-15)
+        print(f"   {num_rows}行、{num_categories}个类别: {len(df.columns)}个字段结果一致")
+
+    print("   ✅ 前5类别、类别数与熵值均一致")
+
+
+if __name__ == "__main__":
+    try:
+        test_numeric_distribution_matches_scipy()
+        test_categorical_frequency_matches_value_counts()
+        print("\n🎉 所有测试通过！字段分析模块功能正常。")
+    except Exception as e:
+        print(f"\n❌ 测试失败：{e}")
+        import traceback
+        traceback.print_exc()
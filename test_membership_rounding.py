@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+隶属度向量化计算测试脚本
+测试calculate_membership_with_config使用的整列向量化隶属度计算与舍入，
+与逐值调用标量隶属度函数再用内置round舍入的结果逐元素一致（含放大后恰为.5的舍入边界值）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from main import _round_like_builtin
+from modules.algorithm_layer.membership_functions import LowerBoundMembershipFunctions
+
+# 测试用的级别参数（a值，按级别从高到低排列）
+LEVEL_PARAMS_CASES = [
+    [80, 50, 20],
+    [10, 7, 3],
+    [360, 225, 90],
+    [0.9, 0.6, 0.3, 0.1]
+]
+
+
+def scalar_membership_matrix(values, level_params):
+    """逐值、逐级别调用标量隶属度函数并用内置round保留4位小数（向量化之前的计算方式）"""
+    total_levels = len(level_params)
+    return np.array([
+        [
+            round(float(LowerBoundMembershipFunctions.lower_bound_level_membership(
+                value, level_params, level, total_levels
+            )), 4)
+            for level in range(1, total_levels + 1)
+        ]
+        for value in values
+    ])
+
+
+def test_round_like_builtin_ties():
+    """测试舍入边界值：放大后恰为.5的值按内置round处理，而非np.round的银行家舍入"""
+    print("🔧 测试舍入边界值...")
+
+    values = np.array([0.51735, 0.00005, 0.12345, 0.99995, 0.33335, 0.5, 0.0, 1.0, 0.123449999])
+    expected = [round(value, 4) for value in values.tolist()]
+
+    result = _round_like_builtin(values, 4).tolist()
+    print(f"   向量化舍入: {result}")
+    print(f"   内置round : {expected}")
+    assert result == expected
+
+    # 随机值
+    rng = np.random.default_rng(0)
+    values = np.round(rng.random(10000), 5)
+    assert _round_like_builtin(values, 4).tolist() == [round(value, 4) for value in values.tolist()]
+
+    print("   ✅ 舍入结果与内置round一致")
+
+
+def test_vectorized_membership_matches_scalar():
+    """测试整列向量化隶属度矩阵与逐值标量计算结果逐元素一致"""
+    print("\n📈 测试向量化隶属度计算...")
+
+    tie_cases = 0
+    for level_params in LEVEL_PARAMS_CASES:
+        # 覆盖参数区间内外的取值（含恰好等于各级别参数的值），保留3位小数以产生舍入边界值
+        low, high = min(level_params), max(level_params)
+        values = np.round(np.linspace(low - (high - low) * 0.1, high + (high - low) * 0.1, 5001), 3)
+        values = np.concatenate([values, np.asarray(level_params, dtype=np.float64)])
+
+        memberships = LowerBoundMembershipFunctions.lower_bound_membership_matrix(values, level_params)
+        vectorized = _round_like_builtin(memberships, 4)
+        expected = scalar_membership_matrix(values.tolist(), level_params)
+
+        assert vectorized.shape == expected.shape
+        assert np.array_equal(vectorized, expected), f"级别参数{level_params}的隶属度与标量计算不一致"
+
+        # 统计np.round与内置round结果不同的边界值数量，确认测试覆盖了.5舍入边界
+        tie_cases += int(np.count_nonzero(np.round(memberships, 4) != expected))
+        print(f"   级别参数{level_params}: {len(values)}个取值一致")
+
+    print(f"   其中np.round与内置round不同的舍入边界值: {tie_cases}个")
+    assert tie_cases > 0
+
+    print("   ✅ 向量化隶属度计算与标量计算一致")
+
+
+if __name__ == "__main__":
+    try:
+        test_round_like_builtin_ties()
+        test_vectorized_membership_matches_scalar()
+        print("\n🎉 所有测试通过！隶属度向量化计算结果正确。")
+    except Exception as e:
+        print(f"\n❌ 测试失败：{e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+TOPSIS综合评估模块测试脚本
+测试TOPSISComprehensiveEvaluation按(对象, 级别)数组一次计算的距离、相对接近度与综合隶属度，
+与逐对象、逐级别计算的结果一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from modules.algorithm_layer.membership_functions import NormalizedTensor
+from modules.algorithm_layer.topsis_comprehensive_evaluation import TOPSISComprehensiveEvaluation
+
+# 数组计算与逐级别计算的求和顺序可能不同，允许末位浮点误差
+RTOL = 1e-12
+ATOL = 1e-15
+
+
+def make_normalized_matrices(num_objects, num_factors, num_levels, seed=0):
+    """生成随机规范化特征值矩阵（每个对象为因子数 × 级别数的矩阵，含0与1等边界值）"""
+    rng = np.random.default_rng(seed)
+    matrices = {}
+    for idx in range(1, num_objects + 1):
+        matrix = rng.random((num_factors, num_levels))
+        matrix[rng.random((num_factors, num_levels)) < 0.2] = 0.0
+        matrix[rng.random((num_factors, num_levels)) < 0.1] = 1.0
+        matrices[f"T{idx}"] = matrix
+    # 全为0的对象（相对接近度之和为0）
+    matrices[f"T{num_objects + 1}"] = np.zeros((num_factors, num_levels))
+    return matrices
+
+
+def reference_evaluation(normalized_matrices, weights=None):
+    """逐对象、逐级别计算D+、D-、相对接近度与综合隶属度（数组化之前的计算方式）"""
+    num_factors, num_levels = next(iter(normalized_matrices.values())).shape
+    if weights is None:
+        weights = [1.0 / num_factors] * num_factors
+    weights_array = np.array(weights)
+
+    results = {}
+    for obj_name, matrix in normalized_matrices.items():
+        d_positive = []
+        d_negative = []
+        for level_idx in range(num_levels):
+            level_memberships = matrix[:, level_idx]
+            d_positive.append(np.sqrt(np.sum(weights_array * (level_memberships - np.ones(num_factors)) ** 2)))
+            d_negative.append(np.sqrt(np.sum(weights_array * level_memberships ** 2)))
+
+        d_positive = np.array(d_positive)
+        d_negative = np.array(d_negative)
+        closeness = np.divide(d_negative, d_positive + d_negative,
+                              out=np.zeros_like(d_negative), where=(d_positive + d_negative) != 0)
+        total = np.sum(closeness)
+        membership = closeness / total if total > 0 else np.zeros_like(closeness)
+        results[obj_name] = (d_positive, d_negative, closeness, membership)
+    return results
+
+
+def test_evaluation_matrices_match_reference():
+    """测试数组形式的TOPSIS计算结果与逐级别计算一致（默认等权重、自定义权重、NormalizedTensor输入）"""
+    print("🎯 测试TOPSIS数组计算...")
+
+    normalized_matrices = make_normalized_matrices(num_objects=7, num_factors=5, num_levels=4)
+    weight_cases = [None, [0.1, 0.3, 0.2, 0.25, 0.15]]
+
+    for weights in weight_cases:
+        expected = reference_evaluation(normalized_matrices, weights)
+        for matrices in (normalized_matrices, NormalizedTensor.from_dict(normalized_matrices)):
+            obj_names, d_positive, d_negative, closeness, membership = \
+                TOPSISComprehensiveEvaluation.calculate_evaluation_matrices(matrices, weights)
+
+            assert obj_names == list(normalized_matrices)
+            for row, obj_name in enumerate(obj_names):
+                for actual, reference in zip((d_positive, d_negative, closeness, membership), expected[obj_name]):
+                    np.testing.assert_allclose(actual[row], reference, rtol=RTOL, atol=ATOL)
+        print(f"   权重{weights if weights else '（等权重）'}: {len(obj_names)}个对象结果一致")
+
+    print("   ✅ 距离、相对接近度与综合隶属度均一致")
+
+
+def test_dict_api_matches_reference():
+    """测试按对象拆分返回的字典接口与逐级别计算一致"""
+    print("\n📈 测试字典接口...")
+
+    normalized_matrices = make_normalized_matrices(num_objects=4, num_factors=3, num_levels=5, seed=1)
+    expected = reference_evaluation(normalized_matrices)
+
+    comprehensive_membership = TOPSISComprehensiveEvaluation.calculate_comprehensive_membership(normalized_matrices)
+    comprehensive_scores = TOPSISComprehensiveEvaluation.get_comprehensive_scores(comprehensive_membership)
+    membership_scores = TOPSISComprehensiveEvaluation.calculate_comprehensive_membership_scores(comprehensive_scores)
+
+    for obj_name, (d_positive, d_negative, closeness, membership) in expected.items():
+        np.testing.assert_allclose(comprehensive_membership[obj_name]["D+"], d_positive, rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(comprehensive_membership[obj_name]["D-"], d_negative, rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(comprehensive_scores[obj_name], closeness, rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(membership_scores[obj_name], membership, rtol=RTOL, atol=ATOL)
+
+    # 权重数量与因子数量不一致时报错
+    try:
+        TOPSISComprehensiveEvaluation.calculate_comprehensive_membership(normalized_matrices, [0.5, 0.5])
+        raise AssertionError("权重数量错误时应抛出ValueError")
+    except ValueError:
+        pass
+
+    print("   ✅ 字典接口结果一致")
+
+
+if __name__ == "__main__":
+    try:
+        test_evaluation_matrices_match_reference()
+        test_dict_api_matches_reference()
+        print("\n🎉 所有测试通过！TOPSIS综合评估模块功能正常。")
+    except Exception as e:
+        print(f"\n❌ 测试失败：{e}")
+        import traceback
+        traceback.print_exc()
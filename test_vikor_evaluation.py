@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+VIKOR综合评估模块测试脚本
+测试VIKORComprehensiveEvaluation按(对象, 级别)数组一次计算的S、R、Q值，
+与逐对象、逐级别计算的结果一致
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from modules.algorithm_layer.membership_functions import NormalizedTensor
+from modules.algorithm_layer.vikor_comprehensive_evaluation import VIKORComprehensiveEvaluation
+
+# 数组计算与逐级别计算的运算顺序可能不同，允许末位浮点误差
+RTOL = 1e-12
+ATOL = 1e-15
+
+
+def make_normalized_matrices(num_objects, num_factors, num_levels, seed=0):
+    """生成随机规范化特征值矩阵（含S、R值在各级别间相同的对象，覆盖Q值的除零分支）"""
+    rng = np.random.default_rng(seed)
+    matrices = {}
+    for idx in range(1, num_objects + 1):
+        matrices[f"T{idx}"] = rng.random((num_factors, num_levels))
+    # 各级别隶属度完全相同：S、R的最优解与最劣解之差均为0
+    matrices["T_same"] = np.tile(rng.random((num_factors, 1)), (1, num_levels))
+    # 前两个因子隶属度之和恒为1（取二进制可精确表示的值）：等权重时各级别S值相同而R值不同
+    same_s = np.full((num_factors, num_levels), 0.5)
+    same_s[0] = [0.125 * (level % 8) for level in range(num_levels)]
+    same_s[1] = 1.0 - same_s[0]
+    matrices["T_same_s"] = same_s
+    # 第一个因子隶属度恒为0（遗憾最大）：等权重时各级别R值相同而S值不同
+    same_r = rng.uniform(0.5, 1.0, (num_factors, num_levels))
+    same_r[0] = 0.0
+    matrices["T_same_r"] = same_r
+    return matrices
+
+
+def reference_scores(normalized_matrices, weights=None, v=0.5):
+    """逐对象、逐级别计算S、R、Q值（数组化之前的计算方式）"""
+    num_factors, num_levels = next(iter(normalized_matrices.values())).shape
+    if weights is None:
+        weights = [1.0 / num_factors] * num_factors
+    weights_array = np.array(weights)
+
+    results = {}
+    for obj_name, matrix in normalized_matrices.items():
+        S_values = []
+        R_values = []
+        for level_idx in range(num_levels):
+            level_memberships = matrix[:, level_idx]
+            S_values.append(np.sum(weights_array * (1 - level_memberships)))
+            R_values.append(np.max(weights_array * (1 - level_memberships)))
+
+        S_array = np.array(S_values)
+        R_array = np.array(R_values)
+        S_star, S_diff = np.min(S_array), np.max(S_array) - np.min(S_array)
+        R_star, R_diff = np.min(R_array), np.max(R_array) - np.min(R_array)
+
+        if S_diff == 0 and R_diff == 0:
+            Q_array = np.zeros_like(S_array)
+        elif S_diff == 0:
+            Q_array = (1 - v) * (R_array - R_star) / R_diff
+        elif R_diff == 0:
+            Q_array = v * (S_array - S_star) / S_diff
+        else:
+            Q_array = v * (S_array - S_star) / S_diff + (1 - v) * (R_array - R_star) / R_diff
+        results[obj_name] = (S_array, R_array, Q_array)
+    return results
+
+
+def test_score_matrices_match_reference():
+    """测试数组形式的VIKOR计算结果与逐级别计算一致（不同权重、策略权重v及NormalizedTensor输入）"""
+    print("🎯 测试VIKOR数组计算...")
+
+    normalized_matrices = make_normalized_matrices(num_objects=6, num_factors=4, num_levels=4)
+    cases = [(None, 0.5), ([0.4, 0.3, 0.2, 0.1], 0.5), (None, 0.0), ([0.1, 0.2, 0.3, 0.4], 1.0)]
+
+    for weights, v in cases:
+        expected = reference_scores(normalized_matrices, weights, v)
+        for matrices in (normalized_matrices, NormalizedTensor.from_dict(normalized_matrices)):
+            obj_names, S_matrix, R_matrix, Q_matrix = \
+                VIKORComprehensiveEvaluation.calculate_score_matrices(matrices, weights, v)
+
+            assert obj_names == list(normalized_matrices)
+            for row, obj_name in enumerate(obj_names):
+                for actual, reference in zip((S_matrix, R_matrix, Q_matrix), expected[obj_name]):
+                    np.testing.assert_allclose(actual[row], reference, rtol=RTOL, atol=ATOL)
+        print(f"   权重{weights if weights else '（等权重）'}, v={v}: {len(obj_names)}个对象结果一致")
+
+    print("   ✅ S、R、Q值均一致")
+
+
+def test_dict_api_matches_reference():
+    """测试按对象拆分返回的字典接口与逐级别计算一致"""
+    print("\n📈 测试字典接口...")
+
+    normalized_matrices = make_normalized_matrices(num_objects=3, num_factors=5, num_levels=3, seed=1)
+    expected = reference_scores(normalized_matrices)
+
+    comprehensive_scores = VIKORComprehensiveEvaluation.calculate_comprehensive_scores(normalized_matrices)
+    for obj_name, (S_array, R_array, Q_array) in expected.items():
+        np.testing.assert_allclose(comprehensive_scores[obj_name]["S"], S_array, rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(comprehensive_scores[obj_name]["R"], R_array, rtol=RTOL, atol=ATOL)
+        np.testing.assert_allclose(comprehensive_scores[obj_name]["Q"], Q_array, rtol=RTOL, atol=ATOL)
+
+    # 权重数量与因子数量不一致时报错
+    try:
+        VIKORComprehensiveEvaluation.calculate_comprehensive_scores(normalized_matrices, [0.5, 0.5])
+        raise AssertionError("权重数量错误时应抛出ValueError")
+    except ValueError:
+        pass
+
+    print("   ✅ 字典接口结果一致")
+
+
+if __name__ == "__main__":
+    try:
+        test_score_matrices_match_reference()
+        test_dict_api_matches_reference()
+        print("\n🎉 所有测试通过！VIKOR综合评估模块功能正常。")
+    except Exception as e:
+        print(f"\n❌ 测试失败：{e}")
+        import traceback
+        traceback.print_exc()